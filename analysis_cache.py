@@ -0,0 +1,308 @@
+"""
+분석 캐시 바이너리 포맷 - 파싱 없이 memmap으로 바로 여는 채보 분석 데이터
+
+레이아웃 (리틀 엔디언):
+    헤더 64바이트
+        magic       4s   b'RGAC'
+        version     H    CACHE_FORMAT_VERSION
+        name_len    H    music_file 이름 길이 (UTF-8 바이트)
+        sr          I    샘플링 레이트
+        hop_length  I    프레임 간격
+        n_beats     I    beat_times 개수
+        n_onsets    I    onset_times 개수
+        tempo       d    BPM
+        duration    d    음악 길이 (초)
+        (나머지 0 패딩)
+    music_file 이름 (UTF-8, 8바이트 경계까지 0 패딩)
+    beat_times  float64 * n_beats
+    onset_times float64 * n_onsets
+
+시간 배열은 float64 그대로 저장하므로 JSON 캐시와 값이 완전히 같다.
+
+채보 캐시 (.chart) 레이아웃:
+    헤더 64바이트
+        magic             4s   b'RGCT'
+        version           H    CHART_FORMAT_VERSION
+        generator_version H    채보 생성 알고리즘 버전
+        n_notes           I    노트 개수
+        start_delay       d    시작 지연 (초)
+        tempo             d    BPM
+        duration          d    음악 길이 (초)
+        (나머지 0 패딩)
+    times     float64 * n_notes
+    durations float64 * n_notes  (일반 노트는 0)
+    is_long   uint8   * n_notes
+"""
+import os
+import json
+import struct
+import hashlib
+import numpy as np
+
+CACHE_FORMAT_VERSION = 1
+CACHE_MAGIC = b'RGAC'
+CACHE_EXT = '.bin'
+LEGACY_CACHE_EXT = '.json'
+
+HEADER_FORMAT = '<4sHHIIIIdd'
+HEADER_SIZE = 64
+
+# 생성된 채보 캐시 (난이도/시작 지연/생성기 버전별)
+CHART_MAGIC = b'RGCT'
+CHART_FORMAT_VERSION = 1
+CHART_EXT = '.chart'
+CHART_DIR = 'charts'
+CHART_HEADER_FORMAT = '<4sHHIddd'
+
+HASH_INDEX_FILE = 'hash_index.json'
+CHART_STATS_FILE = 'chart_stats.json'  # chart_stats.py의 통계 보고서
+# 캐시 폴더에 함께 저장되지만 분석 캐시가 아닌 JSON 파일
+NON_CACHE_FILES = (HASH_INDEX_FILE, CHART_STATS_FILE)
+HASH_CHUNK_SIZE = 1024 * 1024  # 해싱 시 한 번에 읽는 크기
+
+
+class AnalysisData:
+    """캐시에서 읽은 분석 데이터 (배열은 memmap으로 지연 로드)"""
+
+    def __init__(self, music_file, tempo, duration, sr, hop_length, beat_times, onset_times):
+        self.music_file = music_file
+        self.tempo = tempo
+        self.duration = duration
+        self.sr = sr
+        self.hop_length = hop_length
+        self.beat_times = beat_times
+        self.onset_times = onset_times
+
+
+def _align8(n):
+    return (n + 7) & ~7
+
+
+def write_cache(path, music_file, tempo, duration, sr, hop_length, beat_times, onset_times):
+    """분석 데이터를 바이너리 캐시 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    beat_times = np.ascontiguousarray(beat_times, dtype='<f8')
+    onset_times = np.ascontiguousarray(onset_times, dtype='<f8')
+    name = music_file.encode('utf-8')
+
+    header = struct.pack(
+        HEADER_FORMAT, CACHE_MAGIC, CACHE_FORMAT_VERSION, len(name),
+        int(sr), int(hop_length), len(beat_times), len(onset_times),
+        float(tempo), float(duration)
+    )
+    header = header.ljust(HEADER_SIZE, b'\0')
+    name_block = name.ljust(_align8(len(name)), b'\0')
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(name_block)
+        f.write(beat_times.tobytes())
+        f.write(onset_times.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_cache(path):
+    """
+    바이너리 캐시 파일 열기
+
+    헤더만 읽고, 시간 배열은 np.memmap으로 매핑하여 실제 접근 시 로드된다.
+
+    Raises:
+        ValueError: 매직 넘버나 버전이 맞지 않는 경우
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError("캐시 헤더가 손상됨")
+        (magic, version, name_len, sr, hop_length,
+         n_beats, n_onsets, tempo, duration) = struct.unpack_from(HEADER_FORMAT, header)
+        if magic != CACHE_MAGIC:
+            raise ValueError("캐시 파일 형식이 아님")
+        if version != CACHE_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 캐시 버전: {version}")
+        music_file = f.read(name_len).decode('utf-8')
+
+    offset = HEADER_SIZE + _align8(name_len)
+    beat_times = _map_array(path, offset, n_beats)
+    offset += n_beats * 8
+    onset_times = _map_array(path, offset, n_onsets)
+
+    return AnalysisData(music_file, tempo, duration, sr, hop_length, beat_times, onset_times)
+
+
+def _map_array(path, offset, count):
+    # 크기 0인 memmap은 만들 수 없으므로 빈 배열 반환
+    if count == 0:
+        return np.zeros(0, dtype='<f8')
+    return np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=(count,))
+
+
+def write_chart(path, generator_version, start_delay, tempo, duration, chart):
+    """생성된 채보(노트 dict 리스트)를 바이너리 채보 캐시로 저장"""
+    times = np.array([note['time'] for note in chart], dtype='<f8')
+    durations = np.array([note['duration'] for note in chart], dtype='<f8')
+    is_long = np.array([note['type'] == 'long' for note in chart], dtype=np.uint8)
+
+    header = struct.pack(
+        CHART_HEADER_FORMAT, CHART_MAGIC, CHART_FORMAT_VERSION, generator_version,
+        len(chart), float(start_delay), float(tempo), float(duration)
+    )
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(times.tobytes())
+        f.write(durations.tobytes())
+        f.write(is_long.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_chart(path, generator_version):
+    """
+    채보 캐시 읽기
+
+    Returns:
+        tuple: (노트 dict 리스트, tempo, duration)
+
+    Raises:
+        ValueError: 형식/버전이 맞지 않거나 생성기 버전이 다른 경우
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("채보 캐시 헤더가 손상됨")
+    (magic, version, file_generator_version, n_notes,
+     start_delay, tempo, duration) = struct.unpack_from(CHART_HEADER_FORMAT, raw)
+    if magic != CHART_MAGIC or version != CHART_FORMAT_VERSION:
+        raise ValueError("지원하지 않는 채보 캐시 형식")
+    if file_generator_version != generator_version:
+        raise ValueError(f"채보 생성기 버전 불일치: {file_generator_version} != {generator_version}")
+
+    offset = HEADER_SIZE
+    times = np.frombuffer(raw, dtype='<f8', count=n_notes, offset=offset).tolist()
+    offset += n_notes * 8
+    durations = np.frombuffer(raw, dtype='<f8', count=n_notes, offset=offset).tolist()
+    offset += n_notes * 8
+    is_long = np.frombuffer(raw, dtype=np.uint8, count=n_notes, offset=offset).tolist()
+
+    chart = [
+        {'time': t, 'type': 'long', 'duration': d} if long else
+        {'time': t, 'type': 'normal', 'duration': 0}
+        for t, d, long in zip(times, durations, is_long)
+    ]
+    return chart, tempo, duration
+
+
+def read_legacy_json(path):
+    """기존 JSON 캐시 파일 읽기 (마이그레이션용)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return AnalysisData(
+        data.get('music_file', ''),
+        data['tempo'],
+        data['duration'],
+        data['sr'],
+        data.get('hop_length', 512),
+        np.array(data['beat_times']),
+        np.array(data['onset_times'])
+    )
+
+
+def legacy_cache_files(cache_dir):
+    """캐시 폴더의 기존 JSON 분석 캐시 경로 (해시 인덱스, 통계 보고서 등은 제외, 이름순)"""
+    try:
+        filenames = sorted(os.listdir(cache_dir))
+    except OSError:
+        return []
+    return [os.path.join(cache_dir, filename) for filename in filenames
+            if filename.endswith(LEGACY_CACHE_EXT) and filename not in NON_CACHE_FILES]
+
+
+def migrate_legacy_json(json_path, bin_path):
+    """JSON 캐시를 바이너리 캐시로 변환 (JSON 파일은 그대로 둠)"""
+    data = read_legacy_json(json_path)
+    write_cache(bin_path, data.music_file, data.tempo, data.duration, data.sr,
+                data.hop_length, data.beat_times, data.onset_times)
+    return read_cache(bin_path)
+
+
+def hash_file(path):
+    """파일 내용을 청크 단위로 읽어 MD5 해시 계산 (전체를 메모리에 올리지 않음)"""
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+class FileHashIndex:
+    """
+    (경로, 크기, 수정 시각, inode) -> 내용 해시 영구 인덱스
+
+    stat 정보가 같으면 파일을 읽지 않고 저장된 해시를 반환하고,
+    달라졌을 때만 파일 전체를 해싱한다.
+    """
+
+    _instances = {}  # 인덱스 파일 경로별 공유 인스턴스
+
+    @classmethod
+    def for_dir(cls, cache_dir):
+        index_path = os.path.abspath(os.path.join(cache_dir, HASH_INDEX_FILE))
+        if index_path not in cls._instances:
+            cls._instances[index_path] = cls(index_path)
+        return cls._instances[index_path]
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.entries = None  # 처음 사용할 때 로드
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        self.entries = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        # 다른 프로세스가 추가한 항목을 잃지 않도록 디스크 내용과 합친 뒤 저장
+        merged = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                merged = json.load(f)
+        except (OSError, ValueError):
+            pass
+        merged.update(self.entries)
+        self.entries = merged
+
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def get_hash(self, path):
+        """파일의 내용 해시 반환 (stat이 바뀌지 않았으면 인덱스 사용)"""
+        if self.entries is None:
+            self.load()
+
+        st = os.stat(path)
+        key = os.path.normcase(os.path.abspath(path))
+        stat_info = [st.st_size, st.st_mtime_ns, st.st_ino]
+
+        entry = self.entries.get(key)
+        if entry and entry['stat'] == stat_info:
+            self.hits += 1
+            return entry['hash']
+
+        self.misses += 1
+        file_hash = hash_file(path)
+        self.entries[key] = {'stat': stat_info, 'hash': file_hash}
+        try:
+            self.save()
+        except OSError as e:
+            print(f"해시 인덱스 저장 실패: {e}")
+        return file_hash
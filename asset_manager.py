@@ -0,0 +1,157 @@
+"""
+프로세스 전체에서 함께 쓰는 텍스처 레지스트리
+
+같은 파일은 한 번만 로드하고 (경로 기준), 엔티티와 모드가 같은 이미지 객체를 공유한다.
+
+    acquire(path)  이미지 반환, 참조 수 +1 (없으면 로드)
+    release(path)  참조 수 -1 - 0이 되어도 바로 버리지 않고 캐시에 남김
+
+참조 수가 0인 텍스처는 LRU 순서로 보관하다가 전체 텍스처 크기가 budget_bytes를 넘으면
+가장 오래 쓰이지 않은 것부터 버린다. 사용 중인 텍스처는 버리지 않으므로
+사용 중인 양만으로 예산을 넘을 수는 있다.
+
+R 재시작이나 모드 전환처럼 release 직후 같은 파일을 다시 acquire하면 디스크/디코드 없이
+캐시에서 바로 돌려준다.
+"""
+import os
+from collections import OrderedDict
+from pico2d import load_image
+
+DEFAULT_BUDGET = 256 * 1024 * 1024  # 참조가 없는 텍스처까지 포함한 보관 한도 (바이트) - 원본 시트 전체가 들어감
+BYTES_PER_PIXEL = 4  # RGBA8 텍스처
+
+
+def texture_bytes(image):
+    return image.w * image.h * BYTES_PER_PIXEL
+
+
+class AssetEntry:
+    __slots__ = ('path', 'image', 'refs', 'nbytes')
+
+    def __init__(self, path, image, nbytes):
+        self.path = path
+        self.image = image
+        self.refs = 0
+        self.nbytes = nbytes
+
+
+class AssetManager:
+    """
+    Args:
+        budget_bytes: 보관할 텍스처 크기 한도 (넘으면 참조가 없는 것부터 LRU로 버림)
+        loader: 경로 -> 이미지 함수 (기본 pico2d.load_image)
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET, loader=load_image):
+        self.budget_bytes = budget_bytes
+        self.loader = loader
+        self.entries = OrderedDict()  # 키 -> AssetEntry (앞쪽이 가장 오래 쓰이지 않은 것)
+        self.resident_bytes = 0  # 현재 보관 중인 텍스처 크기
+        self.peak_bytes = 0
+        self.hits = 0  # 로드 없이 돌려준 횟수
+        self.misses = 0  # 새로 로드(또는 add로 등록)한 횟수
+        self.evictions = 0
+        self.loaded_bytes = 0  # 지금까지 로드한 텍스처 크기 합 (다시 로드한 것 포함)
+
+    @staticmethod
+    def key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def acquire(self, path):
+        """
+        이미지 반환 (참조 수 +1)
+
+        Raises:
+            로더가 던진 예외 (파일이 없거나 로드 실패) - 실패는 캐시하지 않음
+        """
+        key = self.key(path)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            entry = self._insert(key, path, self.loader(path))
+        entry.refs += 1
+        self.trim()
+        return entry.image
+
+    def is_loaded(self, path):
+        return self.key(path) in self.entries
+
+    def add(self, path, image):
+        """
+        다른 곳에서 로드한 이미지를 참조 없이 등록 (백그라운드 디코드 후 업로드한 텍스처 등)
+
+        이미 있으면 기존 것을 유지한다. 쓰는 쪽은 acquire로 참조를 얻는다.
+        여기서는 버리지 않는다 - 참조가 0인 채로 trim하면 방금 올린 텍스처가 acquire 전에
+        버려질 수 있으므로, 예산은 다음 acquire/release 때 맞춘다.
+        """
+        key = self.key(path)
+        if key not in self.entries:
+            self._insert(key, path, image)
+
+    def _insert(self, key, path, image):
+        self.misses += 1
+        entry = AssetEntry(path, image, texture_bytes(image))
+        self.entries[key] = entry
+        self.resident_bytes += entry.nbytes
+        self.loaded_bytes += entry.nbytes
+        self.peak_bytes = max(self.peak_bytes, self.resident_bytes)
+        return entry
+
+    def release(self, path):
+        """참조 수 -1 (acquire한 만큼만 호출)"""
+        entry = self.entries.get(self.key(path))
+        if entry is None or entry.refs == 0:
+            return
+        entry.refs -= 1
+        if entry.refs == 0:
+            self.trim()
+
+    def trim(self):
+        """예산을 넘었으면 참조가 없는 텍스처를 오래된 것부터 버림"""
+        if self.resident_bytes <= self.budget_bytes:
+            return
+        for key in [key for key, entry in self.entries.items() if entry.refs == 0]:
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            entry = self.entries.pop(key)
+            self.resident_bytes -= entry.nbytes
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.trim()
+
+    def clear(self):
+        """참조가 없는 텍스처 모두 버림"""
+        budget, self.budget_bytes = self.budget_bytes, 0
+        self.trim()
+        self.budget_bytes = budget
+
+    def stats(self):
+        in_use = [entry for entry in self.entries.values() if entry.refs > 0]
+        return {
+            'textures': len(self.entries),
+            'in_use': len(in_use),
+            'resident_bytes': self.resident_bytes,
+            'in_use_bytes': sum(entry.nbytes for entry in in_use),
+            'peak_bytes': self.peak_bytes,
+            'budget_bytes': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'loaded_bytes': self.loaded_bytes,
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        mb = 1024 * 1024
+        print(f"텍스처 {s['textures']}개 (사용 중 {s['in_use']}) | "
+              f"{s['resident_bytes'] / mb:.1f}MB / 예산 {s['budget_bytes'] / mb:.0f}MB "
+              f"(최대 {s['peak_bytes'] / mb:.1f}MB) | 적중 {s['hits']} / 로드 {s['misses']} | "
+              f"버림 {s['evictions']} | 누적 로드 {s['loaded_bytes'] / mb:.1f}MB")
+
+
+# 모든 엔티티와 모드가 함께 쓰는 레지스트리
+ASSETS = AssetManager()
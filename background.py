@@ -1,8 +1,10 @@
 from pico2d import *
+from asset_manager import ASSETS
 
 class ParallaxLayer:
     
     def __init__(self, image_path, scroll_speed):
+        self.image_path = image_path
         self.scroll_speed = scroll_speed
         self.x1 = 0
         self.x2 = 0
@@ -11,7 +13,7 @@ class ParallaxLayer:
         self.image = None
         
         try:
-            self.image = load_image(image_path)
+            self.image = ASSETS.acquire(image_path)
             self.width = self.image.w
             self.height = self.image.h
             # 무한 스크롤을 위한 두 배경 위치
@@ -47,6 +49,11 @@ class ParallaxLayer:
     def reset(self):
         self.x1 = 0
         self.x2 = self.width
+    
+    def release(self):
+        if self.image:
+            ASSETS.release(self.image_path)
+            self.image = None
 
 
 class Background:
@@ -81,3 +88,7 @@ class Background:
     def reset(self):
         for layer in self.all_layers:
             layer.reset()
+    
+    def release(self):
+        for layer in self.all_layers:
+            layer.release()
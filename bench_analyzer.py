@@ -0,0 +1,376 @@
+"""
+음악 분석 벤치마크 - 음악 파일 없이 NumPy로 만든 합성 오디오로 단계별 시간/메모리 측정
+
+  - 합성 오디오: 클릭 트랙(click), 킥/스네어/하이햇 드럼 패턴(drums)
+  - 단계: decode, envelope, beat, onset, chart, cache_key, cache_save, cache_load, chart_cache_load
+  - 최대 메모리: tracemalloc 최대 할당량 (NumPy 배열 포함) + 프로세스 최대 RSS
+  - 결과는 JSON Lines로 누적 저장하여 이전 실행과 비교할 수 있다
+
+사용법:
+    python bench_analyzer.py                              # 30/120/300초 곡, 표 출력
+    python bench_analyzer.py --lengths 60 600 --repeat 5
+    python bench_analyzer.py --output bench_history.jsonl # 결과를 한 줄 JSON으로 추가
+    python bench_analyzer.py --compare bench_history.jsonl --threshold 1.2
+"""
+import os
+import sys
+import io
+import json
+import time
+import platform
+import tempfile
+import argparse
+import tracemalloc
+import contextlib
+import subprocess
+import numpy as np
+import soundfile as sf
+import librosa
+import analysis_cache
+from music_analyzer import MusicAnalyzer, ANALYSIS_PROFILES, DEFAULT_PROFILE, DIFFICULTIES
+
+try:
+    import resource  # Windows에는 없음
+except ImportError:
+    resource = None
+
+SOURCE_SR = 44100
+SIGNALS = ('click', 'drums')
+
+
+def click_track(duration, bpm=120, sr=SOURCE_SR):
+    """일정한 BPM의 클릭 트랙 (강박은 높은 음, 나머지는 낮은 음)"""
+    y = np.zeros(int(duration * sr), dtype=np.float32)
+    click_len = int(0.03 * sr)
+    t = np.arange(click_len) / sr
+    envelope = np.exp(-t * 150)
+    accent = (np.sin(2 * np.pi * 1500 * t) * envelope).astype(np.float32)
+    normal = (np.sin(2 * np.pi * 1000 * t) * envelope * 0.6).astype(np.float32)
+
+    beat_interval = 60.0 / bpm
+    for i, beat_time in enumerate(np.arange(0, duration, beat_interval)):
+        start = int(beat_time * sr)
+        click = accent if i % 4 == 0 else normal
+        end = min(start + click_len, len(y))
+        y[start:end] += click[:end - start]
+    return y
+
+
+def drum_pattern(duration, bpm=128, sr=SOURCE_SR, seed=0):
+    """
+    16비트 드럼 패턴 (킥: 피치가 내려가는 사인, 스네어: 노이즈 + 톤, 하이햇: 고역 노이즈)
+
+    마디마다 일부 음을 무작위로 빼거나 더해서 온셋 검출이 단순 반복이 되지 않게 한다.
+    """
+    rng = np.random.default_rng(seed)
+    y = np.zeros(int(duration * sr), dtype=np.float32)
+
+    t = np.arange(int(0.25 * sr)) / sr
+    kick = np.sin(2 * np.pi * (50 + 100 * np.exp(-t * 30)) * t) * np.exp(-t * 12)
+    t = np.arange(int(0.15 * sr)) / sr
+    snare = (rng.standard_normal(len(t)) * 0.6 + np.sin(2 * np.pi * 200 * t)) * np.exp(-t * 25)
+    t = np.arange(int(0.05 * sr)) / sr
+    hat = np.diff(rng.standard_normal(len(t) + 1)) * np.exp(-t * 80) * 0.3
+
+    base = {
+        'kick': [0, 6, 8],
+        'snare': [4, 12],
+        'hat': list(range(0, 16, 2)),
+    }
+    sounds = {'kick': kick, 'snare': snare, 'hat': hat}
+
+    step = 60.0 / bpm / 4
+    bar = step * 16
+    for bar_start in np.arange(0, duration, bar):
+        for name, steps in base.items():
+            steps = [s for s in steps if rng.random() > 0.1]
+            if rng.random() < 0.3:
+                steps.append(int(rng.integers(0, 16)))
+            for s in steps:
+                start = int((bar_start + s * step) * sr)
+                if start >= len(y):
+                    continue
+                sound = sounds[name]
+                end = min(start + len(sound), len(y))
+                y[start:end] += sound[:end - start].astype(np.float32)
+
+    return y / max(1.0, float(np.abs(y).max()))
+
+
+def write_signal(path, signal, duration, seed=0):
+    """합성 오디오를 스테레오 wav 파일로 저장"""
+    y = click_track(duration) if signal == 'click' else drum_pattern(duration, seed=seed)
+    sf.write(path, np.stack([y, y], axis=1), SOURCE_SR, subtype='PCM_16')
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB, 측정 불가 시 None)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+
+
+def run_once(music_path, cache_dir, profile, streaming):
+    """분석 전 과정을 한 번 실행하고 단계별 시간(초)과 결과 개수 반환"""
+    times = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = MusicAnalyzer(music_path, streaming=streaming, profile=profile)
+        analyzer.cache_dir = cache_dir
+        if streaming:
+            analyzer.analyze_streaming()
+        else:
+            analyzer.analyze_full()
+        analyzer.is_loaded = True
+        times.update(analyzer.stage_times)
+
+        start = time.perf_counter()
+        charts = analyzer.generate_all_charts(3.0)
+        times['chart'] = time.perf_counter() - start
+
+        # 캐시 키 계산(파일 해싱)은 저장 시간과 따로 측정
+        start = time.perf_counter()
+        analyzer.get_cache_key()
+        times['cache_key'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analyzer.save_to_cache()
+        for difficulty, chart in charts.items():
+            analyzer.save_chart_to_cache(difficulty, 3.0, chart)
+        times['cache_save'] = time.perf_counter() - start
+
+        cached = MusicAnalyzer(music_path, profile=profile)
+        cached.cache_dir = cache_dir
+        cached.cache_key = analyzer.cache_key
+        start = time.perf_counter()
+        ok = cached.load_from_cache()
+        # memmap 배열을 실제로 읽어 지연 로드 비용 포함
+        float(np.sum(cached.beat_times)) + float(np.sum(cached.onset_times))
+        times['cache_load'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for difficulty in DIFFICULTIES:
+            cached.load_chart_from_cache(difficulty, 3.0)
+        times['chart_cache_load'] = time.perf_counter() - start
+
+    counts = {
+        'tempo': analyzer.tempo,
+        'n_beats': len(analyzer.beat_times),
+        'n_onsets': len(analyzer.onset_times),
+        'n_notes': {difficulty: len(chart) for difficulty, chart in charts.items()},
+        'cache_ok': ok,
+    }
+    return times, counts
+
+
+def measure_peak_memory(music_path, cache_dir, profile, streaming):
+    """tracemalloc으로 분석 1회의 최대 할당량(MB) 측정 (시간 측정과 별도 실행)"""
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = MusicAnalyzer(music_path, streaming=streaming, profile=profile)
+            analyzer.cache_dir = cache_dir
+            if streaming:
+                analyzer.analyze_streaming()
+            else:
+                analyzer.analyze_full()
+            analyzer.is_loaded = True
+            analyzer.generate_all_charts(3.0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def bench_case(signal, duration, profile, streaming, repeat, tmp_dir):
+    """합성 곡 하나를 repeat회 분석하여 단계별 최소/중앙값 시간과 최대 메모리 반환"""
+    music_path = os.path.join(tmp_dir, f'{signal}_{int(duration)}s.wav')
+    if not os.path.exists(music_path):
+        write_signal(music_path, signal, duration)
+
+    samples = {}
+    counts = None
+    for i in range(repeat):
+        cache_dir = os.path.join(tmp_dir, f'cache_{signal}_{int(duration)}_{i}')
+        times, counts = run_once(music_path, cache_dir, profile, streaming)
+        for stage, seconds in times.items():
+            samples.setdefault(stage, []).append(seconds)
+
+    stages = {
+        stage: {'min': min(values), 'median': float(np.median(values))}
+        for stage, values in samples.items()
+    }
+    # 합계는 캐시가 없을 때 곡 하나를 준비하는 시간 (캐시 로드 제외)
+    total = sum(v['median'] for s, v in stages.items() if s not in ('cache_load', 'chart_cache_load'))
+    peak_mb = measure_peak_memory(music_path, os.path.join(tmp_dir, 'cache_mem'), profile, streaming)
+
+    return {
+        'signal': signal,
+        'duration': duration,
+        'profile': profile,
+        'streaming': streaming,
+        'repeat': repeat,
+        'stages': stages,
+        'analysis_total': total,
+        'realtime_factor': duration / total if total > 0 else None,
+        'peak_alloc_mb': peak_mb,
+        **counts,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def warmup():
+    """numba JIT 컴파일 시간이 첫 측정에 포함되지 않도록 beat_track/onset_detect를 미리 실행"""
+    env = np.random.default_rng(0).random(1000).astype(np.float32)
+    librosa.beat.beat_track(onset_envelope=env, sr=22050)
+    librosa.onset.onset_detect(onset_envelope=env, sr=22050, backtrack=True)
+
+
+def run_benchmark(lengths, signals=SIGNALS, profile=DEFAULT_PROFILE, streaming=False, repeat=3):
+    """
+    벤치마크 실행
+
+    Returns:
+        dict: 실행 환경 정보와 케이스별 결과 (JSON 직렬화 가능)
+    """
+    warmup()
+    cases = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for duration in lengths:
+            for signal in signals:
+                case = bench_case(signal, duration, profile, streaming, repeat, tmp_dir)
+                cases.append(case)
+                print_case(case)
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'librosa': librosa.__version__,
+        },
+        'cache_format_version': analysis_cache.CACHE_FORMAT_VERSION,
+        'peak_rss_mb': peak_rss_mb(),
+        'cases': cases,
+    }
+
+
+def print_header():
+    print("\n음악 분석 벤치마크 (단계별 중앙값, ms)")
+    print("=" * 130)
+    print(f"{'곡':14} | {'디코딩':>7} | {'엔벨로프':>7} | {'비트':>7} | {'온셋':>6} | {'채보':>6} | "
+          f"{'키':>6} | {'캐시저장':>6} | {'캐시로드':>6} | {'채보로드':>6} | {'합계':>8} | {'실시간':>6} | "
+          f"{'최대할당':>7}")
+    print("-" * 130)
+
+
+def print_case(case):
+    stages = case['stages']
+
+    def ms(*names):
+        for name in names:
+            if name in stages:
+                return f"{stages[name]['median'] * 1000:7.1f}"
+        return f"{'-':>7}"
+
+    decode = ms('decode') if 'decode' in stages else f"{'(스트림)':>7}"
+    print(f"{case['signal'] + ' ' + str(int(case['duration'])) + 's':14} | {decode} | "
+          f"{ms('envelope', 'decode+envelope')} | {ms('beat')} | {ms('onset')} | {ms('chart')} | "
+          f"{ms('cache_key')} | {ms('cache_save')} | {ms('cache_load')} | {ms('chart_cache_load')} | "
+          f"{case['analysis_total'] * 1000:8.1f} | {case['realtime_factor']:5.0f}x | "
+          f"{case['peak_alloc_mb']:5.1f}MB")
+
+
+def compare(result, baseline, threshold):
+    """
+    이전 결과와 케이스/단계별 중앙값 비교
+
+    Returns:
+        list: threshold배 이상 느려진 (케이스, 단계, 이전, 현재) 목록
+    """
+    previous = {(c['signal'], c['duration'], c['profile'], c['streaming']): c for c in baseline['cases']}
+    regressions = []
+    compared = 0
+    print(f"\n이전 결과와 비교 (기준: {baseline['timestamp']}, 커밋 {baseline.get('commit')})")
+    print("=" * 80)
+    for case in result['cases']:
+        key = (case['signal'], case['duration'], case['profile'], case['streaming'])
+        old = previous.get(key)
+        if old is None:
+            continue
+        compared += 1
+        for stage, value in case['stages'].items():
+            if stage not in old['stages']:
+                continue
+            before = old['stages'][stage]['median']
+            after = value['median']
+            ratio = after / before if before > 0 else 1.0
+            # 1ms 미만 단계는 측정 잡음이 커서 회귀로 보지 않음
+            slow = ratio >= threshold and after - before > 0.001
+            if slow:
+                regressions.append((f"{case['signal']} {int(case['duration'])}s", stage, before, after))
+            label = f"{case['signal']} {int(case['duration'])}s"
+            print(f"{label:12} {stage:16} | {before * 1000:8.1f}ms -> "
+                  f"{after * 1000:8.1f}ms ({ratio:5.2f}x){'  <- 느려짐' if slow else ''}")
+    if compared == 0:
+        print("같은 설정(신호/길이/프로파일/스트리밍)의 이전 결과가 없음")
+    print("=" * 80)
+    return regressions
+
+
+def load_last_result(path):
+    """JSON Lines 파일의 마지막 결과"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 오디오로 음악 분석 단계별 성능 측정')
+    parser.add_argument('--lengths', type=float, nargs='+', default=[30, 120, 300],
+                        help='합성 곡 길이 (초)')
+    parser.add_argument('--signals', nargs='+', choices=SIGNALS, default=list(SIGNALS))
+    parser.add_argument('--profile', choices=list(ANALYSIS_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument('--streaming', action='store_true', help='스트리밍 분석 측정')
+    parser.add_argument('--repeat', type=int, default=3, help='케이스별 반복 횟수')
+    parser.add_argument('--output', metavar='JSONL', help='결과를 JSON 한 줄로 추가할 파일')
+    parser.add_argument('--compare', metavar='JSONL', help='이 파일의 마지막 결과와 비교')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='이 배수 이상 느려지면 회귀로 보고 종료 코드 1')
+    args = parser.parse_args()
+
+    # 비교 기준은 이번 결과를 추가하기 전에 읽음 (--output과 같은 파일이어도 됨)
+    baseline = load_last_result(args.compare) if args.compare and os.path.exists(args.compare) else None
+
+    print_header()
+    result = run_benchmark(args.lengths, args.signals, args.profile, args.streaming, args.repeat)
+    print("=" * 130)
+    if result['peak_rss_mb'] is not None:
+        print(f"프로세스 최대 RSS: {result['peak_rss_mb']:.1f}MB")
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+        print(f"결과 저장: {args.output}")
+
+    if baseline:
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"성능 회귀 {len(regressions)}건")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+에셋 레지스트리 벤치마크 - PlayMode 진입과 R 재시작 반복 시 텍스처 로드 횟수/시간
+
+PlayMode.enter()가 로드하는 파일 목록 (플레이어 시트, 배경 3장, HP 바 2장)을
+    - 기존 방식: 진입할 때마다 전부 로드 (같은 파일을 두 키로 두 번 로드하는 것 포함)
+    - AssetManager: 경로로 공유, 재시작 사이에는 캐시 적중
+으로 돌려 비교하고, 예산을 줄였을 때 LRU로 버려지는 양도 보여준다.
+
+load_image 대신 Pillow로 디코드한다 (창 없이 실행, 디스크 읽기 + PNG 디코드 비용은 같음).
+
+사용법: python bench_assets.py [재시작 횟수]
+"""
+import sys
+import time
+from PIL import Image
+import sprite_cache
+from asset_manager import AssetManager, DEFAULT_BUDGET
+from player import SPRITE_SHEETS, SPRITE_SIZE
+from ui import HEART_SHEET
+
+BACKGROUND_LAYERS = ['background-back.png', 'background-tree.png', 'background-grass.png']
+
+
+class DecodedImage:
+    """load_image 결과 대신 쓰는 디코드된 이미지 (w, h만 사용)"""
+
+    def __init__(self, path):
+        with Image.open(path) as image:
+            image.load()
+            self.w, self.h = image.size
+            self.pixels = image.tobytes()
+
+
+def play_mode_assets():
+    """PlayMode.enter() 한 번에 로드하는 파일 (로드 순서대로, 중복 포함)"""
+    paths = [sprite_cache.select_variant(path, SPRITE_SIZE, SPRITE_SIZE, draw_scale)[0]
+             for path, _, draw_scale in SPRITE_SHEETS.values()]
+    paths += BACKGROUND_LAYERS
+    paths.append('white.png')
+    paths.append(sprite_cache.select_variant(HEART_SHEET, 256, 256, 0.15)[0])
+    return paths
+
+
+def run_direct(paths, restarts):
+    loads = 0
+    start = time.perf_counter()
+    for _ in range(restarts + 1):
+        images = [DecodedImage(path) for path in paths]
+        loads += len(images)
+    return time.perf_counter() - start, loads
+
+
+def run_registry(paths, restarts, budget):
+    assets = AssetManager(budget_bytes=budget, loader=DecodedImage)
+    start = time.perf_counter()
+    for _ in range(restarts + 1):
+        for path in paths:
+            assets.acquire(path)
+        for path in paths:
+            assets.release(path)
+    return time.perf_counter() - start, assets.stats()
+
+
+def main(restarts=5):
+    paths = play_mode_assets()
+    print(f"\n에셋 레지스트리 벤치마크 (PlayMode 진입 1회 + 재시작 {restarts}회, 진입당 {len(paths)}개 로드 요청)")
+    print("=" * 92)
+
+    wall, loads = run_direct(paths, restarts)
+    print(f"{'기존 (매번 로드)':24} | {wall * 1000:8.1f}ms | 로드 {loads:4}회")
+
+    mb = 1024 * 1024
+    for budget in (DEFAULT_BUDGET, 64 * mb, 0):
+        label = f"AssetManager 예산 {budget // mb}MB"
+        wall, s = run_registry(paths, restarts, budget)
+        print(f"{label:24} | {wall * 1000:8.1f}ms | 로드 {s['misses']:4}회 | 적중 {s['hits']:4} | "
+              f"버림 {s['evictions']:3} | 보관 {s['resident_bytes'] / mb:6.1f}MB | "
+              f"최대 {s['peak_bytes'] / mb:6.1f}MB")
+    print("=" * 92)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,90 @@
+"""
+텍스처 아틀라스 벤치마크 - 플레이어/이펙트/하트를 시트로 그릴 때와 아틀라스로 그릴 때
+
+    - 텍스처 수 / 크기 (RGBA8 기준 폭 x 높이 x 4)와 가장 큰 텍스처 한 변
+    - 프레임당 바인딩 수: 몸통 -> 이펙트 -> 하트 순서로 그릴 때 텍스처가 바뀌는 횟수
+      (몸통 애니메이션 x (이펙트 없음 + 이펙트 4종) 조합, 각 조합은 모든 프레임 쌍의 평균)
+
+시트는 원본과 축소 캐시(sprite_cache, 빌드되어 있으면) 둘 다 보여준다.
+아틀라스는 임시 폴더에 새로 빌드한다. Pillow가 필요하다.
+
+사용법: python bench_atlas.py
+"""
+import os
+import tempfile
+from PIL import Image
+import sprite_cache
+import sprite_atlas
+from player import SPRITE_SHEETS, BODY_SCALE
+
+EFFECTS = ['prepare', 'accurate', 'parry_sky_effect', 'counter_effect']
+
+
+def image_size(path):
+    with Image.open(path) as image:
+        return image.size
+
+
+def sheet_textures(scaled):
+    """애니메이션 -> 프레임별 텍스처 파일 (시트 방식, 모든 프레임이 같은 텍스처)"""
+    textures = {}
+    for name, (path, frame_size, _, total, draw_scale) in sprite_atlas.atlas_sources().items():
+        if scaled:
+            path = sprite_cache.select_variant(path, frame_size, frame_size, draw_scale)[0]
+        textures[name] = [path] * total
+    return textures
+
+
+def atlas_textures(manifest, atlas_dir):
+    """애니메이션 -> 프레임별 텍스처 파일 (아틀라스 방식, 한 애니메이션이 여러 아틀라스에 걸칠 수 있음)"""
+    atlas = sprite_atlas.SpriteAtlas(manifest, atlas_dir)
+    return {name: [atlas.paths[frame.atlas] if frame else None for frame in frames]
+            for name, frames in atlas.animations.items()}
+
+
+def binds(sequence):
+    sequence = [texture for texture in sequence if texture]
+    return sum(1 for i, texture in enumerate(sequence) if i == 0 or texture != sequence[i - 1])
+
+
+def binds_per_frame(textures):
+    """몸통 -> (이펙트) -> 하트를 그릴 때 텍스처 전환 횟수 평균 (하트는 0번 프레임 기준)"""
+    bodies = [name for name, spec in SPRITE_SHEETS.items() if spec[2] == BODY_SCALE]
+    heart = textures['heart'][0]
+    averages = []
+    for body in bodies:
+        for effect in [None] + EFFECTS:
+            effect_frames = textures[effect] if effect else [None]
+            counts = [binds([b, e, heart]) for b in textures[body] for e in effect_frames]
+            averages.append(sum(counts) / len(counts))
+    return sum(averages) / len(averages)
+
+
+def report(label, files, binds):
+    sizes = [image_size(path) for path in files]
+    total = sum(w * h * 4 for w, h in sizes)
+    largest = max(max(w, h) for w, h in sizes)
+    print(f"{label:22} | {len(files):5}개 | {total / 2 ** 20:8.1f}MB | {largest:6}px | {binds:5.2f}")
+
+
+def main():
+    print("\n텍스처 아틀라스 벤치마크")
+    print("=" * 70)
+    print(f"{'방식':22} | {'텍스처':>6} | {'크기':>10} | {'최대 한 변':>8} | {'바인딩/프레임':>5}")
+    print("-" * 70)
+
+    for label, scaled in (('시트 (원본)', False), ('시트 (축소 캐시)', True)):
+        textures = sheet_textures(scaled)
+        files = sorted({path for frames in textures.values() for path in frames})
+        report(label, files, binds_per_frame(textures))
+
+    with tempfile.TemporaryDirectory() as atlas_dir:
+        manifest = sprite_atlas.build_atlas(atlas_dir)
+        textures = atlas_textures(manifest, atlas_dir)
+        files = [os.path.join(atlas_dir, name) for name in manifest['atlases']]
+        report(f"아틀라스 {manifest['atlas_size']}px", files, binds_per_frame(textures))
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+캐시 벤치마크
+  - 기존 JSON 캐시와 바이너리 캐시의 로드 시간/크기 비교
+  - 캐시 키 계산: 전체 파일 해싱 vs 해시 인덱스 조회 (곡 길이와 무관해야 함)
+
+사용법: python bench_cache.py [반복 횟수] [음악 폴더]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import tempfile
+import numpy as np
+import analysis_cache
+
+
+def load_json(path):
+    """기존 load_from_cache와 같은 방식으로 JSON 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return np.array(data['beat_times']), np.array(data['onset_times'])
+
+
+def load_binary(path, touch):
+    data = analysis_cache.read_cache(path)
+    if touch:
+        # 배열을 실제로 읽어서 지연 로드 비용까지 포함
+        float(data.beat_times.sum()) + float(data.onset_times.sum())
+    return data
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench(cache_dir='charts_cache', repeat=200):
+    json_files = analysis_cache.legacy_cache_files(cache_dir)
+    if not json_files:
+        print(f"JSON 캐시 파일이 없음: {cache_dir}")
+        return
+
+    print(f"\n캐시 포맷 벤치마크 (반복 {repeat}회, 평균)")
+    print("=" * 96)
+    print(f"{'파일':35} | {'JSON 크기':>10} | {'BIN 크기':>9} | {'JSON 로드':>9} | {'BIN 열기':>9} | {'BIN 전체':>9}")
+    print("-" * 96)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for json_path in json_files:
+            name = os.path.splitext(os.path.basename(json_path))[0]
+            bin_path = os.path.join(tmp_dir, name + analysis_cache.CACHE_EXT)
+            analysis_cache.migrate_legacy_json(json_path, bin_path)
+
+            # 값이 완전히 같은지 확인
+            beats, onsets = load_json(json_path)
+            data = analysis_cache.read_cache(bin_path)
+            same = np.array_equal(beats, data.beat_times) and np.array_equal(onsets, data.onset_times)
+            del data
+
+            json_size = os.path.getsize(json_path)
+            bin_size = os.path.getsize(bin_path)
+            json_ms = measure(lambda: load_json(json_path), repeat)
+            open_ms = measure(lambda: load_binary(bin_path, False), repeat)
+            full_ms = measure(lambda: load_binary(bin_path, True), repeat)
+
+            print(f"{name[:35]:35} | {json_size / 1024:8.1f}KB | {bin_size / 1024:7.1f}KB | "
+                  f"{json_ms:7.3f}ms | {open_ms:7.3f}ms | {full_ms:7.3f}ms"
+                  f"{'' if same else '  (값 불일치!)'}")
+
+    print("=" * 96)
+
+
+def bench_cache_key(music_dir='music', repeat=200):
+    music_files = sorted(
+        f for f in glob.glob(os.path.join(music_dir, '*'))
+        if os.path.splitext(f)[1].lower() in ('.mp3', '.wav', '.ogg', '.flac')
+    )
+    if not music_files:
+        print(f"음악 파일이 없음: {music_dir}")
+        return
+
+    print(f"\n캐시 키 계산 벤치마크 (적중 시 반복 {repeat}회 평균)")
+    print("=" * 80)
+    print(f"{'파일':35} | {'크기':>8} | {'전체 해싱':>10} | {'인덱스 적중':>10}")
+    print("-" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = analysis_cache.FileHashIndex.for_dir(tmp_dir)
+        for path in music_files:
+            size = os.path.getsize(path)
+            hash_ms = measure(lambda: analysis_cache.hash_file(path), max(1, repeat // 20))
+            index.get_hash(path)  # 인덱스 등록 (미스)
+            hit_ms = measure(lambda: index.get_hash(path), repeat)
+            print(f"{os.path.basename(path)[:35]:35} | {size / 1024 / 1024:6.1f}MB | "
+                  f"{hash_ms:8.3f}ms | {hit_ms:8.4f}ms")
+        print(f"인덱스 적중 {index.hits}회, 미스 {index.misses}회")
+
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    music_dir = sys.argv[2] if len(sys.argv) > 2 else 'music'
+    bench(repeat=repeat)
+    bench_cache_key(music_dir, repeat=repeat)
@@ -0,0 +1,163 @@
+"""
+채보 생성 벤치마크
+  - 벡터화된 generate_chart가 기존(순수 파이썬) 구현과 비트 단위로 같은지 확인
+  - 온셋 수를 10^6까지 늘리며 난이도별 생성 시간 측정
+
+사용법: python bench_chart.py [최대 온셋 수]
+"""
+import sys
+import time
+import contextlib
+import io
+import numpy as np
+import analysis_cache
+from music_analyzer import MusicAnalyzer, DIFFICULTIES
+
+
+def legacy_generate_chart(beat_times, onset_times, difficulty='normal', start_delay=2.0):
+    """기존 generate_chart 구현 (비교 기준)"""
+    if difficulty == 'easy':
+        chart = [t + start_delay for i, t in enumerate(beat_times) if i % 2 == 0]
+
+    elif difficulty in ('normal', 'hard'):
+        all_onsets = list(onset_times)
+        all_beats = list(beat_times)
+        beat_step, min_dist, min_gap = (4, 0.15, 0.2) if difficulty == 'normal' else (2, 0.1, 0.1)
+
+        selected_notes = []
+        for i, beat in enumerate(all_beats):
+            if i % beat_step == 0:
+                selected_notes.append(beat)
+        for onset in all_onsets:
+            min_beat_dist = min([abs(onset - bt) for bt in all_beats]) if all_beats else 1.0
+            if min_beat_dist >= min_dist:
+                selected_notes.append(onset)
+        selected_notes = sorted(selected_notes)
+
+        filtered = []
+        last_time = -1
+        for t in selected_notes:
+            if last_time < 0 or t - last_time >= min_gap:
+                filtered.append(t + start_delay)
+                last_time = t
+        chart = filtered
+
+    elif difficulty == 'expert':
+        combined = list(beat_times) + list(onset_times)
+        beat_intervals = []
+        for i in range(len(beat_times) - 1):
+            beat_intervals.append((beat_times[i] + beat_times[i + 1]) / 2)
+        combined.extend(beat_intervals)
+        combined = sorted(set(combined))
+
+        filtered = []
+        last_time = -1
+        for t in combined:
+            if t - last_time >= 0.1:
+                filtered.append(t + start_delay)
+                last_time = t
+        chart = filtered
+
+    else:
+        chart = [t + start_delay for t in beat_times]
+
+    chart_with_type = []
+    if len(chart) > 1:
+        for i in range(len(chart)):
+            note_time = chart[i]
+            if i < len(chart) - 1:
+                interval = chart[i + 1] - note_time
+                if interval >= 1.5 and interval <= 3.0:
+                    chart_with_type.append({'time': note_time, 'type': 'long', 'duration': interval * 0.7})
+                    continue
+            chart_with_type.append({'time': note_time, 'type': 'normal', 'duration': 0})
+    else:
+        chart_with_type = [{'time': t, 'type': 'normal', 'duration': 0} for t in chart]
+    return chart_with_type
+
+
+def make_analyzer(beat_times, onset_times):
+    analyzer = MusicAnalyzer('')
+    analyzer.beat_times = np.asarray(beat_times)
+    analyzer.onset_times = np.asarray(onset_times)
+    analyzer.is_loaded = True
+    return analyzer
+
+
+def synthetic_song(n_onsets, seed=0):
+    """곡 길이를 온셋 밀도(초당 약 5개)에 맞춘 가상의 비트/온셋 (프레임 단위로 양자화)"""
+    rng = np.random.default_rng(seed)
+    frame = 512 / 22050
+    duration = n_onsets / 5.0
+    beat_frames = np.arange(0.2, duration, 60 / 128) / frame
+    beats = np.round(beat_frames + rng.normal(0, 0.3, len(beat_frames))) * 512 / 22050
+    onsets = np.unique(rng.integers(0, int(duration / frame), n_onsets)) * 512 / 22050
+    return beats, onsets
+
+
+def same_chart(a, b):
+    return len(a) == len(b) and all(
+        x['type'] == y['type'] and x['time'] == y['time'] and x['duration'] == y['duration']
+        for x, y in zip(a, b)
+    )
+
+
+def check_compatibility():
+    """캐시된 곡 + 무작위 데이터로 기존 구현과 결과 비교"""
+    cases = []
+    for path in analysis_cache.legacy_cache_files('charts_cache'):
+        data = analysis_cache.read_legacy_json(path)
+        cases.append((path, data.beat_times, data.onset_times))
+    for seed in range(5):
+        beats, onsets = synthetic_song(2000, seed)
+        cases.append((f'random seed={seed}', beats, onsets))
+    cases.append(('비트 없음', np.zeros(0), np.array([0.0, 0.5, 0.55, 3.0])))
+    cases.append(('노트 1개', np.array([1.0]), np.zeros(0)))
+
+    print("\n기존 구현과 비교")
+    print("=" * 70)
+    all_ok = True
+    for name, beats, onsets in cases:
+        analyzer = make_analyzer(beats, onsets)
+        results = []
+        for difficulty in DIFFICULTIES + ('unknown',):
+            with contextlib.redirect_stdout(io.StringIO()):
+                new = analyzer.generate_chart(difficulty, 3.0)
+            results.append(same_chart(new, legacy_generate_chart(beats, onsets, difficulty, 3.0)))
+        ok = all(results)
+        all_ok = all_ok and ok
+        print(f"{name[:45]:45} | {'OK' if ok else 'FAIL ' + str(results)}")
+    print("=" * 70)
+    return all_ok
+
+
+def bench_scaling(max_onsets=10 ** 6):
+    print("\n채보 생성 시간 (4개 난이도 합계)")
+    print("=" * 70)
+    print(f"{'온셋 수':>10} | {'비트 수':>8} | {'벡터화':>10} | {'기존':>10}")
+    print("-" * 70)
+    n = 1000
+    while n <= max_onsets:
+        beats, onsets = synthetic_song(n)
+        analyzer = make_analyzer(beats, onsets)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            analyzer.generate_all_charts(3.0)
+            new_ms = (time.perf_counter() - start) * 1000
+
+            # 기존 구현은 O(온셋 x 비트)라 작은 입력에서만 측정
+            legacy = '-'
+            if n <= 10000:
+                start = time.perf_counter()
+                for difficulty in DIFFICULTIES:
+                    legacy_generate_chart(beats, onsets, difficulty, 3.0)
+                legacy = f"{(time.perf_counter() - start) * 1000:8.1f}ms"
+        print(f"{len(onsets):10} | {len(beats):8} | {new_ms:8.1f}ms | {legacy:>10}")
+        n *= 10
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    max_onsets = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    check_compatibility()
+    bench_scaling(max_onsets)
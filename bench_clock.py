@@ -0,0 +1,100 @@
+"""
+곡 시간 시계 정확도 시뮬레이션
+  - 가상 믹서: 재생 시작 지연, 버퍼 단위로 띄엄띄엄 증가하는 get_pos(), 오디오 클럭 속도 오차
+  - 가상 부하: 프레임 간격 흔들림과 가끔 생기는 긴 프레임 (끊김)
+  - 단조 시계만 쓰는 기존 방식과 SongClock의 판정 시간 오차 (실제 소리 위치 기준) 비교
+
+사용법: python bench_clock.py [시뮬레이션 길이(초)]
+"""
+import sys
+import random
+import numpy as np
+from song_clock import SongClock
+
+START_DELAY = 3.0
+
+
+class FakeMixer:
+    """
+    Args:
+        latency: play() 후 실제 소리가 나기까지의 지연 (초)
+        buffer_ms: get_pos()가 증가하는 단위 (믹서 버퍼 길이, ms)
+        rate: 오디오 클럭 속도 (1.0이면 단조 시계와 같음)
+    """
+
+    def __init__(self, latency, buffer_ms, rate):
+        self.latency = latency
+        self.buffer_ms = buffer_ms
+        self.rate = rate
+        self.play_wall = None
+
+    def play(self, wall):
+        self.play_wall = wall
+
+    def audio_time(self, wall):
+        """실제로 들리고 있는 곡 위치 (초)"""
+        return max(0.0, (wall - self.play_wall - self.latency) * self.rate)
+
+    def get_pos(self, wall):
+        ms = self.audio_time(wall) * 1000
+        return int(ms // self.buffer_ms * self.buffer_ms)
+
+
+def simulate(latency, buffer_ms, rate, hitch_rate, duration, seed=0):
+    """
+    한 곡 진행 시뮬레이션
+
+    Returns:
+        tuple: (기존 방식 오차 배열, SongClock 오차 배열, 추정 오프셋, 시계)
+    """
+    rng = random.Random(seed)
+    wall = [0.0]
+    clock = SongClock(START_DELAY, now=lambda: wall[0])
+    mixer = FakeMixer(latency, buffer_ms, rate)
+
+    clock.start()
+    playing = False
+    naive_errors = []
+    clock_errors = []
+    while wall[0] < START_DELAY + duration:
+        # 부하: 평소 60fps 근처에서 흔들리고 가끔 긴 프레임
+        dt = 1 / 60 + rng.uniform(-0.004, 0.004)
+        if rng.random() < hitch_rate:
+            dt += rng.uniform(0.05, 0.2)
+        wall[0] += dt
+
+        if not playing and clock.elapsed() >= START_DELAY:
+            mixer.play(wall[0])
+            playing = True
+        song_time = clock.update(mixer.get_pos(wall[0]) if playing else None)
+
+        # 소리가 나기 시작한 뒤부터 비교
+        if playing and mixer.audio_time(wall[0]) > 0:
+            actual = mixer.audio_time(wall[0])
+            naive_errors.append(wall[0] - START_DELAY - actual)
+            clock_errors.append(song_time - actual)
+    return np.abs(naive_errors) * 1000, np.abs(clock_errors) * 1000, clock.offset, clock
+
+
+def main(duration=120.0):
+    cases = (
+        # (설명, 지연, 버퍼 ms, 클럭 속도, 끊김 확률)
+        ('지연 50ms', 0.05, 23.2, 1.0, 0.0),
+        ('지연 120ms + 부하', 0.12, 46.4, 1.0, 0.02),
+        ('클럭 오차 0.2%', 0.05, 23.2, 0.998, 0.0),
+        ('지연 + 클럭 오차 + 부하', 0.12, 46.4, 1.002, 0.05),
+    )
+    print(f"\n판정 시간 오차 (실제 소리 위치 기준, {duration:.0f}초, ms)")
+    print("=" * 92)
+    print(f"{'조건':>22} | {'기존 평균':>9} | {'기존 최대':>9} | {'시계 평균':>9} | "
+          f"{'시계 p95':>9} | {'추정 지연':>9} | {'표본':>6}")
+    print("-" * 92)
+    for label, latency, buffer_ms, rate, hitch_rate in cases:
+        naive, smoothed, offset, clock = simulate(latency, buffer_ms, rate, hitch_rate, duration)
+        print(f"{label:>22} | {naive.mean():9.1f} | {naive.max():9.1f} | {smoothed.mean():9.1f} | "
+              f"{np.percentile(smoothed, 95):9.1f} | {offset * 1000:9.1f} | {clock.samples:6}")
+    print("=" * 92)
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 120.0)
@@ -0,0 +1,112 @@
+"""
+입력 시각 → 판정 시각 오차 측정 (가상 입력 주입)
+  - 가상 시계 위에서 게임 루프(이벤트 처리 → 업데이트 → 그리기 → 10ms 대기)를 흉내 냄
+  - 무작위 시각에 키 입력을 주입하고, 판정에 쓰인 곡 시간과 실제로 누른 곡 시간의 차이를 기록
+  - 기존: 프레임 시작에만 폴링, 이전 update의 current_time으로 판정
+  - 타임스탬프: 프레임 시작에만 폴링, 가져온 시각으로 판정
+  - 대기 중 폴링: EventPoller.wait로 1ms마다 폴링, 가져온 시각으로 판정
+
+사용법: python bench_input.py [입력 수]
+"""
+import sys
+import random
+import numpy as np
+from input_events import EventPoller
+from song_clock import SongClock
+
+START_DELAY = 3.0
+WAIT = 0.01  # 게임 루프의 프레임 끝 대기
+
+
+class FakeEvent:
+    def __init__(self, press_time):
+        self.press_time = press_time  # 실제로 누른 시각 (가상 시계)
+
+
+class VirtualTime:
+    """가상 단조 시계 - sleep하면 시간이 그만큼 흐름"""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+    def sleep(self, seconds):
+        self.t += seconds
+
+
+class InputInjector:
+    """press_times 시각에 눌린 키를 시각이 지난 뒤 폴링하면 돌려주는 이벤트 소스"""
+
+    def __init__(self, vt, press_times):
+        self.vt = vt
+        self.queue = sorted(press_times)
+        self.next = 0
+
+    def __call__(self):
+        events = []
+        while self.next < len(self.queue) and self.queue[self.next] <= self.vt.t:
+            events.append(FakeEvent(self.queue[self.next]))
+            self.next += 1
+        return events
+
+
+def simulate(mode, n_presses, seed=0):
+    """
+    Args:
+        mode: 'legacy' / 'stamp' / 'poll'
+
+    Returns:
+        np.ndarray: (판정 곡 시간 - 실제 누른 곡 시간) ms
+    """
+    rng = random.Random(seed)
+    vt = VirtualTime()
+    clock = SongClock(START_DELAY, now=vt.now)
+    press_times = [START_DELAY + rng.uniform(0, n_presses * 0.25) for _ in range(n_presses)]
+    injector = InputInjector(vt, press_times)
+    poller = EventPoller(injector, now=vt.now, sleep=vt.sleep)
+
+    clock.start()
+    current_time = clock.update()
+    errors = []
+    while injector.next < len(press_times) or poller.pending:
+        # 이벤트 처리
+        events = poller.drain() if mode == 'poll' else injector()
+        poll_time = vt.now()
+        for event in events:
+            if mode == 'legacy':
+                hit_time = current_time
+            elif mode == 'stamp':
+                hit_time = clock.time_at(poll_time)
+            else:
+                hit_time = clock.time_at(event.timestamp)
+            errors.append(hit_time - clock.time_at(event.press_time))
+
+        # 업데이트 / 그리기 (부하에 따라 2~12ms)
+        current_time = clock.update()
+        vt.sleep(rng.uniform(0.002, 0.012))
+
+        # 프레임 끝 대기
+        if mode == 'poll':
+            poller.wait(WAIT)
+        else:
+            vt.sleep(WAIT)
+    return np.array(errors) * 1000
+
+
+def main(n_presses=5000):
+    print(f"\n입력 → 판정 시각 오차 (입력 {n_presses}개, ms, 양수면 판정 시각이 늦음)")
+    print("=" * 78)
+    print(f"{'방식':>12} | {'평균':>7} | {'중앙값':>7} | {'p95':>7} | {'최소':>7} | {'최대':>7} | {'표준편차':>7}")
+    print("-" * 78)
+    for label, mode in (('기존', 'legacy'), ('타임스탬프', 'stamp'), ('대기 중 폴링', 'poll')):
+        errors = simulate(mode, n_presses)
+        print(f"{label:>12} | {errors.mean():7.2f} | {np.median(errors):7.2f} | "
+              f"{np.percentile(errors, 95):7.2f} | {errors.min():7.2f} | {errors.max():7.2f} | "
+              f"{errors.std():7.2f}")
+    print("=" * 78)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,387 @@
+"""
+노트 갱신 벤치마크
+  - 기존 방식(노트마다 파이썬 객체, 매 프레임 note.update 호출)과 NoteStore 벡터 갱신 비교
+  - 같은 입력에서 위치/판정 결과가 같은지 확인
+  - 곡 전체 진행: 기존 스폰(대기 리스트 복사 + list.remove)과 스폰 커서/활성 구간 비교
+  - 패링 판정 노트 찾기: 기존 활성 노트 선형 AABB 검사와 시간 인덱스 이진 탐색 비교
+  - 메모리: 노트당 바이트, 채보 준비 시 할당 횟수 (기존 객체 / NoteStore / 풀 재사용)
+
+사용법: python bench_notes.py [최대 활성 노트 수]
+"""
+import sys
+import time
+import tracemalloc
+import numpy as np
+from note_store import NoteStore, NotePool, NoteView, JUDGMENTS
+
+
+class LegacyNote:
+    """기존 RhythmNote의 상태/갱신 로직 (비교 기준, 그리기 제외)"""
+
+    def __init__(self, beat_time, note_type='normal', duration=0):
+        self.beat_time = beat_time
+        self.note_type = note_type
+        self.duration = duration
+        self.is_hit = False
+        self.judgment = None
+        self.is_holding = False
+        self.hold_start_time = 0
+        self.hold_completed = False
+        self.x = 1080
+        self.y = 130
+        self.target_x = 120
+        self.arrow_width = 289
+        self.arrow_height = 80
+        self.scale = 0.25
+        self.draw_width = int(self.arrow_width * self.scale)
+        self.draw_height = int(self.arrow_height * self.scale)
+        self.collision_width = self.draw_width
+        self.collision_height = self.draw_height
+        self.is_parried = False
+        self.parry_speed = 1800
+        self.parry_alpha = 0.5
+
+    def update(self, dt, current_time):
+        if self.is_parried:
+            self.x += self.parry_speed * dt
+            if self.x > 1200:
+                self.is_hit = True
+        elif self.is_holding:
+            self.x = self.target_x
+            if current_time - self.hold_start_time >= self.duration:
+                self.is_hit = True
+                self.judgment = 'perfect'
+                self.hold_completed = True
+        else:
+            time_to_beat = self.beat_time - current_time
+            if time_to_beat > 0:
+                progress = max(0, (2.0 - time_to_beat) / 2.0)
+                self.x = 1080 - (1800 * progress)
+            else:
+                self.x = self.target_x
+
+
+def legacy_spawn(notes, active_notes, current_time):
+    """기존 RhythmManager.update의 새 노트 활성화 루프"""
+    for note in notes[:]:
+        if current_time >= note.beat_time - 2.0:
+            active_notes.append(note)
+            notes.remove(note)
+
+
+def legacy_update(active_notes, dt, current_time, bad_window):
+    """기존 RhythmManager.update의 활성 노트 루프 (콜백 제외)"""
+    for note in active_notes[:]:
+        note.update(dt, current_time)
+        if note.is_holding and note.hold_completed:
+            note.hold_completed = False
+        if not note.is_hit and not note.is_parried and not note.is_holding:
+            if note.x < 26 or current_time - note.beat_time > bad_window:
+                note.judgment = 'miss'
+                note.is_hit = True
+                active_notes.remove(note)
+
+
+def dense_chart(n_active, seed=0):
+    """
+    활성 노트 n_active개 상황: 화면에 나온 노트 + 이미 패링/홀딩된 노트가 섞인 채보
+
+    Returns:
+        tuple: (채보, 패링된 노트 인덱스, 홀딩 중인 노트 인덱스)
+    """
+    rng = np.random.default_rng(seed)
+    times = np.sort(rng.uniform(0, 2.0, n_active))
+    is_long = rng.random(n_active) < 0.1
+    chart = [{'time': float(t), 'type': 'long' if long else 'normal',
+              'duration': float(rng.uniform(0.5, 2.0)) if long else 0}
+             for t, long in zip(times, is_long)]
+    parried = np.flatnonzero(rng.random(n_active) < 0.3)
+    holding = np.flatnonzero(is_long & (rng.random(n_active) < 0.3))
+    holding = np.setdiff1d(holding, parried)
+    return chart, parried, holding
+
+
+def make_legacy(chart, parried, holding):
+    notes = [LegacyNote(n['time'], n['type'], n['duration']) for n in chart]
+    for i in parried:
+        notes[i].is_parried = True
+        notes[i].x = 150
+    for i in holding:
+        notes[i].is_holding = True
+    return notes
+
+
+def make_store(chart, parried, holding):
+    store = NoteStore(chart)
+    store.is_parried[parried] = True
+    store.x[parried] = 150
+    store.is_holding[holding] = True
+    return store
+
+
+def check_compatibility(frames=200):
+    """같은 프레임 진행에서 기존 방식과 위치/판정/활성 노트가 같은지 확인"""
+    print("\n기존 방식과 비교")
+    print("=" * 60)
+    all_ok = True
+    for seed in range(5):
+        chart, parried, holding = dense_chart(500, seed)
+        legacy = make_legacy(chart, parried, holding)
+        legacy_active = list(legacy)
+        store = make_store(chart, parried, holding)
+        start = 0
+
+        ok = True
+        current_time = -0.5
+        for _ in range(frames):
+            dt = 1 / 60
+            current_time += dt
+            legacy_update(legacy_active, dt, current_time, 0.15)
+            store.update(start, len(store), dt, current_time, 0.15)
+            start = store.first_alive(start, len(store))
+
+            # 기존 방식은 패링 후 화면 밖으로 나간 노트도 활성 리스트에 남김
+            alive = [legacy.index(n) for n in legacy_active if not n.is_hit or n.is_holding]
+            active = np.flatnonzero(~store.is_hit | store.is_holding)
+            ok = ok and alive == active.tolist()
+            # 처리 끝난 노트는 더 이상 갱신하지 않으므로 위치는 살아 있는 노트만 비교
+            ok = ok and all(
+                (n.is_hit or n.x == store.x[i]) and n.is_hit == store.is_hit[i] and
+                n.judgment == JUDGMENTS[store.judgment[i]]
+                for i, n in enumerate(legacy)
+            )
+        all_ok = all_ok and ok
+        print(f"seed={seed} | 활성 노트 {len(store.alive(start, len(store))):4}개 남음 | {'OK' if ok else 'FAIL'}")
+    print("=" * 60)
+    return all_ok
+
+
+def bench_scaling(max_active=10000, frames=100):
+    print(f"\n프레임당 활성 노트 갱신 시간 ({frames}프레임 평균)")
+    print("=" * 60)
+    print(f"{'활성 노트':>10} | {'기존':>12} | {'NoteStore':>12} | {'배속':>6}")
+    print("-" * 60)
+    n = 10
+    while n <= max_active:
+        chart, parried, holding = dense_chart(n)
+
+        legacy_active = make_legacy(chart, parried, holding)
+        start = time.perf_counter()
+        for f in range(frames):
+            legacy_update(legacy_active, 1 / 60, -1.0 + f * 1e-6, 0.15)
+        legacy_ms = (time.perf_counter() - start) / frames * 1000
+
+        store = make_store(chart, parried, holding)
+        start = time.perf_counter()
+        for f in range(frames):
+            store.update(0, n, 1 / 60, -1.0 + f * 1e-6, 0.15)
+        store_ms = (time.perf_counter() - start) / frames * 1000
+
+        print(f"{n:10} | {legacy_ms:10.3f}ms | {store_ms:10.3f}ms | {legacy_ms / store_ms:5.1f}x")
+        n *= 10
+    print("=" * 60)
+
+
+def legacy_find_hit(active_notes, player_x, player_y):
+    """기존 try_hit의 충돌 노트 찾기 (활성 리스트 순서로 첫 번째 AABB 충돌)"""
+    player_left = player_x - 64
+    player_right = player_x + 120
+    player_bottom = player_y - 64
+    player_top = player_y + 64
+    for note in active_notes:
+        if not note.is_hit and not note.is_parried:
+            half_w = note.collision_width // 2
+            half_h = note.collision_height // 2
+            note_box = (note.x - half_w, note.y - half_h, note.x + half_w, note.y + half_h)
+            if (player_left < note_box[2] and player_right > note_box[0] and
+                    player_bottom < note_box[3] and player_top > note_box[1]):
+                return note
+    return None
+
+
+def screen_state(n_active, seed=0, min_time=0.0):
+    """
+    화면에 노트가 n_active개 나와 있는 순간 (30%는 패링되어 날아가는 중)
+
+    min_time보다 이른 노트는 없음 - min_time을 판정 범위보다 크게 잡으면 칠 수 있는 노트가 없는 순간
+
+    Returns:
+        tuple: (기존 방식 활성 노트 리스트, NoteStore, 현재 시간)
+    """
+    rng = np.random.default_rng(seed)
+    times = np.sort(rng.uniform(min_time, 2.0, n_active))
+    chart = [{'time': float(t), 'type': 'normal', 'duration': 0} for t in times]
+    parried = np.flatnonzero(rng.random(n_active) < 0.3)
+    legacy = make_legacy(chart, parried, [])
+    store = make_store(chart, parried, [])
+    current_time = 0.0
+    active = list(legacy)
+    legacy_update(active, 1 / 60, current_time, 0.15)
+    store.update(0, len(store), 1 / 60, current_time, 0.15)
+    return legacy, active, store, current_time
+
+
+def check_hit_lookup():
+    """여러 플레이어 위치에서 기존 선형 검사와 같은 노트를 고르는지 확인"""
+    print("\n패링 판정 노트 찾기 비교")
+    print("=" * 60)
+    all_ok = True
+    for seed in range(5):
+        legacy, active, store, current_time = screen_state(500, seed)
+        ok = True
+        for player_x in range(-200, 1300, 7):
+            expected = legacy_find_hit(active, player_x, 130)
+            index = store.find_hittable(0, len(store), current_time, player_x - 64, player_x + 120)
+            ok = ok and (legacy.index(expected) if expected else None) == index
+        all_ok = all_ok and ok
+        print(f"seed={seed} | {'OK' if ok else 'FAIL'}")
+    print("=" * 60)
+    return all_ok
+
+
+def bench_hit_lookup(max_active=10000, repeat=1000):
+    print(f"\n패링 판정 노트 찾기 시간 (호출 {repeat}회 평균, 플레이어 x=90)")
+    print("=" * 70)
+    print(f"{'활성 노트':>10} | {'판정 범위':>10} | {'기존 선형':>12} | {'이진 탐색':>12}")
+    print("-" * 70)
+    n = 10
+    while n <= max_active:
+        # 판정 범위 안에 노트가 있는 순간 / 없는 순간 (판정 시각 1.2초 전부터만 노트가 있음)
+        for label, min_time in (('노트 있음', 0.0), ('노트 없음', 1.2)):
+            legacy, active, store, current_time = screen_state(n, min_time=min_time)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                legacy_find_hit(active, 90, 130)
+            legacy_us = (time.perf_counter() - start) / repeat * 1e6
+
+            # RhythmManager처럼 앞쪽의 처리 끝난(Miss) 노트는 활성 구간에서 제외
+            active_start = store.first_alive(0, n)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                store.find_hittable(active_start, n, current_time, 90 - 64, 90 + 120)
+            search_us = (time.perf_counter() - start) / repeat * 1e6
+
+            print(f"{n:10} | {label:>8} | {legacy_us:10.1f}us | {search_us:10.1f}us")
+        n *= 10
+    print("=" * 70)
+
+
+def song_chart(n_notes, seed=0):
+    """초당 약 8개 노트, 일부 롱 노트가 섞인 곡"""
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.choice([0.05, 0.1, 0.15, 0.2, 0.25], n_notes)) + 3.0
+    return [{'time': float(t), 'type': 'normal', 'duration': 0} for t in times]
+
+
+def bench_song(sizes=(1000, 5000, 20000), fps=60):
+    """
+    곡 처음부터 끝까지 매 프레임 스폰 + 갱신 (입력 없음, 모든 노트가 Miss)
+
+    기존 방식은 대기 리스트 복사/스캔/list.remove 때문에 곡 전체가 O(n^2)이고,
+    스폰 커서 방식은 프레임당 비용이 나타나거나 처리되는 노트 수에만 비례해야 한다.
+    """
+    print(f"\n곡 전체 진행 ({fps}fps, 스폰 + 갱신, 프레임당 평균)")
+    print("=" * 60)
+    print(f"{'노트 수':>8} | {'프레임 수':>8} | {'기존':>12} | {'스폰 커서':>12}")
+    print("-" * 60)
+    dt = 1 / fps
+    for n in sizes:
+        chart = song_chart(n)
+        end_time = chart[-1]['time'] + 1.0
+        n_frames = int((end_time + 1.0) / dt)
+
+        legacy_ms = '-'
+        if n <= 5000:
+            pending = [LegacyNote(note['time']) for note in chart]
+            active = []
+            start = time.perf_counter()
+            for f in range(n_frames):
+                current_time = f * dt - 1.0
+                legacy_update(active, dt, current_time, 0.15)
+                legacy_spawn(pending, active, current_time)
+            legacy_ms = f"{(time.perf_counter() - start) / n_frames * 1000:8.3f}ms"
+
+        store = NoteStore(chart)
+        active_start = cursor = 0
+        start = time.perf_counter()
+        for f in range(n_frames):
+            current_time = f * dt - 1.0
+            if active_start < cursor:
+                store.update(active_start, cursor, dt, current_time, 0.15)
+                active_start = store.first_alive(active_start, cursor)
+            cursor = store.spawn_until(cursor, current_time)
+        cursor_ms = (time.perf_counter() - start) / n_frames * 1000
+
+        print(f"{n:8} | {n_frames:8} | {legacy_ms:>12} | {cursor_ms:10.3f}ms")
+    print("=" * 60)
+
+
+def measure_alloc(build):
+    """build() 실행 중 할당 (남은 바이트, 최대 바이트, 남은 블록 수)와 결과 반환"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    return result, current - base, peak - base, blocks
+
+
+def bench_memory(sizes=(1000, 5000, 20000), repeat=20):
+    """
+    채보 하나를 플레이할 수 있게 준비하는 비용
+
+    기존: 노트마다 LegacyNote 객체 (인스턴스 __dict__ + 속성 값)
+    NoteStore: 열마다 배열 하나
+    풀 재사용: 반납된 NoteStore를 다시 채움 (재시작/다음 곡) - 새 배열 할당 없음
+    """
+    view = NoteView(NoteStore([1.0]), 0)
+    legacy = LegacyNote(1.0)
+    print(f"\n노트 객체 크기: 기존 {sys.getsizeof(legacy) + sys.getsizeof(legacy.__dict__)}B "
+          f"(__dict__ 포함, 속성 값 제외) / 슬롯 뷰 {sys.getsizeof(view)}B (__dict__ 없음)")
+
+    print(f"\n채보 준비 메모리/할당 (남은 바이트는 노트당, 블록은 할당 후 남은 객체 수)")
+    print("=" * 84)
+    print(f"{'노트 수':>8} | {'방식':>10} | {'노트당':>9} | {'최대 사용':>10} | {'남은 블록':>10} | {'준비 시간':>10}")
+    print("-" * 84)
+    for n in sizes:
+        chart = song_chart(n)
+        pool = NotePool()
+        pool.release(pool.acquire(chart))
+
+        cases = (
+            ('기존 객체', lambda: [LegacyNote(note['time'], note['type'], note['duration']) for note in chart], None),
+            ('NoteStore', lambda: NoteStore(chart), None),
+            ('풀 재사용', lambda: pool.acquire(chart), pool.release),
+        )
+        for label, build, release in cases:
+            result, kept, peak, blocks = measure_alloc(build)
+            if release:
+                release(result)
+            del result
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = build()
+                if release:
+                    release(result)
+            setup_ms = (time.perf_counter() - start) / repeat * 1000
+            del result
+
+            print(f"{n:8} | {label:>8} | {kept / n:8.1f}B | {peak / 1024:8.1f}KB | {blocks:10} | {setup_ms:8.3f}ms")
+        print(f"{'':8} | 풀 통계: 새로 할당 {pool.allocated}회, 재사용 {pool.reused}회")
+    print("=" * 84)
+
+
+if __name__ == '__main__':
+    max_active = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    check_compatibility()
+    check_hit_lookup()
+    bench_scaling(max_active)
+    bench_song()
+    bench_hit_lookup(max_active)
+    bench_memory()
@@ -0,0 +1,82 @@
+"""
+축소 스프라이트 시트 벤치마크
+  - 게임에서 쓰는 시트(플레이어/이펙트/하트)를 원본과 select_variant가 고른 축소 시트로 비교
+  - 로드 시간: PNG 디코드 (파일 읽기 + inflate + 필터 복원, load_image가 하는 일과 같음)
+  - 텍스처 메모리: 폭 x 높이 x 4바이트 (RGBA8)
+
+축소 시트는 임시 폴더에 새로 만들어 쓰므로 sprite_cache 빌드 여부와 무관하다.
+Pillow가 필요하다.
+
+사용법: python bench_sprites.py [반복 횟수]
+"""
+import os
+import sys
+import time
+import tempfile
+from PIL import Image
+import sprite_cache
+from player import SPRITE_SHEETS, SPRITE_SIZE
+from ui import HEART_SHEET
+
+HEART_SIZE = 256
+HEART_SCALE = 0.15
+
+
+def decode(path):
+    with Image.open(path) as image:
+        image.load()
+        return image.size
+
+
+def measure(path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        size = decode(path)
+    return (time.perf_counter() - start) / repeat * 1000, size
+
+
+def sheet_targets():
+    """(원본 경로, 프레임 크기, 그리기 배율) - 같은 파일은 한 번만 로드됨 (player_sky 등)"""
+    targets = {}
+    for path, _, draw_scale in SPRITE_SHEETS.values():
+        targets.setdefault(path, (SPRITE_SIZE, draw_scale))
+    targets[HEART_SHEET] = (HEART_SIZE, HEART_SCALE)
+    return targets
+
+
+def bench(repeat=5):
+    targets = sheet_targets()
+    print(f"\n축소 스프라이트 시트 벤치마크 ({len(targets)}개 시트, 디코드 {repeat}회 평균)")
+    print("=" * 100)
+    print(f"{'시트':32} | {'배율':>5} | {'원본 크기':>11} | {'원본 로드':>9} | {'원본 텍스처':>10} | "
+          f"{'축소':>4} | {'축소 로드':>9} | {'축소 텍스처':>10}")
+    print("-" * 100)
+
+    totals = [0.0, 0, 0.0, 0, 0, 0]  # 원본 시간/바이트/파일, 축소 시간/바이트/파일
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for path, (frame_size, draw_scale) in targets.items():
+            sprite_cache.build_variants(path, cache_dir)
+            variant, divisor = sprite_cache.select_variant(path, frame_size, frame_size, draw_scale, cache_dir)
+
+            src_ms, (w, h) = measure(path, repeat)
+            dst_ms, (vw, vh) = measure(variant, repeat)
+            src_bytes, dst_bytes = w * h * 4, vw * vh * 4
+            totals[0] += src_ms
+            totals[1] += src_bytes
+            totals[2] += os.path.getsize(path)
+            totals[3] += dst_ms
+            totals[4] += dst_bytes
+            totals[5] += os.path.getsize(variant)
+            print(f"{os.path.basename(path):32} | {draw_scale:5.2f} | {w:>5}x{h:<5} | {src_ms:7.1f}ms | "
+                  f"{src_bytes / 2 ** 20:8.1f}MB | 1/{divisor:<2} | {dst_ms:7.1f}ms | {dst_bytes / 2 ** 20:8.1f}MB")
+
+    print("-" * 100)
+    print(f"{'합계':32} | {'':5} | {'':11} | {totals[0]:7.1f}ms | {totals[1] / 2 ** 20:8.1f}MB | "
+          f"{'':4} | {totals[3]:7.1f}ms | {totals[4] / 2 ** 20:8.1f}MB")
+    print(f"PNG 파일: {totals[2] / 2 ** 20:.2f}MB -> {totals[5] / 2 ** 20:.2f}MB | "
+          f"로드 {totals[0] / max(totals[3], 1e-9):.1f}배 빠름 | 텍스처 {totals[1] / max(totals[4], 1):.1f}배 작음")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
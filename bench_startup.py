@@ -0,0 +1,73 @@
+"""
+PlayMode 첫 프레임까지 걸리는 시간 - 시트를 전부 먼저 로드 vs 지연 로드 + 백그라운드 디코드
+
+    - 전부 로드: Player 생성 직후 모든 시트를 로드 (예전 Player.__init__과 같음)
+    - 지연 로드: PlayMode 그대로 (첫 프레임에 쓰는 Run 시트만 기다리고 나머지는 백그라운드)
+
+매 회 텍스처 캐시(ASSETS)를 비우고 재므로 처음 진입하는 경우의 시간이다.
+창을 열어 실제 load_image / 업로드 경로로 잰다.
+
+사용법: python bench_startup.py [반복 횟수]
+"""
+import io
+import sys
+import time
+import contextlib
+import numpy as np
+from pico2d import open_canvas, close_canvas
+import game_framework
+from play_mode import PlayMode
+from asset_manager import ASSETS
+from sprite_loader import SPRITES
+from headless_sim import synthetic_chart
+
+
+def cold_start():
+    """백그라운드 디코드가 끝날 때까지 기다린 뒤 캐시를 모두 비움"""
+    while SPRITES.pending:
+        time.sleep(0.01)
+    SPRITES.clear()
+    ASSETS.clear()
+
+
+def first_frame(eager):
+    chart = synthetic_chart(200)
+    prepared_chart = {'chart': chart, 'bpm': 120, 'duration': chart[-1]['time']}
+    mode = PlayMode(music_path='', prepared_chart=prepared_chart, record=False)
+    game_framework.game_state.dt = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        mode.enter()
+        if eager:
+            for anim_data in mode.player.sprite_sheets.values():
+                mode.player.sheet_image(anim_data)
+        mode.update()
+        mode.draw()
+        elapsed = time.perf_counter() - start
+        loaded = len(mode.player.asset_paths)
+        mode.exit()
+    cold_start()
+    return elapsed * 1000, loaded
+
+
+def main(repeat=5):
+    open_canvas(1080, 608)
+    try:
+        cold_start()
+        print(f"\nPlayMode 첫 프레임까지 시간 (캐시 비운 상태, {repeat}회 중앙값)")
+        print("=" * 64)
+        results = {}
+        for label, eager in (('전부 로드 (기존)', True), ('지연 로드 + 백그라운드', False)):
+            runs = [first_frame(eager) for _ in range(repeat)]
+            results[label] = float(np.median([ms for ms, _ in runs]))
+            print(f"{label:24} | {results[label]:8.1f}ms | 첫 프레임 전 로드한 시트 {runs[0][1]:2}개")
+        before, after = results.values()
+        print("-" * 64)
+        print(f"{before / after:.1f}배 빠름")
+        print("=" * 64)
+    finally:
+        close_canvas()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
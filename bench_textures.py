@@ -0,0 +1,69 @@
+"""
+컴파일된 텍스처 벤치마크 - 시트마다 PNG load_image vs .tex 매핑 + 업로드
+
+    - PNG: load_image (파일 읽기 + zlib 해제 + PNG 필터 복원 + 업로드)
+    - .tex: texture_cache.map_texture (매핑, 헤더 확인) + 업로드 (SDL_CreateTextureFromSurface)
+
+두 번째 반복부터는 파일이 OS 캐시에 있으므로 디스크가 아니라 디코드 비용을 비교하게 된다.
+.tex가 없는 시트는 먼저 컴파일한다 (Pillow 필요). 창을 열어 실제 업로드 경로로 잰다.
+
+사용법: python bench_textures.py [반복 횟수]
+"""
+import os
+import sys
+import time
+import numpy as np
+from pico2d import open_canvas, close_canvas, load_image
+import texture_cache
+from sprite_loader import MappedSurface, decode_surface, upload_surface
+
+
+def measure(load, path, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        image = load(path)
+        times.append(time.perf_counter() - start)
+        del image
+    return float(np.median(times)) * 1000
+
+
+def load_compiled(path):
+    surface = decode_surface(path)
+    if not isinstance(surface, MappedSurface):
+        raise RuntimeError(f".tex를 쓰지 못함: {path}")
+    return upload_surface(surface)
+
+
+def main(repeat=5):
+    sources = texture_cache.game_textures()
+    for path in sources:
+        texture_cache.compile_texture(path)
+
+    open_canvas(1080, 608)
+    try:
+        print(f"\n시트 로드 시간 (PNG load_image vs .tex 매핑 + 업로드, {repeat}회 중앙값)")
+        print("=" * 108)
+        print(f"{'시트':56} | {'PNG':>7} | {'.tex':>7} | {'PNG 로드':>9} | {'.tex 로드':>9} | {'배':>5}")
+        print("-" * 108)
+        total_png = total_tex = 0.0
+        for path in sources:
+            mapped = texture_cache.map_texture(path)
+            size_tex = os.path.getsize(mapped.path)
+            mapped.close()
+            png_ms = measure(load_image, path, repeat)
+            tex_ms = measure(load_compiled, path, repeat)
+            total_png += png_ms
+            total_tex += tex_ms
+            print(f"{os.path.basename(path):56} | {os.path.getsize(path) / 1024:5.0f}KB | {size_tex / 1024:5.0f}KB | "
+                  f"{png_ms:7.1f}ms | {tex_ms:7.1f}ms | {png_ms / tex_ms:4.1f}x")
+        print("-" * 108)
+        print(f"{'합계':56} | {'':7} | {'':7} | {total_png:7.1f}ms | {total_tex:7.1f}ms | "
+              f"{total_png / total_tex:4.1f}x")
+        print("=" * 108)
+    finally:
+        close_canvas()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,104 +1,45 @@
 from pico2d import *
 import time
+import numpy as np
 from music_analyzer import MusicAnalyzer
+from song_clock import SongClock
+from note_store import NoteStore, NoteView, NOTE_POOL, NOTE_LONG, NOTE_NORMAL, NOTE_WIDTH, NOTE_HEIGHT, NOTE_Y
 import pygame
+from asset_manager import ASSETS
 
-class RhythmNote:
+MUSIC_START_DELAY = 3.0  # 음악 시작 전 대기 시간 (초), 채보 시간에도 더해짐
+
+class RhythmNote(NoteView):
+    """NoteStore의 노트 하나 (상태는 NoteStore 배열에 있고 여기서는 그리기만 담당)"""
+    __slots__ = ()
+    
     note_image = None
     long_note_effect = None  # 롱 노트 이펙트 이미지
     
+    draw_width = NOTE_WIDTH
+    draw_height = NOTE_HEIGHT
+    parry_alpha = 0.5  # 패링된 화살표 투명도
+    
     @classmethod
     def load_images(cls):
         if cls.note_image is None:
             try:
-                cls.note_image = load_image('originSprite/Bow/NormalArrow.png')
+                cls.note_image = ASSETS.acquire('originSprite/Bow/NormalArrow.png')
             except Exception as e:
                 print(f"노트 이미지 로드 실패: {e}")
                 cls.note_image = None
         
         if cls.long_note_effect is None:
             try:
-                cls.long_note_effect = load_image('originSprite/Bow/Lv1光束.png')
+                cls.long_note_effect = ASSETS.acquire('originSprite/Bow/Lv1光束.png')
             except Exception as e:
                 print(f"롱 노트 이펙트 로드 실패: {e}")
                 cls.long_note_effect = None
     
-    def __init__(self, beat_time, note_type='normal', duration=0):
-        self.beat_time = beat_time  # 언제 쳐야 하는지
-        self.note_type = note_type  # 노트 타입 
-        self.duration = duration  # 롱 노트 지속 시간 
-        self.is_hit = False
-        self.judgment = None  # 'perfect', 'good', 'bad', 'miss'
-        
-        # 롱 노트 상태
-        self.is_holding = False  # 홀딩 중인지
-        self.hold_start_time = 0  # 홀딩 시작 시간
-        self.hold_completed = False  # 홀딩 완료 여부
-        
-        # 시각적 표현
-        self.x = 1080  
-        self.y = 130 
-        self.target_x = 120  # 플레이어 위치
-        
-        self.arrow_width = 289
-        self.arrow_height = 80
-        self.scale = 0.25 
-        self.draw_width = int(self.arrow_width * self.scale)  
-        self.draw_height = int(self.arrow_height * self.scale)  
-        
-        self.collision_width = self.draw_width
-        self.collision_height = self.draw_height
-        
-        # 패링 상태
-        self.is_parried = False  # 패링되었는지
-        self.parry_speed = 1800  
-        self.parry_alpha = 0.5  
-
+    def draw(self, current_time):
+        # 이미지는 처음 그릴 때 로드 (판정/시뮬레이션에서 만드는 뷰는 에셋을 건드리지 않음)
         if RhythmNote.note_image is None:
             RhythmNote.load_images()
-    
-    def get_collision_box(self):
-        half_w = self.collision_width // 2
-        half_h = self.collision_height // 2
-        return (
-            self.x - half_w,
-            self.y - half_h,
-            self.x + half_w,
-            self.y + half_h
-        )
-        
-    def update(self, dt, current_time):
-        if self.is_parried:
-            # 패링된 화살표는 오른쪽으로 날아감
-            self.x += self.parry_speed * dt
-            # 화면 밖으로 나가면 제거 대상
-            if self.x > 1200:
-                self.is_hit = True
-        elif self.is_holding:
-            # 롱 노트 홀딩 중 - 판정선에서 흡수됨
-            # 노트는 판정선(target_x)에 고정
-            self.x = self.target_x
-            
-            # 홀딩 시간 체크
-            hold_elapsed = current_time - self.hold_start_time
-            if hold_elapsed >= self.duration:
-                # 홀딩 완료 - 노트 제거 및 완료 플래그 설정
-                self.is_hit = True
-                self.judgment = 'perfect'
-                self.hold_completed = True  # 홀딩 완료 플래그
-        else:
-            # 노트가 목표 지점으로 이동
-            time_to_beat = self.beat_time - current_time
-            if time_to_beat > 0:
-                progress = max(0, (2.0 - time_to_beat) / 2.0)
-                self.x = 1080 - (1800 * progress) 
-            else:
-                self.x = self.target_x
-    
-    def parry(self):
-        self.is_parried = True
-    
-    def draw(self, current_time):
         if self.is_hit:
             return
         
@@ -164,26 +105,34 @@ class RhythmNote:
 
 class RhythmManager:
     """리듬 게임 관리자 - 음악 분석 기반"""
-    def __init__(self, music_path='music/M2U.mp3', difficulty='hard'):
+    def __init__(self, music_path='music/M2U.mp3', difficulty='hard', prepared_chart=None,
+                 now=time.perf_counter, headless=False):
         """
         Args:
             music_path: 음악 파일 경로
             difficulty: 난이도 ('easy', 'normal', 'hard')
+            prepared_chart: 미리 준비된 채보 {'chart', 'bpm', 'duration'} (LoadingMode에서 전달)
+            now: 곡 시계가 쓰는 단조 시계 함수 (시뮬레이션에서 주입)
+            headless: True면 음악을 로드/재생하지 않음 (곡 시간은 now만 따라감)
         """
         self.music_path = music_path
         self.difficulty = difficulty
+        self.headless = headless
         self.start_time = None  
         self.current_time = 0
-        self.music_start_delay = 3.0  
+        self.music_start_delay = MUSIC_START_DELAY
+        # 곡 시간 (재생 시작 후에는 오디오 재생 위치를 따라감)
+        self.clock = SongClock(self.music_start_delay, now=now)
         
         # 음악 분석
         self.analyzer = MusicAnalyzer(music_path)
         self.bpm = 120  # 기본값
         self.duration = 0
         
-        # 노트 리스트
-        self.notes = []
-        self.active_notes = []
+        # 노트 (상태는 NoteStore 배열, 활성 노트는 [active_start, spawn_cursor) 구간)
+        self.notes = NoteStore([])
+        self.active_start = 0  # 이전 노트는 모두 처리 끝남
+        self.spawn_cursor = 0  # 다음에 나타날 노트
         self.chart_data = []  # 채보 데이터 (초 단위)
         
         # 판정 관련
@@ -206,22 +155,28 @@ class RhythmManager:
         self.music_playing = False
         
         # 음악 분석 및 채보 생성
-        self.load_music_and_generate_chart()
+        self.load_music_and_generate_chart(prepared_chart)
     
-    def load_music_and_generate_chart(self):
+    def load_music_and_generate_chart(self, prepared_chart=None):
         """음악 로드 및 채보 생성"""
-        # 음악 분석
-        if self.analyzer.load_and_analyze():
-            self.bpm = self.analyzer.get_bpm()
-            self.duration = self.analyzer.get_duration()
-            
-            # 채보 생성
-            self.chart_data = self.analyzer.generate_chart(
+        if prepared_chart is not None:
+            # 워커 프로세스에서 이미 준비된 채보 사용
+            chart = prepared_chart['chart']
+            self.analyzer.tempo = prepared_chart['bpm']
+            self.analyzer.duration = prepared_chart['duration']
+        else:
+            # 채보 캐시 확인 후 없으면 음악 분석 및 채보 생성
+            chart = self.analyzer.get_chart(
                 difficulty=self.difficulty,
                 start_delay=self.music_start_delay
             )
+        if chart is not None:
+            self.bpm = self.analyzer.get_bpm()
+            self.duration = self.analyzer.get_duration()
+            self.chart_data = chart
             
-            
+            if self.headless:
+                return
             try:
                 if not pygame.mixer.get_init():
                     pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
@@ -259,84 +214,96 @@ class RhythmManager:
     def update(self, dt):
         # 첫 업데이트에서 타이머 시작 
         if self.start_time is None:
-            self.start_time = time.time()
+            self.clock.start()
+            self.start_time = self.clock.start_wall
             # 채보 데이터로 노트 생성
             self.create_notes_from_chart()
         
-        # 현재 시간 업데이트 
-        elapsed_time = time.time() - self.start_time
-        
-        # 음악 시작 전이면 current_time을 음수로 설정
-        self.current_time = elapsed_time - self.music_start_delay
-        
         # music_start_delay 후에 음악 재생
-        if not self.music_playing and elapsed_time >= self.music_start_delay:
+        if not self.music_playing and self.clock.elapsed() >= self.music_start_delay:
             self.start_music()
         
-        # 활성 노트 업데이트
-        for note in self.active_notes[:]:
-            note.update(dt, self.current_time)
+        # 현재 시간 업데이트 (음악 시작 전이면 음수, 재생 중에는 오디오 위치로 보정)
+        self.current_time = self.clock.update(self.get_audio_pos())
+        
+        # 활성 노트 업데이트 (위치 / 패링 비행 / Miss 판정을 한 번에)
+        if self.active_start < self.spawn_cursor:
+            completed, missed = self.notes.update(self.active_start, self.spawn_cursor, dt,
+                                                  self.current_time, self.bad_window)
             
             # 홀딩 완료 체크
-            if note.is_holding and hasattr(note, 'hold_completed') and note.hold_completed:
+            for i in completed.tolist():
                 # 홀딩 완료 - RunState로 전환
                 if self.player_ref:
-                    from player_state import RunState
                     self.player_ref.state_machine.add_event(('HOLD_COMPLETE', 0))
                     print("롱 노트 홀딩 완료! RunState로 전환")
-                note.hold_completed = False  # 플래그 리셋
+                self.notes.hold_completed[i] = False  # 플래그 리셋
             
-            # 놓친 노트 처리 (패링되지 않은 노트만)
-            if not note.is_hit and not note.is_parried and not note.is_holding:
-
-                if note.x < 26:  # 플레이어 패리 범위의 왼쪽 경계
-                    note.judgment = 'miss'
-                    note.is_hit = True  # 즉시 사라지도록 표시
-                    self.combo = 0
-                    # Miss 콜백 호출
-                    if self.on_miss_callback:
-                        self.on_miss_callback()
-                        print("Miss! 데미지")
-                    self.active_notes.remove(note)
-                # 시간 기반 Miss 판정 
-                else:
-                    time_passed = self.current_time - note.beat_time
-                    if time_passed > self.bad_window:
-                        note.judgment = 'miss'
-                        note.is_hit = True
-                        self.combo = 0
-                        if self.on_miss_callback:
-                            self.on_miss_callback()
-                            print("Miss! 데미지")
-                        self.active_notes.remove(note)
+            # 놓친 노트 처리
+            for _ in missed.tolist():
+                self.combo = 0
+                # Miss 콜백 호출
+                if self.on_miss_callback:
+                    self.on_miss_callback()
+                    print("Miss! 데미지")
+            
+            # 처리 끝난 노트는 활성 구간에서 제외
+            self.active_start = self.notes.first_alive(self.active_start, self.spawn_cursor)
         
         # 새로운 노트 활성화
-        for note in self.notes[:]:
-            if self.current_time >= note.beat_time - 2.0:
-                self.active_notes.append(note)
-                self.notes.remove(note)
+        self.spawn_cursor = self.notes.spawn_until(self.spawn_cursor, self.current_time)
+    
+    def get_audio_pos(self):
+        """재생 중인 음악 위치 (ms), 재생 중이 아니면 None"""
+        if not self.music_playing:
+            return None
+        try:
+            return pygame.mixer.music.get_pos()
+        except Exception:
+            return None
+    
+    def time_at(self, timestamp):
+        """
+        입력 이벤트 시각을 곡 시간으로 변환
+
+        Args:
+            timestamp: 이벤트를 가져온 시각 (time.perf_counter 기준), 없으면 None
+
+        Returns:
+            float: 곡 시간 (timestamp가 없거나 시계 시작 전이면 current_time)
+        """
+        if timestamp is None or not self.clock.started:
+            return self.current_time
+        return self.clock.time_at(timestamp)
+    
+    @property
+    def audio_offset(self):
+        """추정한 오디오 지연 (초) - 판정 시간과 실제 소리의 어긋남 확인용"""
+        return self.clock.offset
+    
+    def get_active_notes(self):
+        """화면에 나와 있고 처리가 끝나지 않은 노트 인덱스 (시간순)"""
+        return self.notes.alive(self.active_start, self.spawn_cursor)
     
     def create_notes_from_chart(self):
         """채보 데이터로부터 노트 생성"""
-        self.notes = []
-        for note_data in self.chart_data:
-            if isinstance(note_data, dict):
-                # 새로운 형식: {'time': float, 'type': str, 'duration': float}
-                self.notes.append(RhythmNote(
-                    beat_time=note_data['time'],
-                    note_type=note_data.get('type', 'normal'),
-                    duration=note_data.get('duration', 0)
-                ))
-            else:
-                # 이전 형식: float (시간만)
-                self.notes.append(RhythmNote(beat_time=note_data))
-        
-        normal_count = sum(1 for n in self.notes if n.note_type == 'normal')
-        long_count = sum(1 for n in self.notes if n.note_type == 'long')
+        # 이전 플레이에서 반납된 배열이 있으면 재사용
+        NOTE_POOL.release(self.notes)
+        self.notes = NOTE_POOL.acquire(self.chart_data)
+        self.active_start = 0
+        self.spawn_cursor = 0
+        
+        normal_count = self.notes.count(NOTE_NORMAL)
+        long_count = self.notes.count(NOTE_LONG)
         print(f"✓ 노트 생성 완료: 일반 {normal_count}개, 롱 {long_count}개")
     
     def try_hit(self, hit_time=None, player=None):
-        """플레이어의 입력 처리 - 충돌 기반 패링"""
+        """
+        플레이어의 입력 처리 - 충돌 기반 패링
+        
+        충돌은 마지막 update()의 노트 위치로, 타이밍 판정과 홀딩 시작 시각은 hit_time으로 계산
+        (hit_time: 입력 시각의 곡 시간, 없으면 current_time)
+        """
         if hit_time is None:
             hit_time = self.current_time
         
@@ -350,16 +317,14 @@ class RhythmManager:
             player_bottom = player.y - 64
             player_top = player.y + 64
             
-            for note in self.active_notes:
-                if not note.is_hit and not note.is_parried:
-                    # 노트 충돌박스
-                    note_box = note.get_collision_box()
-                    
-                    # AABB 충돌 체크
-                    if (player_left < note_box[2] and player_right > note_box[0] and
-                        player_bottom < note_box[3] and player_top > note_box[1]):
-                        parried_note = note
-                        break
+            # 노트 충돌박스와 AABB 충돌 체크 (모든 노트의 y가 같으므로 y는 한 번만 확인)
+            # 가로로 겹치는 노트는 시간 인덱스(beat_time)에서 이진 탐색
+            half_h = NOTE_HEIGHT // 2
+            if player_bottom < NOTE_Y + half_h and player_top > NOTE_Y - half_h:
+                index = self.notes.find_hittable(self.active_start, self.spawn_cursor, self.current_time,
+                                                 player_left, player_right)
+                if index is not None:
+                    parried_note = RhythmNote(self.notes, index)
         
         if parried_note is None:
             return 'miss', False, None
@@ -406,29 +371,32 @@ class RhythmManager:
         # 노트 판정 저장 (패링된 화살은 제거하지 않고 반대로 날아감)
         parried_note.judgment = judgment
         # is_hit은 설정하지 않음 - 패링된 화살은 계속 날아가야 함
-        # active_notes에서도 제거하지 않음 - update()에서 화면 밖으로 나갈 때 제거됨
+        # 활성 구간에서도 제거하지 않음 - update()에서 화면 밖으로 나갈 때 제거됨
         
         return judgment, success, parried_note
     
     def release_hold(self):
         """홀딩 중인 롱 노트 릴리즈 처리"""
-        for note in self.active_notes:
-            if note.is_holding:
-                # 홀딩 중이던 노트를 실패 처리
-                note.is_holding = False
-                note.is_hit = True
-                note.judgment = 'miss'
-                self.combo = 0
-                print("롱 노트 홀딩 실패!")
-                # Miss 콜백 호출
-                if self.on_miss_callback:
-                    self.on_miss_callback()
-                break
+        # 홀딩이 완료된 노트도 릴리즈 전까지는 홀딩 중으로 남아 있음
+        holding = np.flatnonzero(self.notes.is_holding[self.active_start:self.spawn_cursor]) + self.active_start
+        if len(holding):
+            # 홀딩 중이던 노트를 실패 처리
+            note = RhythmNote(self.notes, int(holding[0]))
+            note.is_holding = False
+            note.is_hit = True
+            note.judgment = 'miss'
+            self.combo = 0
+            print("롱 노트 홀딩 실패!")
+            # Miss 콜백 호출
+            if self.on_miss_callback:
+                self.on_miss_callback()
     
     def draw(self):
         """리듬 시스템 그리기"""
-        # 활성 노트 그리기
-        for note in self.active_notes:
+        # 활성 노트 그리기 (뷰 하나를 인덱스만 바꿔가며 사용)
+        note = RhythmNote(self.notes, 0)
+        for i in self.get_active_notes().tolist():
+            note.index = i
             note.draw(self.current_time)
         
         # UI 정보
@@ -447,18 +415,30 @@ class RhythmManager:
     def is_finished(self):
         """패턴이 모두 끝났는지 확인"""
         # 모든 노트가 처리되었고, 음악도 끝났는지 체크
-        all_notes_done = len(self.notes) == 0 and len(self.active_notes) == 0
+        all_notes_done = self.active_start == len(self.notes)
         
         # 음악이 재생 중인지 확인
         music_finished = False
         if self.music_loaded and self.music_playing:
             music_finished = not pygame.mixer.music.get_busy()
         
-        return all_notes_done or (self.music_playing and music_finished)
+        # 마지막 노트를 처리해도 음악(아웃트로)이 끝날 때까지 기다림
+        # 음악이 없으면 (headless, 로드 실패) 노트가 모두 처리되면 끝
+        music_done = music_finished or not self.music_loaded
+        return (self.music_playing and music_finished) or (all_notes_done and music_done)
     
     def stop_music(self):
         """음악 정지"""
         if self.music_loaded and self.music_playing:
             pygame.mixer.music.stop()
             self.music_playing = False
-            print("🔇 음악 정지")
+            print(f"🔇 음악 정지 (오디오 지연 {self.clock.offset * 1000:.1f}ms, "
+                  f"보정 표본 {self.clock.samples}개)")
+    
+    def release(self):
+        """플레이 종료 - 음악을 멈추고 노트 배열을 풀에 반납"""
+        self.stop_music()
+        NOTE_POOL.release(self.notes)
+        self.notes = NoteStore([])
+        self.active_start = 0
+        self.spawn_cursor = 0
@@ -0,0 +1,236 @@
+"""
+채보 통계 / 난이도 평가 - 캐시에 있는 모든 곡 x 모든 난이도
+
+분석 캐시(.bin, 기존 .json)의 비트/온셋으로 chart_arrays를 돌려 채보를 배열로 만든 뒤
+NumPy로 통계를 계산하고, 결과를 캐시 폴더의 chart_stats.json에 저장한다.
+
+    - 초당 노트 수: 곡 전체 평균, PEAK_WINDOW초 구간 최대
+    - 노트 간격 히스토그램 (GAP_BINS), 최소 간격
+    - 롱 노트 비율
+    - 이론상 최고 점수: 일반 노트를 모두 perfect로 쳤을 때 try_hit 점수 + 콤보 보너스
+      (롱 노트는 홀딩만 시작하고 점수/콤보는 변하지 않음)
+    - 난이도 수치: 밀도와 짧은 간격 비율의 가중합 (RATING_WEIGHTS)
+
+사용법: python chart_stats.py [--cache-dir charts_cache] [--start-delay 3.0]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import analysis_cache
+from music_analyzer import DIFFICULTIES, ANALYSIS_PROFILES, DEFAULT_PROFILE, chart_arrays, nearest_beat_distance
+
+STATS_FILE = analysis_cache.CHART_STATS_FILE
+PEAK_WINDOW = 2.0  # 최대 밀도를 재는 구간 길이 (초)
+GAP_BINS = (0.0, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0, 2.0, float('inf'))
+DENSE_GAP = 0.2  # 이보다 짧은 간격을 '빠른 연타'로 봄 (초)
+
+# try_hit 점수 규칙
+PERFECT_POINTS = 300
+COMBO_BONUS_STEP = 10
+COMBO_BONUS_MAX = 500
+
+# 난이도 수치 = 평균 밀도 + 최대 밀도 + 빠른 연타 비율 + 롱 노트 비율의 가중합
+RATING_WEIGHTS = {
+    'mean_nps': 1.0,
+    'peak_nps': 0.5,
+    'dense_share': 4.0,
+    'long_share': 0.5,
+}
+
+
+def split_profile(cache_key):
+    """
+    캐시 키에서 분석 프로파일 분리 (기본 프로파일이 아니면 키 끝에 _<프로파일>이 붙음)
+
+    Returns:
+        (기본 캐시 키, 프로파일)
+    """
+    for profile in ANALYSIS_PROFILES:
+        suffix = f"_{profile}"
+        if profile != DEFAULT_PROFILE and cache_key.endswith(suffix):
+            return cache_key[:-len(suffix)], profile
+    return cache_key, DEFAULT_PROFILE
+
+
+def profile_rank(profile):
+    """곡마다 하나만 고를 때의 우선순위 (작을수록 우선: 기본 프로파일, 그다음 정확한 순서)"""
+    order = [DEFAULT_PROFILE] + [name for name in reversed(list(ANALYSIS_PROFILES)) if name != DEFAULT_PROFILE]
+    return order.index(profile)
+
+
+def find_analysis_caches(cache_dir):
+    """
+    캐시 폴더의 분석 캐시 파일 (곡별로 하나, 바이너리 우선)
+
+    한 곡을 여러 프로파일로 분석했으면 기본 프로파일 캐시를 쓰고,
+    없으면 가장 정확한 프로파일을 쓴다 (같은 곡을 두 번 세지 않음).
+
+    Returns:
+        dict: 기본 캐시 키 -> (파일 경로, 프로파일)
+    """
+    files = {}
+    for path in analysis_cache.legacy_cache_files(cache_dir):
+        files[os.path.splitext(os.path.basename(path))[0]] = path
+    for filename in sorted(os.listdir(cache_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext == analysis_cache.CACHE_EXT:
+            files[stem] = os.path.join(cache_dir, filename)
+
+    caches = {}
+    for stem, path in files.items():
+        base_key, profile = split_profile(stem)
+        if base_key not in caches or profile_rank(profile) < profile_rank(caches[base_key][1]):
+            caches[base_key] = (path, profile)
+    return caches
+
+
+def load_analysis(path):
+    if path.endswith(analysis_cache.CACHE_EXT):
+        return analysis_cache.read_cache(path)
+    return analysis_cache.read_legacy_json(path)
+
+
+def max_score(n_scoring):
+    """일반 노트 n개를 모두 perfect로 쳤을 때 점수 (콤보 k번째: 300 + min(10k, 500))"""
+    combo = np.arange(1, n_scoring + 1)
+    return int(np.sum(PERFECT_POINTS + np.minimum(combo * COMBO_BONUS_STEP, COMBO_BONUS_MAX)))
+
+
+def chart_statistics(times, is_long, song_duration):
+    """
+    채보 배열 하나의 통계
+
+    Args:
+        times: 노트 시간 (정렬됨)
+        is_long: 롱 노트 여부
+        song_duration: 곡 길이 (초) - 평균 밀도의 분모
+    """
+    n = len(times)
+    gaps = np.diff(times)
+    gap_counts, _ = np.histogram(gaps, bins=GAP_BINS)
+
+    # 각 노트에서 시작하는 PEAK_WINDOW초 구간에 들어가는 노트 수의 최대
+    if n:
+        in_window = np.searchsorted(times, times + PEAK_WINDOW, side='left') - np.arange(n)
+        peak_nps = float(in_window.max()) / PEAK_WINDOW
+    else:
+        peak_nps = 0.0
+
+    long_count = int(np.count_nonzero(is_long))
+    stats = {
+        'notes': n,
+        'long_notes': long_count,
+        'long_share': long_count / n if n else 0.0,
+        'mean_nps': n / song_duration if song_duration > 0 else 0.0,
+        'peak_nps': peak_nps,
+        'min_gap': float(gaps.min()) if len(gaps) else None,
+        'dense_share': float(np.count_nonzero(gaps < DENSE_GAP)) / len(gaps) if len(gaps) else 0.0,
+        'gap_histogram': gap_counts.tolist(),
+        'max_score': max_score(n - long_count),
+    }
+    stats['rating'] = sum(weight * stats[key] for key, weight in RATING_WEIGHTS.items())
+    return stats
+
+
+def library_report(cache_dir='charts_cache', start_delay=3.0, difficulties=DIFFICULTIES):
+    """
+    캐시의 모든 곡 x 난이도 통계
+
+    Returns:
+        dict: {'songs': [{'cache_key', 'profile', 'music_file', 'tempo', 'duration', 'charts': {난이도: 통계}}],
+               'summary': {난이도: 평가 범위}, 'seconds': 소요 시간, ...}
+    """
+    start = time.perf_counter()
+    songs = []
+    for cache_key, (path, profile) in find_analysis_caches(cache_dir).items():
+        try:
+            data = load_analysis(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"캐시 읽기 실패: {os.path.basename(path)} ({e})")
+            continue
+        beats = np.asarray(data.beat_times, dtype=np.float64)
+        onsets = np.asarray(data.onset_times, dtype=np.float64)
+        beat_distance = nearest_beat_distance(onsets, beats)  # 난이도 간 공유
+
+        charts = {}
+        for difficulty in difficulties:
+            times, is_long, _ = chart_arrays(beats, onsets, difficulty, start_delay, beat_distance)
+            charts[difficulty] = chart_statistics(times, is_long, data.duration)
+        songs.append({
+            'cache_key': cache_key,
+            'profile': profile,
+            'music_file': data.music_file or cache_key,
+            'tempo': float(data.tempo),
+            'duration': float(data.duration),
+            'charts': charts,
+        })
+
+    summary = {}
+    for difficulty in difficulties:
+        ratings = np.array([song['charts'][difficulty]['rating'] for song in songs])
+        if len(ratings):
+            summary[difficulty] = {
+                'min': float(ratings.min()),
+                'median': float(np.median(ratings)),
+                'max': float(ratings.max()),
+            }
+
+    return {
+        'start_delay': start_delay,
+        'peak_window': PEAK_WINDOW,
+        'gap_bins': [b if np.isfinite(b) else None for b in GAP_BINS],
+        'rating_weights': RATING_WEIGHTS,
+        'songs': songs,
+        'summary': summary,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def write_report(report, cache_dir='charts_cache'):
+    """캐시 폴더에 chart_stats.json 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = os.path.join(cache_dir, STATS_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def print_report(report):
+    print(f"\n채보 통계 ({len(report['songs'])}곡, {report['seconds'] * 1000:.1f}ms)")
+    print("=" * 104)
+    print(f"{'곡':>24} | {'난이도':>6} | {'노트':>5} | {'평균 nps':>8} | {'최대 nps':>8} | "
+          f"{'최소 간격':>8} | {'롱 노트':>6} | {'최고 점수':>9} | {'난이도 수치':>6}")
+    print("-" * 104)
+    for song in report['songs']:
+        name = os.path.splitext(song['music_file'])[0][:24]
+        for difficulty, stats in song['charts'].items():
+            min_gap = f"{stats['min_gap']:.3f}s" if stats['min_gap'] is not None else '-'
+            print(f"{name:>24} | {difficulty:>7} | {stats['notes']:5} | {stats['mean_nps']:8.2f} | "
+                  f"{stats['peak_nps']:8.2f} | {min_gap:>9} | {stats['long_share'] * 100:6.1f}% | "
+                  f"{stats['max_score']:9} | {stats['rating']:8.2f}")
+    print("-" * 104)
+    for difficulty, summary in report['summary'].items():
+        print(f"{difficulty:>8}: 난이도 수치 {summary['min']:.2f} ~ {summary['max']:.2f} "
+              f"(중앙값 {summary['median']:.2f})")
+    print("=" * 104)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='캐시된 모든 곡의 채보 통계 / 난이도 평가')
+    parser.add_argument('--cache-dir', default='charts_cache', help='캐시 폴더')
+    parser.add_argument('--start-delay', type=float, default=3.0, help='채보 시작 지연 (초)')
+    args = parser.parse_args(argv)
+
+    report = library_report(args.cache_dir, args.start_delay)
+    print_report(report)
+    path = write_report(report, args.cache_dir)
+    print(f"저장: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
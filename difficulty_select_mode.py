@@ -3,7 +3,8 @@
 """
 from pico2d import *
 import game_framework
-import play_mode
+from asset_manager import ASSETS
+import loading_mode
 
 class DifficultySelectMode:
     def __init__(self, selected_song):
@@ -25,11 +26,13 @@ class DifficultySelectMode:
         self.desc_font = None
         # 배경 이미지 로드
         if self.background is None:
-            self.background = load_image('background.png')
+            self.background = ASSETS.acquire('background.png')
         
     def exit(self):
-        """난이도 선택 모드 종료"""
-        pass
+        """난이도 선택 모드 종료 - 공유 텍스처 반납"""
+        if self.background:
+            ASSETS.release('background.png')
+            self.background = None
         
     def handle_event(self, event):
         """이벤트 처리"""
@@ -50,11 +53,9 @@ class DifficultySelectMode:
                 # 선택 확정 - 게임 시작
                 selected_difficulty = self.difficulties[self.selected_index]['value']
                 print(f"게임 시작: {self.selected_song['name']} - {selected_difficulty}")
+                # 분석은 로딩 화면에서 워커 프로세스로 진행
                 game_framework.change_mode(
-                    play_mode.PlayMode(
-                        music_path=self.selected_song['file'],
-                        difficulty=selected_difficulty
-                    )
+                    loading_mode.LoadingMode(self.selected_song, selected_difficulty)
                 )
                 
     def update(self):
@@ -1,5 +1,6 @@
 import time
 from pico2d import *
+from input_events import EventPoller
 
 # 게임 상태 관리
 class GameState:
@@ -10,6 +11,8 @@ class GameState:
 
 game_state = GameState()
 stack = []
+# 이벤트마다 폴링 시각(event.timestamp, time.perf_counter 기준)을 붙이고 대기 중에도 폴링
+event_poller = EventPoller(get_events)
 
 def init():
     open_canvas(1080, 608)  # 배경 이미지 크기에 맞춤
@@ -31,8 +34,8 @@ def run(start_state):
         game_state.dt = frame_time - current_time
         current_time = frame_time
         
-        # 이벤트 처리
-        events = get_events()
+        # 이벤트 처리 (대기 중에 미리 가져온 이벤트 포함)
+        events = event_poller.drain()
         for event in events:
             if event.type == SDL_QUIT:
                 game_state.running = False
@@ -47,7 +50,7 @@ def run(start_state):
         stack[-1].draw()
         update_canvas()
         
-        delay(0.01)  
+        event_poller.wait(0.01)
     
     # 정리
     while len(stack) > 0:
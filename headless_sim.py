@@ -0,0 +1,207 @@
+"""
+헤드리스 시뮬레이터 - 창/이미지/음악 없이 채보와 입력 스크립트를 실제 판정/상태 머신 로직으로 실행
+
+가상 시계를 프레임마다 dt씩 진행하며 PlayMode를 그대로 돌린다 (handle_event → update).
+Player, 상태 머신, RhythmManager가 모두 가상 시계를 쓰므로 결과는 항상 같고
+실시간보다 훨씬 빠르게 곡 하나를 끝낼 수 있다.
+
+사용법:
+    python headless_sim.py 음악파일 [--difficulty normal] [--fps 60]
+                           [--offset 0.0] [--jitter 0.0] [--miss-rate 0.0] [--seed 0]
+    python headless_sim.py --synthetic 500 ...   (음악 없이 무작위 채보)
+"""
+import io
+import sys
+import time
+import random
+import argparse
+import contextlib
+import numpy as np
+from pico2d import SDL_KEYDOWN, SDL_KEYUP, SDLK_SPACE
+import game_framework
+from play_mode import PlayMode
+from building import MUSIC_START_DELAY
+from note_store import JUDGMENTS, time_to_beat_at
+
+PLAYER_X = 90  # Player 기본 x 위치
+
+
+class SimClock:
+    """가상 단조 시계 (초)"""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+
+class SimEvent:
+    """pico2d 이벤트 대신 쓰는 키 이벤트 (timestamp는 가상 시계 기준)"""
+
+    def __init__(self, type, key, timestamp):
+        self.type = type
+        self.key = key
+        self.timestamp = timestamp
+
+
+def scripted_inputs(chart, offset=0.0, jitter=0.0, miss_rate=0.0, seed=0, player_x=PLAYER_X):
+    """
+    채보를 따라 치는 입력 스크립트 생성
+
+    패링은 노트가 플레이어와 겹칠 때만 성공하므로, 노트가 player_x를 지나는 순간
+    (판정 시각보다 time_to_beat_at(player_x)초 앞)을 기준으로 누른다.
+
+    Args:
+        chart: 노트 dict 리스트
+        offset: 모든 입력을 늦추는 시간 (초, 음수면 빠름)
+        jitter: 입력 시각 흔들림 표준편차 (초)
+        miss_rate: 입력하지 않고 놓칠 노트 비율
+
+    Returns:
+        list: (곡 시간, 'down' 또는 'up') - 시간순
+    """
+    rng = random.Random(seed)
+    lead = time_to_beat_at(player_x)
+    inputs = []
+    for note in chart:
+        if rng.random() < miss_rate:
+            continue
+        press = note['time'] - lead + offset + rng.gauss(0, jitter)
+        inputs.append((press, 'down'))
+        if note.get('type') == 'long':
+            # 홀딩이 끝난 뒤 떼기
+            inputs.append((press + note['duration'] + 0.05, 'up'))
+    inputs.sort(key=lambda entry: entry[0])
+    return inputs
+
+
+def simulate(chart, inputs, fps=60, difficulty='normal', bpm=120, quiet=True):
+    """
+    채보 하나를 입력 스크립트대로 끝까지 플레이
+
+    Args:
+        chart: 노트 dict 리스트 (곡 시간, 시작 지연 포함)
+        inputs: scripted_inputs() 형식의 입력
+        fps: 시뮬레이션 프레임 속도 (dt = 1 / fps)
+        quiet: True면 게임 로직의 print 출력을 버림
+
+    Returns:
+        dict: 점수/콤보/HP/판정 개수와 시뮬레이션 속도
+    """
+    clock = SimClock()
+    last_time = max((note['time'] + note.get('duration', 0) for note in chart), default=0.0)
+    prepared_chart = {'chart': chart, 'bpm': bpm, 'duration': last_time}
+    mode = PlayMode(music_path='', difficulty=difficulty, prepared_chart=prepared_chart,
+                    now=clock.now, headless=True, record=False)
+    dt = 1.0 / fps
+    frames = 0
+    next_input = 0
+
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    start = time.perf_counter()
+    with output:
+        mode.enter()
+        rhythm = mode.rhythm_manager
+        while True:
+            clock.t += dt
+
+            # 지난 프레임 이후에 눌린 키를 누른 시각 그대로 전달 (곡 시간 -> 가상 시계)
+            if rhythm.clock.started:
+                while next_input < len(inputs) and rhythm.clock.anchor + inputs[next_input][0] <= clock.t:
+                    song_time, kind = inputs[next_input]
+                    event_type = SDL_KEYDOWN if kind == 'down' else SDL_KEYUP
+                    mode.handle_event(SimEvent(event_type, SDLK_SPACE, rhythm.clock.anchor + song_time))
+                    next_input += 1
+
+            game_framework.game_state.dt = dt
+            mode.update()
+            frames += 1
+
+            if mode.victory or mode.player.is_dead or rhythm.current_time > last_time + 5.0:
+                break
+        wall = time.perf_counter() - start
+
+        judgments = np.bincount(rhythm.notes.judgment, minlength=len(JUDGMENTS))
+        result = {
+            'notes': len(rhythm.notes),
+            'score': rhythm.score,
+            'combo': rhythm.combo,
+            'max_combo': rhythm.max_combo,
+            'hp': mode.player.hp,
+            'max_hp': mode.player.max_hp,
+            'cleared': mode.victory,
+            'judgments': {name: int(judgments[code]) for code, name in enumerate(JUDGMENTS) if name},
+            'frames': frames,
+            'song_time': rhythm.current_time,
+            'wall_time': wall,
+            'speed': (clock.t / wall) if wall > 0 else float('inf'),
+        }
+        mode.exit()
+    return result
+
+
+def print_result(result):
+    print("\n헤드리스 시뮬레이션 결과")
+    print("=" * 50)
+    print(f"노트 {result['notes']}개 | {'클리어' if result['cleared'] else '실패'}")
+    print(f"점수 {result['score']} | 콤보 {result['combo']} (최대 {result['max_combo']}) | "
+          f"HP {result['hp']}/{result['max_hp']}")
+    print("판정 " + ", ".join(f"{name} {count}" for name, count in result['judgments'].items()))
+    print(f"{result['frames']}프레임, 곡 시간 {result['song_time']:.1f}초를 "
+          f"{result['wall_time'] * 1000:.1f}ms에 실행 (실시간 대비 {result['speed']:.0f}배)")
+    print("=" * 50)
+
+
+def synthetic_chart(n_notes, seed=0, long_rate=0.1):
+    """음악 없이 쓰는 무작위 채보 (시작 지연 포함)"""
+    rng = random.Random(seed)
+    chart = []
+    t = MUSIC_START_DELAY
+    for _ in range(n_notes):
+        t += rng.choice([0.25, 0.5, 0.75, 1.0])
+        if rng.random() < long_rate:
+            duration = rng.choice([0.5, 1.0])
+            chart.append({'time': t, 'type': 'long', 'duration': duration})
+            t += duration
+        else:
+            chart.append({'time': t, 'type': 'normal', 'duration': 0})
+    return chart
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='헤드리스 게임플레이 시뮬레이터')
+    parser.add_argument('music', nargs='?', help='음악 파일 (채보 캐시가 없으면 분석)')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='음악 대신 노트 N개짜리 무작위 채보 사용')
+    parser.add_argument('--difficulty', default='normal')
+    parser.add_argument('--fps', type=float, default=60)
+    parser.add_argument('--offset', type=float, default=0.0, help='입력 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='입력 흔들림 표준편차 (초)')
+    parser.add_argument('--miss-rate', type=float, default=0.0, help='입력하지 않을 노트 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='게임 로직 출력 표시')
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        chart = synthetic_chart(args.synthetic, args.seed)
+        bpm = 120
+    elif args.music:
+        from music_analyzer import MusicAnalyzer
+        analyzer = MusicAnalyzer(args.music)
+        chart = analyzer.get_chart(difficulty=args.difficulty, start_delay=MUSIC_START_DELAY)
+        if chart is None:
+            print("채보 생성 실패")
+            return 1
+        bpm = analyzer.get_bpm()
+    else:
+        parser.error('음악 파일 또는 --synthetic N이 필요함')
+
+    inputs = scripted_inputs(chart, args.offset, args.jitter, args.miss_rate, args.seed)
+    result = simulate(chart, inputs, fps=args.fps, difficulty=args.difficulty, bpm=bpm,
+                      quiet=not args.verbose)
+    print_result(result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
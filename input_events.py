@@ -0,0 +1,54 @@
+"""
+입력 이벤트 폴링 - 이벤트마다 가져온 시각(timestamp)을 붙이고, 프레임 사이 대기 중에도 폴링
+
+게임 루프는 프레임마다 한 번 이벤트를 가져오고 delay(0.01)로 쉬므로,
+그대로 두면 입력 시각이 (프레임 시간 + 10ms) 단위로 뭉개진다.
+EventPoller는 대기 시간 동안 짧은 간격으로 이벤트를 미리 가져와 시각을 기록해 두고,
+다음 프레임에서 한꺼번에 넘겨준다.
+"""
+import time
+
+POLL_INTERVAL = 0.001  # 대기 중 폴링 간격 (초)
+
+
+class EventPoller:
+    """
+    Args:
+        poll: 이벤트 리스트를 반환하는 함수 (pico2d.get_events)
+        now: 고해상도 단조 시계 (SongClock과 같은 시계여야 함)
+        sleep: 대기 함수
+        interval: 대기 중 폴링 간격 (초)
+    """
+
+    def __init__(self, poll, now=time.perf_counter, sleep=time.sleep, interval=POLL_INTERVAL):
+        self.poll = poll
+        self.now = now
+        self.sleep = sleep
+        self.interval = interval
+        self.pending = []  # 가져왔지만 아직 처리하지 않은 이벤트
+
+    def poll_now(self):
+        """지금 쌓인 이벤트를 가져와 현재 시각을 붙여 둠"""
+        events = self.poll()
+        if events:
+            timestamp = self.now()
+            for event in events:
+                event.timestamp = timestamp
+            self.pending.extend(events)
+
+    def drain(self):
+        """처리할 이벤트 전부 반환 (가져온 순서대로, 각 이벤트에 timestamp 속성)"""
+        self.poll_now()
+        events = self.pending
+        self.pending = []
+        return events
+
+    def wait(self, duration):
+        """duration 동안 쉬면서 interval마다 이벤트 폴링 (delay 대체)"""
+        deadline = self.now() + duration
+        while True:
+            self.poll_now()
+            remaining = deadline - self.now()
+            if remaining <= 0:
+                break
+            self.sleep(min(self.interval, remaining))
@@ -0,0 +1,166 @@
+"""
+로딩 모드 - 음악 분석/채보 생성을 워커 프로세스에서 실행하며 진행 상황 표시
+"""
+from pico2d import *
+import multiprocessing
+import queue
+import game_framework
+from asset_manager import ASSETS
+import play_mode
+from building import MUSIC_START_DELAY
+from music_analyzer import MusicAnalyzer, chart_worker
+
+# 분석 단계별 표시 문구와 진행률
+STAGES = {
+    'start': ('Preparing...', 0.05),
+    'decode': ('Decoding audio...', 0.15),
+    'beat': ('Tracking beats...', 0.5),
+    'onset': ('Detecting onsets...', 0.75),
+    'chart': ('Generating chart...', 0.9),
+    'done': ('Ready!', 1.0),
+}
+
+
+class LoadingMode:
+    def __init__(self, selected_song, difficulty):
+        self.selected_song = selected_song
+        self.difficulty = difficulty
+        self.background = None
+        self.white_img = None
+        self.font = None
+        self.desc_font = None
+        self.process = None
+        self.queue = None
+        self.stage = 'start'
+        self.error = None
+        self.elapsed = 0
+
+    def enter(self):
+        """로딩 모드 진입 - 채보 캐시가 있으면 바로 시작, 없으면 워커 실행"""
+        print(f"로딩 화면 진입: {self.selected_song['name']} - {self.difficulty}")
+        if self.background is None:
+            self.background = ASSETS.acquire('background.png')
+        if self.white_img is None:
+            self.white_img = ASSETS.acquire('white.png')
+
+        # 채보 캐시 적중 시 워커 없이 바로 플레이
+        analyzer = MusicAnalyzer(self.selected_song['file'])
+        chart = analyzer.load_chart_from_cache(self.difficulty, MUSIC_START_DELAY)
+        if chart is not None:
+            self.start_play({'chart': chart, 'bpm': analyzer.get_bpm(), 'duration': analyzer.get_duration()})
+            return
+
+        # spawn: SDL 창을 가진 부모 프로세스를 fork하지 않도록
+        context = multiprocessing.get_context('spawn')
+        self.queue = context.Queue()
+        self.process = context.Process(
+            target=chart_worker,
+            args=(self.selected_song['file'], self.difficulty, MUSIC_START_DELAY,
+                  analyzer.cache_dir, self.queue),
+            daemon=True
+        )
+        self.process.start()
+
+    def exit(self):
+        """로딩 모드 종료 - 진행 중인 워커 정리"""
+        if self.process and self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        # 공유 텍스처 반납
+        if self.background:
+            ASSETS.release('background.png')
+            self.background = None
+        if self.white_img:
+            ASSETS.release('white.png')
+            self.white_img = None
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def start_play(self, prepared_chart):
+        self.stage = 'done'
+        game_framework.change_mode(
+            play_mode.PlayMode(
+                music_path=self.selected_song['file'],
+                difficulty=self.difficulty,
+                prepared_chart=prepared_chart
+            )
+        )
+
+    def handle_event(self, event):
+        """이벤트 처리"""
+        if event.type == SDL_QUIT:
+            game_framework.quit()
+        elif event.type == SDL_KEYDOWN and event.key == SDLK_ESCAPE:
+            # 분석 취소 후 난이도 선택으로 돌아가기
+            import difficulty_select_mode
+            game_framework.change_mode(difficulty_select_mode.DifficultySelectMode(self.selected_song))
+
+    def update(self):
+        """워커 메시지 확인 (블로킹 없이)"""
+        self.elapsed += game_framework.game_state.dt
+        if self.queue is None or self.error:
+            return
+
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if message[0] == 'progress':
+                self.stage = message[1]
+            elif message[0] == 'done':
+                self.start_play(message[1])
+                return
+            elif message[0] == 'error':
+                self.error = message[1]
+                print(f"분석 실패: {self.error}")
+                return
+
+        # 메시지 없이 워커가 종료된 경우
+        if self.process and not self.process.is_alive() and self.queue.empty():
+            self.error = '분석 프로세스가 비정상 종료됨'
+
+    def draw(self):
+        """화면 그리기"""
+        clear_canvas()
+
+        canvas_width = get_canvas_width()
+        canvas_height = get_canvas_height()
+        center_x = canvas_width // 2
+        center_y = canvas_height // 2
+
+        if self.background:
+            self.background.draw(center_x, center_y)
+
+        # 폰트 로드 (처음 한 번만)
+        if self.font is None:
+            self.font = load_font('C:\\Windows\\Fonts\\malgun.ttf', 40)
+        if self.desc_font is None:
+            self.desc_font = load_font('C:\\Windows\\Fonts\\malgun.ttf', 20)
+
+        self.font.draw(center_x - 100, center_y + 80, "LOADING", (255, 255, 255))
+        self.desc_font.draw(center_x - 150, center_y + 30,
+                            f"{self.selected_song['name']} - {self.difficulty.upper()}", (150, 150, 255))
+
+        if self.error:
+            self.desc_font.draw(center_x - 150, center_y - 30, "Analysis failed (ESC to go back)", (255, 100, 100))
+        else:
+            text, progress = STAGES.get(self.stage, STAGES['start'])
+            self.desc_font.draw(center_x - 150, center_y - 30, f"{text} ({self.elapsed:.1f}s)", (200, 200, 100))
+
+            # 진행 바
+            bar_width = 400
+            bar_height = 10
+            bar_y = center_y - 70
+            if self.white_img:
+                fill_width = bar_width * progress
+                self.white_img.draw(center_x - bar_width / 2 + fill_width / 2, bar_y, fill_width, bar_height)
+                self.white_img.draw(center_x, bar_y + bar_height / 2, bar_width, 2)
+                self.white_img.draw(center_x, bar_y - bar_height / 2, bar_width, 2)
+
+        update_canvas()
@@ -4,67 +4,241 @@
 import librosa
 import numpy as np
 import os
-import json
-import hashlib
+import time
+import analysis_cache
+
+# 분석 파라미터 (librosa 기본값과 동일, 'accurate' 프로파일)
+ANALYSIS_SR = 22050  # 분석용 샘플링 레이트
+N_FFT = 2048  # STFT 창 크기
+HOP_LENGTH = 512  # 프레임 간격 (샘플)
+
+# 분석 프로파일 - 샘플링 레이트/프레임 크기/리샘플러 품질
+# 모든 프로파일의 프레임 간격은 약 23ms, STFT 창은 약 93ms로 맞춤
+ANALYSIS_PROFILES = {
+    'fast': {'sr': 11025, 'n_fft': 1024, 'hop_length': 256, 'n_mels': 64, 'res_type': 'soxr_lq'},
+    'balanced': {'sr': 16000, 'n_fft': 1536, 'hop_length': 384, 'n_mels': 96, 'res_type': 'soxr_mq'},
+    'accurate': {'sr': ANALYSIS_SR, 'n_fft': N_FFT, 'hop_length': HOP_LENGTH, 'n_mels': 128, 'res_type': 'soxr_hq'},
+}
+DEFAULT_PROFILE = 'accurate'
+
+# 스트리밍 분석 기본 메모리 상한 (MB)
+STREAM_MEMORY_MB = 16
+
+DIFFICULTIES = ('easy', 'normal', 'hard', 'expert')
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.flac')
+
+# 채보 생성 알고리즘 버전 - generate_chart의 결과가 바뀌면 올릴 것 (채보 캐시 무효화)
+CHART_GENERATOR_VERSION = 1
+
+
+def nearest_beat_distance(onsets, beats):
+    """
+    각 온셋에서 가장 가까운 비트까지의 거리 (searchsorted 기반, O((n + m) log m))
+    
+    min(abs(onset - bt) for bt in beats)와 같은 값이며, 비트가 없으면 1.0
+    """
+    onsets = np.asarray(onsets, dtype=np.float64)
+    beats = np.sort(np.asarray(beats, dtype=np.float64))
+    if len(beats) == 0:
+        return np.ones(len(onsets))
+    
+    # 정렬된 비트에서 온셋 양옆의 비트만 비교하면 된다
+    idx = np.searchsorted(beats, onsets)
+    left = beats[np.maximum(idx - 1, 0)]
+    right = beats[np.minimum(idx, len(beats) - 1)]
+    return np.minimum(np.abs(onsets - left), np.abs(onsets - right))
+
+
+def min_gap_filter(times, min_gap):
+    """
+    정렬된 시간 배열에서 직전에 남긴 노트와 min_gap 이상 떨어진 노트만 남김
+    
+    앞에서부터 순서대로 고르는 기존 방식과 같은 결과 (t - last >= min_gap 비교도 동일).
+    각 노트의 '다음 후보'를 searchsorted로 한 번에 구하고, 남는 노트 수만큼만 따라간다.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    n = len(times)
+    if n == 0:
+        return times
+    
+    # 간격이 모두 충분하면 전부 남김
+    if np.all(np.diff(times) >= min_gap):
+        return times
+    
+    # nxt[i]: times[j] - times[i] >= min_gap 인 가장 작은 j
+    nxt = np.searchsorted(times, times + min_gap, side='left')
+    # times + min_gap 반올림 오차 보정 (뺄셈 결과로 다시 확인)
+    idx = np.arange(n)
+    while True:
+        back = (nxt > idx + 1) & (times[np.maximum(nxt - 1, 0)] - times >= min_gap)
+        ahead = (nxt < n) & (times[np.minimum(nxt, n - 1)] - times < min_gap)
+        if not back.any() and not ahead.any():
+            break
+        nxt[back] -= 1
+        nxt[ahead] += 1
+    
+    nxt = nxt.tolist()
+    keep = []
+    i = 0
+    while i < n:
+        keep.append(i)
+        i = nxt[i]
+    return times[keep]
+
+
+def chart_arrays(beats, onsets, difficulty='normal', start_delay=2.0, beat_distance=None):
+    """
+    난이도별 채보 계산 (generate_chart의 배열 버전 - 노트 dict를 만들지 않음)
+    
+    Args:
+        beats, onsets: 비트/온셋 시간 (초)
+        beat_distance: 온셋별 가장 가까운 비트 거리 (없으면 계산, 난이도 간 공유용)
+    
+    Returns:
+        tuple: (노트 시간, 롱 노트 여부, 롱 노트 길이) 배열 - 시간에는 start_delay 포함
+    """
+    beats = np.asarray(beats, dtype=np.float64)
+    onsets = np.asarray(onsets, dtype=np.float64)
+    if beat_distance is None and difficulty in ('normal', 'hard'):
+        beat_distance = nearest_beat_distance(onsets, beats)
+    
+    if difficulty == 'easy':
+        # Easy: 주요 비트만 사용 (2박자마다)
+        times = beats[::2]
+        
+    elif difficulty == 'normal':
+        # Normal: 온셋 중심으로 리듬 구성 (단순 비트 제외)
+        # 온셋이 실제 악기/보컬 타이밍을 더 잘 반영함
+        # - 비트는 4박자마다만 사용 (너무 반복적이지 않게)
+        # - 비트에서 0.15초 이상 떨어진 온셋 (실제 악기 타이밍)
+        # - 최소 간격 0.2초 (더 여유있게)
+        off_beat = onsets[beat_distance >= 0.15]
+        times = min_gap_filter(np.sort(np.concatenate([beats[::4], off_beat])), 0.2)
+        
+    elif difficulty == 'hard':
+        # Hard: 온셋 기반 + 복잡한 리듬 패턴
+        # - 2박자마다 비트 추가 (기본 구조)
+        # - 비트에서 0.1초 이상 떨어진 온셋
+        # - 최소 간격 0.1초 (빠른 리듬 허용)
+        off_beat = onsets[beat_distance >= 0.1]
+        times = min_gap_filter(np.sort(np.concatenate([beats[::2], off_beat])), 0.1)
+        
+    elif difficulty == 'expert':
+        # Expert: 모든 비트 + 모든 온셋 + 중간 보간 (비트의 1/2 지점), 0.1초 이상 간격
+        half_beats = (beats[:-1] + beats[1:]) / 2
+        times = min_gap_filter(np.unique(np.concatenate([beats, onsets, half_beats])), 0.1)
+        
+    else:
+        print(f"알 수 없는 난이도: {difficulty}, normal로 설정")
+        times = beats
+    
+    chart = times + start_delay
+    
+    # 롱 노트 생성: 다음 노트와의 간격이 1.5~3.0초면 롱 노트 (간격의 70% 길이)
+    intervals = np.diff(chart)
+    is_long = np.zeros(len(chart), dtype=bool)
+    is_long[:-1] = (intervals >= 1.5) & (intervals <= 3.0)
+    durations = np.zeros(len(chart))
+    durations[:-1][is_long[:-1]] = intervals[is_long[:-1]] * 0.7
+    return chart, is_long, durations
+
 
 class MusicAnalyzer:
     """음악 파일을 분석하여 리듬 게임 채보 데이터를 생성하는 클래스"""
     
-    def __init__(self, music_path):
+    def __init__(self, music_path, streaming=False, stream_memory_mb=STREAM_MEMORY_MB,
+                 keep_envelopes=False, profile=DEFAULT_PROFILE):
         """
         Args:
             music_path: 음악 파일 경로 (mp3, wav 등)
+            streaming: True면 전체 PCM을 메모리에 올리지 않고 블록 단위로 분석
+            stream_memory_mb: 스트리밍 분석 시 오디오 버퍼 메모리 상한 (MB)
+            keep_envelopes: True면 분석 후 온셋 강도 엔벨로프를 보관
+            profile: 분석 프로파일 ('fast', 'balanced', 'accurate')
         """
+        if profile not in ANALYSIS_PROFILES:
+            raise ValueError(f"알 수 없는 분석 프로파일: {profile} (사용 가능: {list(ANALYSIS_PROFILES)})")
         self.music_path = music_path
+        self.profile = profile
+        settings = ANALYSIS_PROFILES[profile]
+        self.analysis_sr = settings['sr']
+        self.n_fft = settings['n_fft']
+        self.hop_length = settings['hop_length']
+        self.n_mels = settings['n_mels']
+        self.res_type = settings['res_type']
+        self.streaming = streaming
+        self.stream_memory_mb = stream_memory_mb
+        self.keep_envelopes = keep_envelopes
+        self.beat_envelope = None  # 비트 추적용 온셋 강도 (keep_envelopes일 때)
+        self.onset_envelope = None  # 온셋 검출용 온셋 강도 (keep_envelopes일 때)
+        self.stage_times = {}  # 분석 단계별 소요 시간 (초)
+        self.progress_callback = None  # 진행 단계 알림 (stage 문자열을 받는 함수)
         self.y = None  # 오디오 시계열 데이터
         self.sr = None  # 샘플링 레이트
         self.tempo = None  # BPM
         self.beat_times = []  # 비트 타이밍 (초 단위)
         self.onset_times = []  # 온셋 타이밍 (초 단위)
         self.duration = 0  # 음악 길이 (초)
+        self.beat_distance = None  # 온셋별 가장 가까운 비트까지 거리 (채보 생성 시 공유)
         
         self.is_loaded = False
         
         # 캠싱 관련
         self.cache_dir = 'charts_cache'
         self.cache_file = None
+        self.cache_key = None  # get_cache_key() 결과 (한 번만 계산)
         
-    def get_cache_filename(self):
-        """음악 파일의 캠시 파일명 생성 (MD5 해시 기반)"""
-        # 파일 내용을 해싱하여 유니크한 이름 생성
+    def get_cache_key(self):
+        """음악 파일의 캠시 키 생성 (MD5 해시 기반, 확장자 제외)"""
+        if self.cache_key is not None:
+            return self.cache_key
+        
+        # 파일 내용 해시로 유니크한 이름 생성 (stat이 같으면 인덱스에서 바로 조회)
+        filename = os.path.basename(self.music_path)
+        name_without_ext = os.path.splitext(filename)[0]
         try:
-            with open(self.music_path, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-            filename = os.path.basename(self.music_path)
-            name_without_ext = os.path.splitext(filename)[0]
-            return f"{name_without_ext}_{file_hash[:8]}.json"
-        except:
+            index = analysis_cache.FileHashIndex.for_dir(self.cache_dir)
+            file_hash = index.get_hash(self.music_path)
+            self.cache_key = f"{name_without_ext}_{file_hash[:8]}"
+        except OSError:
             # 해싱 실패 시 파일명만 사용
-            filename = os.path.basename(self.music_path)
-            name_without_ext = os.path.splitext(filename)[0]
-            return f"{name_without_ext}_cache.json"
+            self.cache_key = f"{name_without_ext}_cache"
+        # 기본 프로파일이 아니면 프로파일 이름을 붙임 (기존 캠시 파일명 유지)
+        if self.profile != DEFAULT_PROFILE:
+            self.cache_key += f"_{self.profile}"
+        return self.cache_key
+    
+    def get_cache_filename(self):
+        """음악 파일의 캠시 파일명 생성"""
+        return self.get_cache_key() + analysis_cache.CACHE_EXT
     
     def load_from_cache(self):
-        """캠시에서 분석 데이터 로드"""
+        """캠시에서 분석 데이터 로드 (기존 JSON 캠시는 바이너리로 변환)"""
         if not os.path.exists(self.cache_dir):
             return False
         
-        cache_filename = self.get_cache_filename()
+        cache_key = self.get_cache_key()
+        cache_filename = cache_key + analysis_cache.CACHE_EXT
         self.cache_file = os.path.join(self.cache_dir, cache_filename)
-        
-        if not os.path.exists(self.cache_file):
-            return False
+        legacy_file = os.path.join(self.cache_dir, cache_key + analysis_cache.LEGACY_CACHE_EXT)
         
         try:
-            print(f"캠시에서 로드 중: {cache_filename}")
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.tempo = data['tempo']
-            self.beat_times = np.array(data['beat_times'])
-            self.onset_times = np.array(data['onset_times'])
-            self.duration = data['duration']
-            self.sr = data['sr']
+            if os.path.exists(self.cache_file):
+                print(f"캠시에서 로드 중: {cache_filename}")
+                data = analysis_cache.read_cache(self.cache_file)
+            elif os.path.exists(legacy_file):
+                print(f"JSON 캠시 변환 중: {os.path.basename(legacy_file)} -> {cache_filename}")
+                data = analysis_cache.migrate_legacy_json(legacy_file, self.cache_file)
+            else:
+                return False
+            
+            self.tempo = data.tempo
+            self.beat_times = data.beat_times
+            self.onset_times = data.onset_times
+            self.beat_distance = None
+            self.duration = data.duration
+            self.sr = data.sr
             self.is_loaded = True
             
             print(f"✓캠시 로드 성공!")
@@ -73,6 +247,14 @@ class MusicAnalyzer:
             print(f"캠시 로드 실패: {e}")
             return False
     
+    def is_cached(self):
+        """분석 캠시(바이너리 또는 기존 JSON)가 이미 있는지 확인"""
+        cache_key = self.get_cache_key()
+        return any(
+            os.path.exists(os.path.join(self.cache_dir, cache_key + ext))
+            for ext in (analysis_cache.CACHE_EXT, analysis_cache.LEGACY_CACHE_EXT)
+        )
+    
     def save_to_cache(self):
         """분석 데이터를 캠시에 저장"""
         if not self.is_loaded:
@@ -87,17 +269,16 @@ class MusicAnalyzer:
             cache_filename = self.get_cache_filename()
             self.cache_file = os.path.join(self.cache_dir, cache_filename)
             
-            data = {
-                'music_file': os.path.basename(self.music_path),
-                'tempo': float(self.tempo),
-                'beat_times': self.beat_times.tolist(),
-                'onset_times': self.onset_times.tolist(),
-                'duration': float(self.duration),
-                'sr': int(self.sr)
-            }
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            analysis_cache.write_cache(
+                self.cache_file,
+                music_file=os.path.basename(self.music_path),
+                tempo=self.tempo,
+                duration=self.duration,
+                sr=self.sr,
+                hop_length=self.hop_length,
+                beat_times=self.beat_times,
+                onset_times=self.onset_times
+            )
             
             print(f"캠시 저장 완료: {cache_filename}")
             return True
@@ -117,31 +298,18 @@ class MusicAnalyzer:
         
         try:
             print(f"🎵 음악 분석 시작: {os.path.basename(self.music_path)}")
-            
-            # 음악 파일 로드
-            print("  - 파일 로딩 중...")
-            self.y, self.sr = librosa.load(self.music_path, sr=22050)
-            self.duration = librosa.get_duration(y=self.y, sr=self.sr)
-            print(f"  ✓ 로드 완료: {self.duration:.2f}초, 샘플링 레이트: {self.sr}Hz")
-            
-            # BPM 추출
-            print("  - BPM 분석 중...")
-            tempo, beat_frames = librosa.beat.beat_track(y=self.y, sr=self.sr)
-            self.tempo = float(tempo)
-            self.beat_times = librosa.frames_to_time(beat_frames, sr=self.sr)
-            print(f"  ✓ BPM: {self.tempo:.1f}, 비트 수: {len(self.beat_times)}")
-            
-            # 온셋(타격 지점) 감지
-            print("  - 온셋 분석 중...")
-            onset_frames = librosa.onset.onset_detect(
-                y=self.y, 
-                sr=self.sr,
-                hop_length=512,
-                backtrack=True,
-                units='frames'
-            )
-            self.onset_times = librosa.frames_to_time(onset_frames, sr=self.sr)
-            print(f"  온셋 수: {len(self.onset_times)}")
+            self.beat_distance = None
+            self.stage_times = {}
+            
+            if self.streaming:
+                try:
+                    self.analyze_streaming()
+                except Exception as e:
+                    # soundfile이 읽지 못하는 형식이면 기존 방식으로 분석
+                    print(f"  스트리밍 분석 불가, 전체 로드로 재시도: {e}")
+                    self.analyze_full()
+            else:
+                self.analyze_full()
             
             self.is_loaded = True
             print("음악 분석 완료!")
@@ -157,6 +325,317 @@ class MusicAnalyzer:
             traceback.print_exc()
             return False
     
+    def report_progress(self, stage):
+        """진행 단계 알림 ('decode', 'beat', 'onset', 'chart')"""
+        if self.progress_callback:
+            self.progress_callback(stage)
+    
+    def analyze_full(self):
+        """
+        전체 파일을 메모리에 로드하여 분석
+        
+        멜 스펙트로그램(dB)을 한 번만 계산하고, 비트 추적용(멜 밴드 중앙값)과
+        온셋 검출용(평균) 엔벨로프를 둘 다 그것으로 만든다.
+        beat_track(y=...)와 onset_detect(y=...)를 각각 호출하던 것과 결과가 같다.
+        """
+        # 음악 파일 로드
+        self.report_progress('decode')
+        print("  - 파일 로딩 중...")
+        start = time.perf_counter()
+        self.y, self.sr = librosa.load(self.music_path, sr=self.analysis_sr, res_type=self.res_type)
+        self.duration = librosa.get_duration(y=self.y, sr=self.sr)
+        self.stage_times['decode'] = time.perf_counter() - start
+        print(f"  ✓ 로드 완료: {self.duration:.2f}초, 샘플링 레이트: {self.sr}Hz")
+        
+        # 온셋 강도 엔벨로프 (한 번만 계산)
+        print("  - 온셋 강도 계산 중...")
+        start = time.perf_counter()
+        S_db = librosa.power_to_db(librosa.feature.melspectrogram(
+            y=self.y, sr=self.sr, n_fft=self.n_fft, hop_length=self.hop_length, n_mels=self.n_mels
+        ))
+        beat_env = librosa.onset.onset_strength(
+            S=S_db, sr=self.sr, n_fft=self.n_fft, hop_length=self.hop_length, aggregate=np.median
+        )
+        onset_env = librosa.onset.onset_strength(
+            S=S_db, sr=self.sr, n_fft=self.n_fft, hop_length=self.hop_length
+        )
+        del S_db
+        self.stage_times['envelope'] = time.perf_counter() - start
+        
+        self.detect_beats_and_onsets(beat_env, onset_env)
+    
+    def analyze_streaming(self):
+        """
+        블록 단위 디코딩으로 분석 (메모리 사용량 제한)
+        
+        전체 PCM 대신 온셋 강도 엔벨로프(프레임당 float 2개)만 누적하고,
+        비트/온셋 검출은 그 엔벨로프로 수행한다. 오디오 버퍼는
+        stream_memory_mb 이내로 유지된다.
+        
+        허용 오차: 엔벨로프는 analyze_full 내부 계산과 float32 반올림
+        수준(1e-4 이하)으로 같으며, beat_times/onset_times는 프레임 단위로
+        일치한다. 반올림 차이로 피크가 바뀌는 경우에도 오차는
+        1 프레임(hop_length / analysis_sr ≈ 23ms) 이내다.
+        """
+        self.report_progress('decode')
+        print("  - 스트리밍 분석 중...")
+        start = time.perf_counter()
+        beat_env, onset_env, n_samples = self.stream_onset_envelope()
+        # 디코딩과 엔벨로프 계산이 블록 단위로 섞여 있으므로 함께 측정
+        self.stage_times['decode+envelope'] = time.perf_counter() - start
+        self.y = None
+        self.sr = self.analysis_sr
+        self.duration = n_samples / self.analysis_sr
+        print(f"  ✓ 디코딩 완료: {self.duration:.2f}초, 샘플링 레이트: {self.sr}Hz")
+        
+        self.detect_beats_and_onsets(beat_env, onset_env)
+    
+    def detect_beats_and_onsets(self, beat_env, onset_env):
+        """
+        미리 계산한 온셋 강도 엔벨로프로 BPM/비트/온셋 검출
+        
+        Args:
+            beat_env: 비트 추적용 엔벨로프 (멜 밴드 중앙값 집계)
+            onset_env: 온셋 검출용 엔벨로프 (멜 밴드 평균 집계)
+        """
+        if self.keep_envelopes:
+            self.beat_envelope = beat_env
+            self.onset_envelope = onset_env
+        
+        # BPM 추출
+        self.report_progress('beat')
+        print("  - BPM 분석 중...")
+        start = time.perf_counter()
+        tempo, beat_frames = librosa.beat.beat_track(
+            onset_envelope=beat_env, sr=self.sr, hop_length=self.hop_length
+        )
+        self.tempo = float(np.atleast_1d(tempo)[0])
+        self.beat_times = librosa.frames_to_time(beat_frames, sr=self.sr, hop_length=self.hop_length)
+        self.stage_times['beat'] = time.perf_counter() - start
+        print(f"  ✓ BPM: {self.tempo:.1f}, 비트 수: {len(self.beat_times)}")
+        
+        # 온셋(타격 지점) 감지
+        self.report_progress('onset')
+        print("  - 온셋 분석 중...")
+        start = time.perf_counter()
+        onset_frames = librosa.onset.onset_detect(
+            onset_envelope=onset_env,
+            sr=self.sr,
+            hop_length=self.hop_length,
+            backtrack=True,
+            units='frames'
+        )
+        self.onset_times = librosa.frames_to_time(onset_frames, sr=self.sr, hop_length=self.hop_length)
+        self.stage_times['onset'] = time.perf_counter() - start
+        print(f"  온셋 수: {len(self.onset_times)}")
+        
+        timing = ', '.join(f"{stage} {seconds:.2f}초" for stage, seconds in self.stage_times.items())
+        print(f"  단계별 시간: {timing}")
+    
+    def get_stream_block_length(self, channels):
+        """메모리 상한에 맞는 librosa.stream 블록 길이 계산"""
+        # 블록 프레임 1개당 사용량 추정 (float32, 리샘플 없이 최악의 경우):
+        #   디코딩 버퍼 n_fft * channels + 모노 변환/리샘플/대기 버퍼 3 * n_fft
+        #   + STFT 프레임 (n_fft / hop_length)개 각각의 창 적용 복사본 n_fft
+        #     및 스펙트럼 (n_fft // 2 + 1) * (FFT 작업 버퍼 complex128 + 결과 complex64
+        #     + 크기 + 파워 + 멜 변환 여유분)
+        n_fft = self.n_fft
+        frames_per_block = n_fft // self.hop_length
+        bytes_per_block = 4 * n_fft * (channels + 3)
+        bytes_per_block += frames_per_block * (4 * n_fft + (n_fft // 2 + 1) * 48)
+        budget = int(self.stream_memory_mb * 1024 * 1024)
+        return max(1, budget // bytes_per_block)
+    
+    def stream_onset_envelope(self):
+        """
+        오디오를 블록 단위로 디코딩/리샘플하며 온셋 강도 엔벨로프 계산
+        
+        librosa.onset.onset_strength(y=..., sr=analysis_sr)와 같은 방식
+        (center=True STFT, 멜 밴드, power_to_db(top_db=80), lag=1)
+        beat_track은 멜 밴드 중앙값, onset_detect는 평균으로 집계하므로 둘 다 계산한다.
+        
+        top_db 클리핑은 곡 전체 최대값 기준이므로, 최대값이 갱신되기 전의
+        블록들은 확정된 최대값으로 한 번 더 계산한다 (앞부분만 재디코딩).
+        
+        Returns:
+            tuple: (비트용 엔벨로프(중앙값), 온셋용 엔벨로프(평균), 리샘플된 총 샘플 수)
+        """
+        diffs, n_frames, n_samples, max_db, raise_frame = self.stream_envelope_pass()
+        
+        if raise_frame > 0:
+            # raise_frame 이전 프레임은 더 낮은 최대값으로 클리핑됨 - 다시 계산
+            head, _, _, _, _ = self.stream_envelope_pass(max_db=max_db, stop_frame=raise_frame)
+            diffs[:, :raise_frame] = head[:, :raise_frame]
+        
+        # onset_strength와 동일하게 lag + n_fft // (2 * hop_length) 만큼 앞쪽 패딩 후 길이 맞춤
+        pad_width = 1 + self.n_fft // (2 * self.hop_length)
+        envelopes = np.pad(diffs, [(0, 0), (pad_width, 0)])[:, :n_frames]
+        return envelopes[0], envelopes[1], n_samples
+    
+    def stream_envelope_pass(self, max_db=None, stop_frame=None):
+        """
+        스트리밍 엔벨로프 계산 1회 수행
+        
+        Args:
+            max_db: top_db 클리핑 기준 최대값 (None이면 누적 최대값 사용)
+            stop_frame: 이 프레임 수만큼 차분을 얻으면 중단 (None이면 끝까지)
+            
+        Returns:
+            tuple: (프레임 차분 배열 [중앙값, 평균], 총 프레임 수, 리샘플된 총 샘플 수,
+                    최대 dB, 마지막으로 최대값이 갱신된 블록의 시작 프레임)
+        """
+        import soundfile as sf
+        import soxr
+        
+        sr, n_fft, hop_length = self.analysis_sr, self.n_fft, self.hop_length
+        info = sf.info(self.music_path)
+        orig_sr = info.samplerate
+        block_length = self.get_stream_block_length(info.channels)
+        
+        resampler = None
+        if orig_sr != sr:
+            # res_type 'soxr_hq' -> soxr 품질 'HQ'
+            quality = self.res_type.replace('soxr_', '').upper()
+            resampler = soxr.ResampleStream(orig_sr, sr, 1, dtype='float32', quality=quality)
+        
+        mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=self.n_mels)
+        window = librosa.filters.get_window('hann', n_fft, fftbins=True).astype(np.float32)
+        
+        state = {
+            'prev_db': None,  # 블록 경계를 넘는 lag=1 차분용 이전 프레임
+            'max_db': -np.inf if max_db is None else max_db,
+            'raise_frame': 0,
+            'n_frames': 0,
+        }
+        diff_parts = []
+        
+        def consume(pending):
+            if len(pending) < n_fft:
+                return pending
+            count = 1 + (len(pending) - n_fft) // hop_length
+            frames = librosa.util.frame(pending[:n_fft + (count - 1) * hop_length],
+                                        frame_length=n_fft, hop_length=hop_length, axis=0)
+            power = np.abs(np.fft.rfft(frames * window, axis=-1))
+            power **= 2
+            mel = np.einsum("tf,mf->mt", power, mel_basis, optimize=True)
+            mel_db = 10.0 * np.log10(np.maximum(1e-10, mel))
+            
+            if max_db is None and mel_db.max() > state['max_db']:
+                state['max_db'] = float(mel_db.max())
+                state['raise_frame'] = state['n_frames']
+            mel_db = np.maximum(mel_db, state['max_db'] - 80.0)
+            
+            if state['prev_db'] is not None:
+                mel_db_ref = np.concatenate([state['prev_db'], mel_db], axis=1)
+            else:
+                mel_db_ref = mel_db
+            if mel_db_ref.shape[1] > 1:
+                diff = np.maximum(0.0, mel_db_ref[:, 1:] - mel_db_ref[:, :-1])
+                diff_parts.append(np.stack([np.median(diff, axis=0), diff.mean(axis=0)]).astype(np.float32))
+            state['prev_db'] = mel_db[:, -1:]
+            state['n_frames'] += count
+            return pending[count * hop_length:]
+        
+        # center=True STFT와 동일하게 앞쪽에 n_fft // 2 만큼 0 패딩
+        pending = np.zeros(n_fft // 2, dtype=np.float32)
+        n_in = 0
+        
+        stream = librosa.stream(
+            self.music_path,
+            block_length=block_length,
+            frame_length=n_fft,
+            hop_length=n_fft,
+            mono=True,
+            fill_value=None,
+        )
+        for block in stream:
+            n_in += len(block)
+            if resampler is not None:
+                block = resampler.resample_chunk(block)
+            pending = consume(np.concatenate([pending, block]))
+            if stop_frame is not None and state['n_frames'] > stop_frame:
+                return np.concatenate(diff_parts, axis=1), state['n_frames'], 0, state['max_db'], 0
+        
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            pending = np.concatenate([pending, tail])
+        
+        # librosa.resample과 동일한 출력 길이로 맞춤
+        n_samples = int(np.ceil(n_in * sr / orig_sr))
+        produced = state['n_frames'] * hop_length + len(pending) - n_fft // 2
+        if produced > n_samples:
+            pending = pending[:len(pending) - (produced - n_samples)]
+        elif produced < n_samples:
+            pending = np.concatenate([pending, np.zeros(n_samples - produced, dtype=np.float32)])
+        
+        # 뒤쪽 n_fft // 2 패딩 후 남은 프레임 처리
+        consume(np.concatenate([pending, np.zeros(n_fft // 2, dtype=np.float32)]))
+        
+        diffs = np.concatenate(diff_parts, axis=1) if diff_parts else np.zeros((2, 0), dtype=np.float32)
+        return diffs, state['n_frames'], n_samples, state['max_db'], state['raise_frame']
+    
+    def get_chart_cache_file(self, difficulty, start_delay):
+        """채보 캐시 파일 경로 (내용 해시, 난이도, 시작 지연, 생성기 버전 기반)"""
+        delay_ms = int(round(start_delay * 1000))
+        filename = (f"{self.get_cache_key()}_{difficulty}_{delay_ms}ms"
+                    f"_v{CHART_GENERATOR_VERSION}{analysis_cache.CHART_EXT}")
+        return os.path.join(self.cache_dir, analysis_cache.CHART_DIR, filename)
+    
+    def load_chart_from_cache(self, difficulty, start_delay):
+        """채보 캐시에서 노트 리스트 로드 (없으면 None)"""
+        chart_file = self.get_chart_cache_file(difficulty, start_delay)
+        if not os.path.exists(chart_file):
+            return None
+        
+        try:
+            chart, tempo, duration = analysis_cache.read_chart(chart_file, CHART_GENERATOR_VERSION)
+            self.tempo = tempo
+            self.duration = duration
+            print(f"✓채보 캠시 로드: {os.path.basename(chart_file)} ({len(chart)}개 노트)")
+            return chart
+        except Exception as e:
+            print(f"채보 캠시 로드 실패: {e}")
+            return None
+    
+    def save_chart_to_cache(self, difficulty, start_delay, chart):
+        """생성된 채보를 캠시에 저장"""
+        chart_file = self.get_chart_cache_file(difficulty, start_delay)
+        try:
+            analysis_cache.write_chart(chart_file, CHART_GENERATOR_VERSION, start_delay,
+                                       self.tempo, self.duration, chart)
+            return True
+        except Exception as e:
+            print(f"채보 캠시 저장 실패: {e}")
+            return False
+    
+    def get_chart(self, difficulty='normal', start_delay=2.0):
+        """
+        채보 반환 - 채보 캠시가 있으면 분석/생성 없이 바로 사용
+        
+        Returns:
+            list: 노트 리스트, 음악 파일이 없거나 분석에 실패하면 None
+        """
+        if not os.path.exists(self.music_path):
+            print(f"음악 파일을 찾을 수 없음: {self.music_path}")
+            return None
+        
+        chart = self.load_chart_from_cache(difficulty, start_delay)
+        if chart is not None:
+            return chart
+        
+        if not self.load_and_analyze():
+            return None
+        self.report_progress('chart')
+        chart = self.generate_chart(difficulty, start_delay)
+        self.save_chart_to_cache(difficulty, start_delay, chart)
+        return chart
+    
+    def get_nearest_beat_distance(self):
+        """각 온셋에서 가장 가까운 비트까지의 거리 (난이도 간 공유, 한 번만 계산)"""
+        if self.beat_distance is None:
+            self.beat_distance = nearest_beat_distance(self.onset_times, self.beat_times)
+        return self.beat_distance
+    
     def generate_chart(self, difficulty='normal', start_delay=2.0):
         """
         리듬 게임 채보 생성
@@ -166,141 +645,39 @@ class MusicAnalyzer:
             start_delay: 게임 시작 전 대기 시간 (초)
             
         Returns:
-            list: 노트 타이밍 리스트 (초 단위)
+            list: 노트 리스트 [{'time': float, 'type': str, 'duration': float}, ...]
         """
         if not self.is_loaded:
             print("음악이 로드되지 않음. load_and_analyze()를 먼저 호출하세요.")
             return []
         
-        chart = []
+        times, is_long, durations = chart_arrays(
+            self.beat_times, self.onset_times, difficulty, start_delay,
+            beat_distance=self.get_nearest_beat_distance() if difficulty in ('normal', 'hard') else None
+        )
         
-        if difficulty == 'easy':
-            # Easy: 주요 비트만 사용 (2박자마다)
-            chart = [t + start_delay for i, t in enumerate(self.beat_times) if i % 2 == 0]
-            
-        elif difficulty == 'normal':
-            # Normal: 온셋 중심으로 리듬 구성 (단순 비트 제외)
-            # 온셋이 실제 악기/보컬 타이밍을 더 잘 반영함
-            
-            all_onsets = list(self.onset_times)
-            all_beats = list(self.beat_times)
-            
-            # 1. 온셋 중심 선택
-            selected_notes = []
-            
-            # 2. 비트는 선택적으로만 사용 (4박자마다 또는 강한 비트만)
-            for i, beat in enumerate(all_beats):
-                # 4박자마다만 비트 추가 (너무 반복적이지 않게)
-                if i % 4 == 0:
-                    selected_notes.append(beat)
-            
-            # 3. 온셋 중 비트와 겹치지 않는 것들 추가 (복잡한 리듬)
-            for onset in all_onsets:
-                min_beat_dist = min([abs(onset - bt) for bt in all_beats]) if all_beats else 1.0
-                # 비트에서 0.15초 이상 떨어진 온셋 (실제 악기 타이밍)
-                if min_beat_dist >= 0.15:
-                    selected_notes.append(onset)
-            
-            selected_notes = sorted(selected_notes)
-            
-            # 최소 간격 필터 (0.2초 - 더 여유있게)
-            filtered = []
-            last_time = -1
-            for t in selected_notes:
-                if last_time < 0 or t - last_time >= 0.2:
-                    filtered.append(t + start_delay)
-                    last_time = t
-            chart = filtered
-            
-        elif difficulty == 'hard':
-            # Hard: 온셋 기반 + 복잡한 리듬 패턴
-            
-            all_onsets = list(self.onset_times)
-            all_beats = list(self.beat_times)
-            
-            selected_notes = []
-            
-            # 1. 2박자마다 비트 추가 (기본 구조)
-            for i, beat in enumerate(all_beats):
-                if i % 2 == 0:
-                    selected_notes.append(beat)
-            
-            # 2. 모든 중요한 온셋 추가 (비트에서 떨어진 것들)
-            for onset in all_onsets:
-                min_beat_dist = min([abs(onset - bt) for bt in all_beats]) if all_beats else 1.0
-                # 비트에서 0.1초 이상 떨어진 온셋
-                if min_beat_dist >= 0.1:
-                    selected_notes.append(onset)
-            
-            selected_notes = sorted(selected_notes)
-            
-            # 최소 간격 (0.1초 - 빠른 리듬 허용)
-            filtered = []
-            last_time = -1
-            for t in selected_notes:
-                if last_time < 0 or t - last_time >= 0.1:
-                    filtered.append(t + start_delay)
-                    last_time = t
-            chart = filtered
-            
-        elif difficulty == 'expert':
-            # Expert: 모든 비트 + 모든 온셋 + 중간 보간 (0.1초 간격)
-            combined = list(self.beat_times) + list(self.onset_times)
-            
-            # 비트 사이에 추가 노트 생성 (비트의 1/2 지점)
-            beat_intervals = []
-            for i in range(len(self.beat_times) - 1):
-                beat_intervals.append((self.beat_times[i] + self.beat_times[i+1]) / 2)
-            
-            combined.extend(beat_intervals)
-            combined = sorted(set(combined))
-            
-            # 0.1초 이상 간격
-            filtered = []
-            last_time = -1
-            for t in combined:
-                if t - last_time >= 0.1:
-                    filtered.append(t + start_delay)
-                    last_time = t
-            chart = filtered
-            
-        else:
-            print(f"알 수 없는 난이도: {difficulty}, normal로 설정")
-            chart = [t + start_delay for t in self.beat_times]
-        
-        # 롱 노트 생성 (긴 비트 간격에 추가)
-        chart_with_type = []
-        if len(chart) > 1:
-            for i in range(len(chart)):
-                note_time = chart[i]
-                
-                # 다음 노트와의 간격이 1.5초 이상이면 롱 노트로 변환
-                if i < len(chart) - 1:
-                    interval = chart[i + 1] - note_time
-                    if interval >= 1.5 and interval <= 3.0:
-                        # 롱 노트 (간격의 70% 길이)
-                        duration = interval * 0.7
-                        chart_with_type.append({'time': note_time, 'type': 'long', 'duration': duration})
-                        continue
-                
-                # 일반 노트
-                chart_with_type.append({'time': note_time, 'type': 'normal', 'duration': 0})
-        else:
-            # 롱 노트 없이 일반 노트만
-            chart_with_type = [{'time': t, 'type': 'normal', 'duration': 0} for t in chart]
+        chart_with_type = [
+            {'time': t, 'type': 'long', 'duration': d} if long else
+            {'time': t, 'type': 'normal', 'duration': 0}
+            for t, long, d in zip(times.tolist(), is_long.tolist(), durations.tolist())
+        ]
         
-        normal_count = sum(1 for n in chart_with_type if n['type'] == 'normal')
-        long_count = sum(1 for n in chart_with_type if n['type'] == 'long')
+        long_count = int(is_long.sum())
+        normal_count = len(chart_with_type) - long_count
         print(f"채보 생성 완료: 난이도={difficulty}, 일반 노트={normal_count}개, 롱 노트={long_count}개")
         return chart_with_type
     
+    def generate_all_charts(self, start_delay=2.0, difficulties=DIFFICULTIES):
+        """모든 난이도의 채보를 한 번에 생성 (가까운 비트 거리 계산을 공유)"""
+        return {difficulty: self.generate_chart(difficulty, start_delay) for difficulty in difficulties}
+    
     def get_bpm(self):
-        """BPM 반환"""
-        return self.tempo if self.is_loaded else 120
+        """BPM 반환 (채보 캠시에서만 읽은 경우에도 사용 가능)"""
+        return self.tempo if self.tempo is not None else 120
     
     def get_duration(self):
         """음악 길이 반환 (초)"""
-        return self.duration if self.is_loaded else 0
+        return self.duration
     
     def print_info(self):
         """분석 정보 출력"""
@@ -337,5 +714,250 @@ def test_analyzer():
             print(f"{difficulty.upper()}: 첫 10개 노트 타이밍 = {chart[:10]}")
 
 
+def find_music_files(music_dir):
+    """폴더를 재귀적으로 탐색하여 음악 파일 목록 반환"""
+    music_files = []
+    for root, dirs, files in os.walk(music_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                music_files.append(os.path.join(root, name))
+    return music_files
+
+
+def analyze_track(music_path, cache_dir, streaming, profile=DEFAULT_PROFILE):
+    """
+    곡 하나를 분석하여 캠시에 저장 (워커 프로세스에서 실행)
+    
+    Returns:
+        dict: 곡 경로, 성공 여부, 소요 시간, 음악 길이, 실패 시 로그
+    """
+    import io
+    import contextlib
+    
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        analyzer = MusicAnalyzer(music_path, streaming=streaming, profile=profile)
+        analyzer.cache_dir = cache_dir
+        ok = analyzer.load_and_analyze()
+    return {
+        'path': music_path,
+        'ok': ok,
+        'seconds': time.perf_counter() - start,
+        'duration': analyzer.get_duration(),
+        'log': '' if ok else log.getvalue(),
+    }
+
+
+def chart_worker(music_path, difficulty, start_delay, cache_dir, queue):
+    """
+    채보 준비 워커 (별도 프로세스에서 실행)
+    
+    queue로 다음 메시지를 보낸다:
+        ('progress', stage)            - 분석 단계 시작
+        ('done', prepared_chart)       - 채보 준비 완료
+                                         {'chart': 노트 리스트, 'bpm': BPM, 'duration': 길이}
+        ('error', message)             - 실패
+    """
+    try:
+        analyzer = MusicAnalyzer(music_path)
+        analyzer.cache_dir = cache_dir
+        analyzer.progress_callback = lambda stage: queue.put(('progress', stage))
+        chart = analyzer.get_chart(difficulty, start_delay)
+        if chart is None:
+            queue.put(('error', f"채보 준비 실패: {music_path}"))
+        else:
+            queue.put(('done', {
+                'chart': chart,
+                'bpm': analyzer.get_bpm(),
+                'duration': analyzer.get_duration(),
+            }))
+    except Exception as e:
+        queue.put(('error', str(e)))
+
+
+def prewarm_library(music_dir, workers=None, cache_dir='charts_cache', streaming=False,
+                    profile=DEFAULT_PROFILE):
+    """
+    음악 폴더의 캠시되지 않은 곡들을 여러 프로세스로 미리 분석
+    
+    Args:
+        music_dir: 음악 폴더 (하위 폴더 포함)
+        workers: 워커 프로세스 수 (None이면 CPU 수)
+        cache_dir: 캠시 폴더
+        streaming: 스트리밍 분석 사용 여부
+        profile: 분석 프로파일
+        
+    Returns:
+        list: 곡별 결과 (analyze_track 반환값)
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    music_files = find_music_files(music_dir)
+    pending = []
+    for music_path in music_files:
+        analyzer = MusicAnalyzer(music_path, profile=profile)
+        analyzer.cache_dir = cache_dir
+        if not analyzer.is_cached():
+            pending.append(music_path)
+    
+    print(f"음악 파일 {len(music_files)}개 중 분석 대상 {len(pending)}개 (이미 캠시됨: {len(music_files) - len(pending)}개)")
+    if not pending:
+        return []
+    
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(analyze_track, path, cache_dir, streaming, profile) for path in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = '✓' if result['ok'] else '✗'
+            print(f"  {status} [{len(results)}/{len(pending)}] {os.path.basename(result['path'])}: "
+                  f"{result['seconds']:.2f}초 (음악 {result['duration']:.1f}초)")
+            if not result['ok']:
+                print(result['log'])
+    elapsed = time.perf_counter() - start
+    
+    done = [r for r in results if r['ok']]
+    audio_seconds = sum(r['duration'] for r in done)
+    print("\n" + "="*50)
+    print(f"분석 완료: {len(done)}/{len(pending)}곡, 총 {elapsed:.2f}초")
+    if elapsed > 0:
+        print(f"처리량: {len(done) / elapsed:.2f}곡/초, 음악 {audio_seconds / elapsed:.1f}초/초 "
+              f"(실시간 대비 {audio_seconds / elapsed:.1f}배)")
+    print("="*50 + "\n")
+    return results
+
+
+def time_drift(reference, times, match_window=0.05):
+    """
+    기준 시각 배열 대비 각 시각의 최근접 오차 통계
+    
+    Returns:
+        dict: 평균/중앙값/95퍼센타일/최대 오차(ms), match_window 이내로 일치하는 기준 시각 비율
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    if len(reference) == 0 or len(times) == 0:
+        return {'mean_ms': None, 'median_ms': None, 'p95_ms': None, 'max_ms': None,
+                'match_rate': 1.0 if len(reference) == len(times) else 0.0}
+    errors = nearest_beat_distance(reference, times) * 1000
+    return {
+        'mean_ms': float(errors.mean()),
+        'median_ms': float(np.median(errors)),
+        'p95_ms': float(np.percentile(errors, 95)),
+        'max_ms': float(errors.max()),
+        'match_rate': float(np.mean(errors <= match_window * 1000)),
+    }
+
+
+def profile_quality_report(music_path, profiles=tuple(ANALYSIS_PROFILES), start_delay=2.0,
+                           difficulties=('normal', 'hard')):
+    """
+    프로파일별 분석 속도와 'accurate' 대비 비트/온셋/채보 차이 비교
+    
+    캠시를 거치지 않고 매번 직접 분석한다.
+    
+    Returns:
+        dict: {'music_file', 'reference', 'profiles': {프로파일: 결과 dict}}
+    """
+    import io
+    import contextlib
+    
+    # 첫 호출의 numba JIT 컴파일 시간이 첫 프로파일에만 더해지지 않도록 미리 실행
+    warmup_env = np.random.default_rng(0).random(1000).astype(np.float32)
+    librosa.beat.beat_track(onset_envelope=warmup_env, sr=ANALYSIS_SR)
+    librosa.onset.onset_detect(onset_envelope=warmup_env, sr=ANALYSIS_SR, backtrack=True)
+    
+    results = {}
+    analyzers = {}
+    for profile in (DEFAULT_PROFILE,) + tuple(p for p in profiles if p != DEFAULT_PROFILE):
+        analyzer = MusicAnalyzer(music_path, profile=profile)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            analyzer.analyze_full()
+            elapsed = time.perf_counter() - start
+        analyzer.is_loaded = True
+        analyzers[profile] = analyzer
+        results[profile] = {
+            'seconds': elapsed,
+            'realtime_factor': analyzer.duration / elapsed if elapsed > 0 else None,
+            'stage_times': dict(analyzer.stage_times),
+            'tempo': analyzer.tempo,
+            'n_beats': len(analyzer.beat_times),
+            'n_onsets': len(analyzer.onset_times),
+        }
+    
+    reference = analyzers[DEFAULT_PROFILE]
+    reference_charts = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for difficulty in difficulties:
+            reference_charts[difficulty] = [n['time'] for n in reference.generate_chart(difficulty, start_delay)]
+    
+    for profile, analyzer in analyzers.items():
+        result = results[profile]
+        result['tempo_diff'] = analyzer.tempo - reference.tempo
+        result['beat_drift'] = time_drift(reference.beat_times, analyzer.beat_times)
+        result['onset_drift'] = time_drift(reference.onset_times, analyzer.onset_times)
+        result['chart_match'] = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for difficulty in difficulties:
+                chart = [n['time'] for n in analyzer.generate_chart(difficulty, start_delay)]
+                result['chart_match'][difficulty] = time_drift(reference_charts[difficulty], chart)['match_rate']
+    
+    return {'music_file': os.path.basename(music_path), 'reference': DEFAULT_PROFILE,
+            'profiles': {p: results[p] for p in profiles if p in results}}
+
+
+def print_quality_report(report):
+    """profile_quality_report 결과를 표로 출력"""
+    print(f"\n분석 프로파일 비교: {report['music_file']} (기준: {report['reference']})")
+    print("=" * 100)
+    print(f"{'프로파일':10} | {'시간':>7} | {'실시간 배수':>9} | {'BPM 차이':>8} | "
+          f"{'비트 오차 평균/p95':>18} | {'온셋 일치율':>9} | 채보 일치율")
+    print("-" * 100)
+    for profile, r in report['profiles'].items():
+        beat = r['beat_drift']
+        beat_text = '-' if beat['mean_ms'] is None else f"{beat['mean_ms']:.1f}/{beat['p95_ms']:.1f}ms"
+        charts = ', '.join(f"{d} {rate * 100:.0f}%" for d, rate in r['chart_match'].items())
+        print(f"{profile:10} | {r['seconds']:6.2f}초 | {r['realtime_factor']:8.1f}x | "
+              f"{r['tempo_diff']:+8.2f} | {beat_text:>18} | "
+              f"{r['onset_drift']['match_rate'] * 100:8.1f}% | {charts}")
+    print("=" * 100)
+
+
+def main():
+    """명령줄 진입점"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='음악 분석 / 채보 캠시 미리 생성')
+    parser.add_argument('--prewarm', metavar='MUSIC_DIR',
+                        help='폴더의 모든 곡을 미리 분석하여 캠시에 저장')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='워커 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--cache-dir', default='charts_cache', help='캠시 폴더')
+    parser.add_argument('--streaming', action='store_true', help='스트리밍 분석 사용')
+    parser.add_argument('--profile', choices=list(ANALYSIS_PROFILES), default=DEFAULT_PROFILE,
+                        help=f'분석 프로파일 (기본값: {DEFAULT_PROFILE})')
+    parser.add_argument('--quality-report', metavar='MUSIC_FILE',
+                        help='곡 하나를 모든 프로파일로 분석하여 속도/정확도 비교')
+    parser.add_argument('--json', metavar='OUTPUT', help='품질 비교 결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+    
+    if args.quality_report:
+        report = profile_quality_report(args.quality_report)
+        print_quality_report(report)
+        if args.json:
+            import json
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+    elif args.prewarm:
+        prewarm_library(args.prewarm, args.workers, args.cache_dir, args.streaming, args.profile)
+    else:
+        test_analyzer()
+
+
 if __name__ == '__main__':
-    test_analyzer()
+    main()
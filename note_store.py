@@ -0,0 +1,355 @@
+"""
+노트 저장소 - 채보 전체의 노트 상태를 NumPy 열(column)로 보관하고 활성 노트를 한 번에 갱신
+
+노트 하나마다 파이썬 객체를 두는 대신 열마다 배열 하나를 두고,
+매 프레임 활성 노트 구간에 대해 위치 계산 / 패링 비행 / Miss 판정을 벡터 연산으로 처리한다.
+pico2d에 의존하지 않으므로 그리기 없이도 사용할 수 있다.
+"""
+import numpy as np
+
+NOTE_NORMAL = 0
+NOTE_LONG = 1
+NOTE_TYPES = ('normal', 'long')
+
+# 판정 코드 (judgment 열에 저장)
+JUDGMENTS = (None, 'perfect', 'good', 'bad', 'miss')
+JUDGMENT_CODES = {judgment: code for code, judgment in enumerate(JUDGMENTS)}
+
+# 노트 이동 (화면 오른쪽에서 판정선 쪽으로)
+SPAWN_X = 1080  # 나타나는 위치
+NOTE_Y = 130
+TARGET_X = 120  # 플레이어 위치 (판정선)
+APPROACH_TIME = 2.0  # 판정 시각 몇 초 전에 나타나는지
+APPROACH_DISTANCE = 1800  # APPROACH_TIME 동안 이동하는 거리
+MISS_X = 26  # 플레이어 패리 범위의 왼쪽 경계 - 이보다 왼쪽으로 가면 Miss
+
+# 패링된 노트 (반대 방향으로 날아감)
+PARRY_SPEED = 1800
+PARRY_EXIT_X = 1200  # 화면 밖 - 이보다 오른쪽이면 제거 대상
+
+# 노트 크기 (화살표 이미지 289x80을 0.25배로 그림, 충돌 박스도 같은 크기)
+ARROW_WIDTH = 289
+ARROW_HEIGHT = 80
+NOTE_SCALE = 0.25
+NOTE_WIDTH = int(ARROW_WIDTH * NOTE_SCALE)
+NOTE_HEIGHT = int(ARROW_HEIGHT * NOTE_SCALE)
+
+EMPTY_INDEX = np.zeros(0, dtype=np.intp)  # 갱신 결과가 없을 때 반환하는 빈 인덱스 배열
+
+
+class NoteStore:
+    """
+    채보의 모든 노트 상태 (인덱스는 시간순)
+
+    노트는 시간순으로 나타나므로 활성 노트는 항상 [start, stop) 구간 안에 있다.
+    앞쪽 끝(start)은 처리가 끝난 노트를 지나 앞으로만 움직이고,
+    뒤쪽 끝(stop)은 새로 나타나는 노트만큼 늘어나는 슬라이딩 윈도우(링 버퍼)로 다룬다.
+    """
+
+    # 열 이름, 자료형, 초기값 (채보에서 읽는 열은 초기값 None)
+    COLUMNS = (
+        ('beat_time', np.float64, None),  # 언제 쳐야 하는지
+        ('note_type', np.int8, None),  # NOTE_NORMAL / NOTE_LONG
+        ('duration', np.float64, None),  # 롱 노트 지속 시간
+        ('x', np.float64, SPAWN_X),
+        ('is_hit', np.bool_, False),  # 처리 끝남 (Miss, 패링 후 화면 밖, 홀딩 완료/실패)
+        ('is_parried', np.bool_, False),
+        ('judgment', np.int8, 0),  # JUDGMENTS 코드
+        # 롱 노트 상태
+        ('is_holding', np.bool_, False),
+        ('hold_start_time', np.float64, 0.0),
+        ('hold_completed', np.bool_, False),
+    )
+
+    def __init__(self, chart_data):
+        """
+        Args:
+            chart_data: 노트 리스트 - {'time', 'type', 'duration'} dict 또는 시간(float)
+        """
+        self.capacity = 0
+        self.buffers = {}
+        self.reset(chart_data)
+
+    def reset(self, chart_data):
+        """
+        새 채보로 다시 채움 - 용량이 충분하면 기존 배열을 그대로 재사용
+
+        각 열은 용량만큼 할당된 버퍼의 앞쪽 len(chart_data)개 뷰다.
+        """
+        n = len(chart_data)
+        if n > self.capacity or not self.buffers:
+            self.buffers = {name: np.empty(n, dtype=dtype) for name, dtype, _ in self.COLUMNS}
+            self.capacity = n
+        for name, _, initial in self.COLUMNS:
+            column = self.buffers[name][:n]
+            if initial is not None:
+                column.fill(initial)
+            setattr(self, name, column)
+
+        if n and isinstance(chart_data[0], dict):
+            # 새로운 형식: {'time': float, 'type': str, 'duration': float}
+            self.beat_time[:] = [note_data['time'] for note_data in chart_data]
+            self.note_type[:] = [NOTE_LONG if note_data.get('type', 'normal') == 'long' else NOTE_NORMAL
+                                 for note_data in chart_data]
+            self.duration[:] = [note_data.get('duration', 0) for note_data in chart_data]
+        else:
+            # 이전 형식: float (시간만)
+            self.beat_time[:] = chart_data
+            self.note_type.fill(NOTE_NORMAL)
+            self.duration.fill(0)
+
+        # 스폰 커서가 앞에서부터 순서대로 진행하도록 시간순 정렬 (같은 시간은 채보 순서 유지)
+        # 생성된 채보는 이미 정렬되어 있으므로 확인만 하고 넘어감
+        if n > 1 and np.any(self.beat_time[1:] < self.beat_time[:-1]):
+            order = np.argsort(self.beat_time, kind='stable')
+            self.beat_time[:] = self.beat_time[order]
+            self.note_type[:] = self.note_type[order]
+            self.duration[:] = self.duration[order]
+
+    def __len__(self):
+        return len(self.beat_time)
+
+    def count(self, note_type):
+        return int(np.count_nonzero(self.note_type == note_type))
+
+    def spawn_until(self, cursor, current_time):
+        """
+        current_time에 나타나야 하는 노트까지 커서 이동 (판정 시각 APPROACH_TIME초 전에 나타남)
+
+        Returns:
+            int: 새 커서 (이 인덱스 전까지 모두 나타남)
+        """
+        beat_time = self.beat_time
+        n = len(beat_time)
+        while cursor < n and current_time >= beat_time[cursor] - APPROACH_TIME:
+            cursor += 1
+        return cursor
+
+    def first_alive(self, start, stop):
+        """
+        start부터 처리 끝난 노트를 건너뛴 첫 인덱스 (활성 구간의 새 시작)
+
+        홀딩이 완료된 롱 노트는 릴리즈될 때까지 구간에 남긴다 (release_hold가 찾을 수 있도록).
+        """
+        is_hit = self.is_hit
+        is_holding = self.is_holding
+        while start < stop and is_hit[start] and not is_holding[start]:
+            start += 1
+        return start
+
+    def alive(self, start, stop):
+        """활성 구간 [start, stop)에서 처리가 끝나지 않은 노트 인덱스"""
+        return np.flatnonzero(~self.is_hit[start:stop]) + start
+
+    def find_hittable(self, start, stop, current_time, left, right):
+        """
+        활성 구간에서 x 범위 [left, right](플레이어 충돌 박스)와 겹치는 가장 이른 노트
+
+        다가오는 노트의 위치는 판정 시각까지 남은 시간의 단조 함수이므로,
+        겹칠 수 있는 노트의 beat_time 범위를 이진 탐색으로 구한 뒤 그 안에서만 실제 위치를 확인한다.
+        판정선에 고정된 노트(홀딩 중이거나 판정 시각이 지난 노트)는 TARGET_X에 있다.
+
+        Args:
+            current_time: 마지막 update의 곡 시간 (노트 위치가 계산된 시각)
+
+        Returns:
+            int: 노트 인덱스, 겹치는 노트가 없으면 None
+        """
+        half_w = NOTE_WIDTH // 2
+        # 경계에서 부동소수점 오차로 후보를 놓치지 않도록 약간 넓게 잡고, 실제 겹침은 아래에서 확인
+        margin = 1e-6
+        if left - half_w < TARGET_X < right + half_w:
+            lo = start
+        else:
+            lo = int(np.searchsorted(self.beat_time, current_time + time_to_beat_at(left - half_w) - margin))
+        hi = int(np.searchsorted(self.beat_time, current_time + time_to_beat_at(right + half_w) + margin,
+                                 side='right'))
+        lo, hi = max(lo, start), min(hi, stop)
+        if lo >= hi:
+            return None
+
+        window = slice(lo, hi)
+        x = self.x[window]
+        overlap = (~self.is_hit[window] & ~self.is_parried[window] &
+                   (left < x + half_w) & (right > x - half_w))
+        if not overlap.any():
+            return None
+        return lo + int(np.argmax(overlap))
+
+    def update(self, start, stop, dt, current_time, miss_window):
+        """
+        활성 구간 [start, stop)의 노트 갱신 (RhythmNote.update + Miss 판정을 한 번에 적용)
+
+        처리가 끝난 노트(is_hit)는 구간 안에 남아 있어도 건드리지 않는다.
+
+        Args:
+            start, stop: 활성 구간
+            dt: 프레임 시간
+            current_time: 현재 곡 시간
+            miss_window: 판정 시각이 이만큼 지나면 Miss
+
+        Returns:
+            tuple: (이번 프레임에 홀딩이 완료된 노트 인덱스, Miss 처리된 노트 인덱스)
+        """
+        window = slice(start, stop)
+        alive = ~self.is_hit[window]
+        x = self.x[window]  # 뷰 - 아래 대입은 self.x에 바로 반영됨
+        parried = alive & self.is_parried[window]
+        holding = alive & self.is_holding[window] & ~parried
+        moving = alive & ~(parried | holding)
+
+        # 패링된 화살표는 오른쪽으로 날아가고, 화면 밖으로 나가면 처리 끝
+        # (대부분의 프레임에는 패링/홀딩 중인 노트가 없으므로 해당 계산을 건너뜀)
+        if parried.any():
+            x[parried] += PARRY_SPEED * dt
+            self.is_hit[start:stop][parried & (x > PARRY_EXIT_X)] = True
+
+        # 롱 노트 홀딩 중 - 판정선에 고정, 지속 시간이 지나면 완료
+        if holding.any():
+            x[holding] = TARGET_X
+            completed = holding & (current_time - self.hold_start_time[window] >= self.duration[window])
+            completed_idx = np.flatnonzero(completed) + start
+            self.is_hit[completed_idx] = True
+            self.judgment[completed_idx] = JUDGMENT_CODES['perfect']
+            self.hold_completed[completed_idx] = True
+        else:
+            completed_idx = EMPTY_INDEX
+
+        # 노트가 목표 지점으로 이동
+        time_to_beat = self.beat_time[window] - current_time
+        approaching = moving & (time_to_beat > 0)
+        progress = np.maximum(0, (APPROACH_TIME - time_to_beat[approaching]) / APPROACH_TIME)
+        x[approaching] = SPAWN_X - (APPROACH_DISTANCE * progress)
+        x[moving & ~approaching] = TARGET_X
+
+        # 놓친 노트 (패링/홀딩되지 않은 노트만): 패리 범위를 지나쳤거나 판정 시각이 지남
+        missed = moving & ((x < MISS_X) | (-time_to_beat > miss_window))
+        if missed.any():
+            missed_idx = np.flatnonzero(missed) + start
+            self.is_hit[missed_idx] = True
+            self.judgment[missed_idx] = JUDGMENT_CODES['miss']
+        else:
+            missed_idx = EMPTY_INDEX
+
+        return completed_idx, missed_idx
+
+
+def time_to_beat_at(x):
+    """
+    다가오는 노트가 위치 x에 있을 때 판정 시각까지 남은 시간 (NoteStore.update 이동 공식의 역함수)
+
+    x가 SPAWN_X 이상이면 inf (나타난 직후 위치에 머무는 노트는 시간으로 구분할 수 없음)
+    """
+    if x >= SPAWN_X:
+        return float('inf')
+    return APPROACH_TIME - (SPAWN_X - x) * APPROACH_TIME / APPROACH_DISTANCE
+
+
+class NotePool:
+    """
+    플레이 사이에 재사용하는 NoteStore 모음
+
+    재시작이나 다음 곡에서 노트 배열을 새로 할당하지 않고 반납된 저장소를 다시 채운다.
+    """
+
+    def __init__(self, max_free=2):
+        self.max_free = max_free  # 보관할 반납 저장소 수
+        self.free = []
+        self.allocated = 0  # 새로 만든 저장소 수
+        self.reused = 0  # 반납된 저장소를 다시 쓴 횟수
+
+    def acquire(self, chart_data):
+        """채보를 담은 NoteStore 반환 (용량이 맞는 반납 저장소 중 가장 작은 것 우선)"""
+        n = len(chart_data)
+        fits = [store for store in self.free if store.capacity >= n]
+        if fits:
+            store = min(fits, key=lambda s: s.capacity)
+            self.free.remove(store)
+            store.reset(chart_data)
+            self.reused += 1
+            return store
+        self.allocated += 1
+        return NoteStore(chart_data)
+
+    def release(self, store):
+        """다 쓴 저장소 반납 (반납한 뒤에는 사용하지 않아야 함)"""
+        if store.capacity == 0 or any(s is store for s in self.free):
+            return
+        self.free.append(store)
+        if len(self.free) > self.max_free:
+            # 가장 작은 저장소부터 버림
+            self.free.remove(min(self.free, key=lambda s: s.capacity))
+
+
+# RhythmManager들이 함께 쓰는 풀
+NOTE_POOL = NotePool()
+
+
+class NoteColumn:
+    """NoteView 속성 -> NoteStore 열의 해당 인덱스 값"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, note, owner=None):
+        if note is None:
+            return self
+        return getattr(note.store, self.name)[note.index].item()
+
+    def __set__(self, note, value):
+        getattr(note.store, self.name)[note.index] = value
+
+
+class NoteView:
+    """
+    NoteStore의 노트 하나를 기존 RhythmNote처럼 속성으로 다루기 위한 뷰
+
+    상태는 모두 NoteStore 배열에 있고, 뷰는 (저장소, 인덱스)만 가진다.
+    __slots__로 인스턴스 __dict__를 없애고, 모든 노트에 공통인 값은 클래스 속성으로 둔다.
+    """
+    __slots__ = ('store', 'index')
+
+    beat_time = NoteColumn()
+    duration = NoteColumn()
+    x = NoteColumn()
+    is_hit = NoteColumn()
+    is_parried = NoteColumn()
+    is_holding = NoteColumn()
+    hold_start_time = NoteColumn()
+    hold_completed = NoteColumn()
+
+    # 모든 노트에 공통인 값
+    y = NOTE_Y
+    target_x = TARGET_X
+    parry_speed = PARRY_SPEED
+    collision_width = NOTE_WIDTH
+    collision_height = NOTE_HEIGHT
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def note_type(self):
+        return NOTE_TYPES[self.store.note_type[self.index]]
+
+    @property
+    def judgment(self):
+        return JUDGMENTS[self.store.judgment[self.index]]
+
+    @judgment.setter
+    def judgment(self, value):
+        self.store.judgment[self.index] = JUDGMENT_CODES[value]
+
+    def get_collision_box(self):
+        half_w = self.collision_width // 2
+        half_h = self.collision_height // 2
+        return (
+            self.x - half_w,
+            self.y - half_h,
+            self.x + half_w,
+            self.y + half_h
+        )
+
+    def parry(self):
+        self.is_parried = True
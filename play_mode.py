@@ -1,12 +1,22 @@
 from pico2d import *
+import time
 import game_framework
 from player import Player
-from building import RhythmManager
+from building import RhythmManager, MUSIC_START_DELAY
+from replay import ReplayRecorder, write_replay, replay_filename, KEY_DOWN, KEY_UP
 from background import Background
 from ui import HPBar
+from asset_manager import ASSETS
+from sprite_loader import SPRITES
+
+# 플레이어 시트 미리 디코드 힌트 (처음 쓰기 전에 백그라운드에서 디코드)
+PREFETCH_FIRST = ['player_run', 'player_parry_sky', 'parry_sky_effect', 'counter_effect']  # 첫 프레임 / 첫 패링
+PREFETCH_LATER = ['player_hurt_2', 'player_parry', 'accurate']  # 피격 / 롱 노트 홀딩
+DIE_PREFETCH_HP = 3  # HP가 이 이하로 떨어지면 사망 시트 준비
 
 class PlayMode:
-    def __init__(self, music_path='music/M2U.mp3', difficulty='normal'):
+    def __init__(self, music_path='music/M2U.mp3', difficulty='normal', prepared_chart=None,
+                 now=time.perf_counter, headless=False, record=True):
         self.player = None
         self.rhythm_manager = None
         self.background = None
@@ -18,26 +28,74 @@ class PlayMode:
         # 음악과 난이도 저장
         self.music_path = music_path
         self.difficulty = difficulty
+        self.prepared_chart = prepared_chart  # LoadingMode에서 준비한 채보
+        # 시뮬레이션용: 시계 주입, headless면 창/이미지/음악 없이 판정과 상태 머신만 실행
+        self.now = now
+        self.headless = headless
+        # 리플레이 기록 (종료 시 replays/에 저장)
+        self.record = record
+        self.recorder = None
         
     def enter(self):
-        self.player = Player()
+        self.enter_time = time.perf_counter()
+        self.first_frame_ms = None
+        self.die_prefetched = False
+        self.player = Player(clock=self.now, headless=self.headless)
+        self.player.prefetch(PREFETCH_FIRST)
         # 선택된 음악과 난이도로 리듬 매니저 초기화
-        self.rhythm_manager = RhythmManager(music_path=self.music_path, difficulty=self.difficulty)
-        self.background = Background(scroll_speed=500)
-        self.hp_bar = HPBar()
+        self.rhythm_manager = RhythmManager(music_path=self.music_path, difficulty=self.difficulty,
+                                            prepared_chart=self.prepared_chart,
+                                            now=self.now, headless=self.headless)
+        if self.headless:
+            self.background = None
+            self.hp_bar = None
+        else:
+            self.background = Background(scroll_speed=500)
+            self.hp_bar = HPBar()
         self.game_over = False
         self.victory = False
         self.die_animation_finished = False
         
+        if self.record:
+            self.recorder = ReplayRecorder(self.music_path, self.difficulty, MUSIC_START_DELAY)
+        
         # Miss 콜백 설정
         self.rhythm_manager.on_miss_callback = self.player.take_damage
         # Player 참조 전달 (홀딩 완료 시 상태 전환용)
         self.rhythm_manager.player_ref = self.player
+        self.player.prefetch(PREFETCH_LATER)
         
     def exit(self):
-        # 음악 정지
+        self.save_replay()
+        # 음악 정지 및 노트 배열 반납
         if hasattr(self, 'rhythm_manager') and self.rhythm_manager:
-            self.rhythm_manager.stop_music()
+            self.rhythm_manager.release()
+        self.release_assets()
+        if not self.headless:
+            ASSETS.print_stats()
+        
+    def release_assets(self):
+        """플레이어/배경/HP 바 텍스처 반납 (ASSETS 캐시에는 남음)"""
+        if self.player:
+            self.player.release()
+        if self.background:
+            self.background.release()
+        if getattr(self, 'hp_bar', None):
+            self.hp_bar.release()
+        
+    def save_replay(self):
+        """기록한 플레이를 리플레이 파일로 저장 (한 번만)"""
+        if self.recorder is None or not self.recorder.frame_times:
+            return
+        recorder, self.recorder = self.recorder, None
+        rhythm = self.rhythm_manager
+        replay = recorder.to_replay(rhythm.chart_data, rhythm.score, rhythm.max_combo, self.player.hp)
+        path = replay_filename(self.music_path, self.difficulty)
+        try:
+            write_replay(path, replay)
+            print(f"리플레이 저장: {path}")
+        except OSError as e:
+            print(f"리플레이 저장 실패: {e}")
         
     def pause(self):
         pass
@@ -46,6 +104,15 @@ class PlayMode:
         pass
     
     def handle_event(self, event):
+        # 끝난 뒤(승리/게임 오버)에는 update가 멈춰 프레임이 기록되지 않으므로
+        # 스페이스 입력을 판정하지도, 리플레이에 기록하지도 않음
+        finished = self.game_over or self.victory
+        
+        # 스페이스 입력은 판정 곡 시간과 함께 리플레이에 기록
+        if self.recorder and not finished and event.type in (SDL_KEYDOWN, SDL_KEYUP) and event.key == SDLK_SPACE:
+            kind = KEY_DOWN if event.type == SDL_KEYDOWN else KEY_UP
+            self.recorder.add_event(kind, self.rhythm_manager.time_at(getattr(event, 'timestamp', None)))
+        
         if event.type == SDL_KEYDOWN:
             # Die 애니메이션이 끝났으면 아무 키나 눌러서 종료
             if self.die_animation_finished:
@@ -54,9 +121,11 @@ class PlayMode:
             
             if event.key == SDLK_SPACE:
                 # 스페이스바로 패링 시도
-                if self.player.parry():
-                    # 리듬 판정 (player 충돌 기반)
-                    judgment, success, parried_note = self.rhythm_manager.try_hit(player=self.player)
+                if not finished and self.player.parry():
+                    # 리듬 판정 (player 충돌 기반, 타이밍은 키를 누른 시각 기준)
+                    hit_time = self.rhythm_manager.time_at(getattr(event, 'timestamp', None))
+                    judgment, success, parried_note = self.rhythm_manager.try_hit(hit_time=hit_time,
+                                                                                  player=self.player)
                     
                     if success and parried_note:
                         if judgment == 'holding':
@@ -77,8 +146,10 @@ class PlayMode:
                         
             elif event.key == SDLK_r and (self.game_over or self.victory):
                 # 게임 재시작
+                self.save_replay()
                 if hasattr(self, 'rhythm_manager') and self.rhythm_manager:
-                    self.rhythm_manager.stop_music()
+                    self.rhythm_manager.release()
+                self.release_assets()
                 self.__init__()
                 self.enter()
                 
@@ -86,7 +157,7 @@ class PlayMode:
                 game_framework.quit()
         
         elif event.type == SDL_KEYUP:
-            if event.key == SDLK_SPACE:
+            if event.key == SDLK_SPACE and not finished:
                 # 스페이스 릴리즈 처리
                 from player_state import HoldState
                 if self.player.state_machine.cur_state == HoldState:
@@ -95,26 +166,38 @@ class PlayMode:
                     self.player.state_machine.add_event(('SPACE_UP', 0))
     
     def update(self):
+        # 백그라운드에서 디코드가 끝난 시트 업로드 (메인 스레드)
+        if not self.headless:
+            SPRITES.pump()
+        
         if self.game_over or self.victory:
             return
             
         dt = game_framework.game_state.dt
         
+        if not self.die_prefetched and self.player.hp <= DIE_PREFETCH_HP:
+            self.player.prefetch(['player_die'])
+            self.die_prefetched = True
+        
         # 배경 업데이트 (HoldState나 DieState일 때는 멈춤)
         from player_state import HoldState, DieState
         should_scroll = (self.player.state_machine.cur_state != HoldState and 
                         self.player.state_machine.cur_state != DieState)
-        self.background.update(dt, should_scroll)
+        if self.background:
+            self.background.update(dt, should_scroll)
         
         # 플레이어 업데이트
         self.player.update(dt)
         
         # HP 바 애니메이션 업데이트
-        self.hp_bar.update(dt)
+        if self.hp_bar:
+            self.hp_bar.update(dt)
         
         # Die 상태가 아닐 때만 리듬 시스템 업데이트 (화살표 생성)
         if not self.player.is_dead:
             self.rhythm_manager.update(dt)
+        if self.recorder:
+            self.recorder.add_frame(self.rhythm_manager.current_time, dt)
         
         # 판정 텍스트 시간 업데이트
         if self.last_judgment:
@@ -160,6 +243,10 @@ class PlayMode:
             self.draw_game_over()
         elif self.victory:
             self.draw_victory()
+        
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.enter_time) * 1000
+            print(f"PlayMode 진입 후 첫 프레임까지 {self.first_frame_ms:.1f}ms")
     
     def draw_judgment(self):
         """판정 결과 그리기"""
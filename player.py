@@ -1,9 +1,61 @@
 from pico2d import *
 import math
+import time
+import sprite_cache
+from sprite_manifest import get_manifest
+from asset_manager import ASSETS
+from sprite_loader import SPRITES
+from sprite_atlas import get_atlas
 from player_state import StateMachine, FightIdleState, ParryState, RunState, DieState
 
+SPRITE_SIZE = 512  # 원본 시트의 프레임 크기 (px)
+BODY_SCALE = 0.25  # 플레이어 애니메이션 그리기 배율 (상태별 draw)
+EFFECT_SCALE = 0.5  # 이펙트 그리기 배율 (draw_effect)
+
+# 이름: (파일, fps, 그리기 배율) - 열/줄/프레임 수는 sprite_manifest가 PNG 헤더에서 구함
+SPRITE_SHEETS = {
+    # 플레이어 Idle 애니메이션 (Standingidle)
+    'player_idle': ('sprite_sheets/player_standing_idle.png', 8, BODY_SCALE),
+    # 플레이어 Fighting Idle 애니메이션
+    'player_fighting_idle': ('sprite_sheets/player_fighting_idle.png', 12, BODY_SCALE),
+    # 플레이어 Run 애니메이션
+    'player_run': ('sprite_sheets/player_run.png', 60, BODY_SCALE),
+    # 플레이어 Die 애니메이션
+    'player_die': ('sprite_sheets/player_die.png', 24, BODY_SCALE),
+    # 플레이어 피격 애니메이션 (Hurt_2: 0~10, 13~15 프레임), 20에서 30fps로 증가 (1.5배 빠르게)
+    'player_hurt_2': ('sprite_sheets/player_hurt_2.png', 30, BODY_SCALE),
+    # 플레이어 패링 ABC 애니메이션 (메인 패링 모션)
+    'player_parry': ('sprite_sheets/player_parry_abc.png', 24, BODY_SCALE),
+    # 플레이어 공중 패링 애니메이션
+    'player_parry_sky': ('sprite_sheets/player_parry_sky.png', 24, BODY_SCALE),
+    'player_sky': ('sprite_sheets/player_parry_sky.png', 24, BODY_SCALE),
+    # 플레이어 패링 카운터 애니메이션
+    'player_counter': ('sprite_sheets/player_parry_counter.png', 24, BODY_SCALE),
+    # 패링 준비 이펙트
+    'prepare': ('sprite_sheets/ParryCounterPrepare_sheet.png', 30, EFFECT_SCALE),
+    # 패링 성공 이펙트 (정확한 타이밍)
+    'accurate': ('sprite_sheets/ParrySparkAccurate_sheet.png', 30, EFFECT_SCALE),
+    # 공중 패링 이펙트
+    'parry_sky_effect': ('sprite_sheets/effect_parry_sky.png', 30, EFFECT_SCALE),
+    # 반격 이펙트
+    'counter_effect': ('sprite_sheets/ParryCounterAttack_sheet.png', 30, EFFECT_SCALE),
+}
+
+# 마지막 줄이 다 차지 않은 시트의 실제 프레임 수 (헤더만으로는 빈 칸을 알 수 없음)
+FRAME_COUNTS = {
+    'accurate': 7,  # 8x1 격자
+    'counter_effect': 9,  # 8x2 격자
+}
+
 class Player:
-    def __init__(self):
+    def __init__(self, clock=time.perf_counter, headless=False):
+        """
+        Args:
+            clock: 상태 타임아웃에 쓰는 시계 함수 (초) - 시뮬레이션에서 주입
+            headless: True면 이미지를 로드하지 않음 (애니메이션 정보만 사용, 그리기 불가)
+        """
+        self.clock = clock
+        self.headless = headless
         self.x = 90  # 화면 왼쪽
         self.y = 130  # y 위치
         self.width = 128
@@ -43,8 +95,11 @@ class Player:
         self.frame_time = 0
         self.action = 'idle'  # idle, parry, hit
         
-        # Nine Sols 스프라이트 시트 로드
+        # Nine Sols 스프라이트 시트 로드 (ASSETS에서 공유, release()로 반납)
+        # 아틀라스를 빌드해 두었으면 프레임은 아틀라스에서 그림
+        self.atlas = None if headless else get_atlas()
         self.sprite_sheets = {}
+        self.asset_paths = []
         self.load_sprite_sheets()
         
         # 현재 애니메이션 설정
@@ -68,155 +123,85 @@ class Player:
         self.state_machine = StateMachine(self)
         self.state_machine.start(RunState)
     
+    def sheet_variant(self, path, draw_scale):
+        """
+        그리는 배율에 맞는 시트 파일 선택
+
+        Returns:
+            (경로, 축소 배수): 축소 캐시가 없거나 headless면 (path, 1)
+        """
+        if self.headless:
+            return path, 1
+        return sprite_cache.select_variant(path, SPRITE_SIZE, SPRITE_SIZE, draw_scale)
+    
     def load_sprite_sheets(self):
-        """Nine Sols 패링 스프라이트 시트 로드"""
-        try:
-            # 플레이어 Idle 애니메이션 (Standingidle)
-            self.sprite_sheets['player_idle'] = {
-                'image': load_image('sprite_sheets/player_standing_idle.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 8,
-                'total_frames': 8,
-                'fps': 8
-            }
-            print(f"  - player_idle (Standingidle) 로드 완료")
-            
-            # 플레이어 Fighting Idle 애니메이션
-            self.sprite_sheets['player_fighting_idle'] = {
-                'image': load_image('sprite_sheets/player_fighting_idle.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 6,
-                'total_frames': 6,
-                'fps': 12
-            }
-            print(f"  - player_fighting_idle 로드 완료")
-            
-            # 플레이어 Run 애니메이션
-            self.sprite_sheets['player_run'] = {
-                'image': load_image('sprite_sheets/player_run.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 12,
-                'total_frames': 12,
-                'fps': 60
-            }
-            print(f"  - player_run 로드 완료")
-            
-            # 플레이어 Die 애니메이션
-            self.sprite_sheets['player_die'] = {
-                'image': load_image('sprite_sheets/player_die.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 24,  
-                'total_frames': 24,
-                'fps': 24
-            }
-            print(f"  - player_die 로드 완료 ")
-            
-            # 플레이어 피격 애니메이션 (Hurt_2: 0~10, 13~15 프레임)
-            self.sprite_sheets['player_hurt_2'] = {
-                'image': load_image('sprite_sheets/player_hurt_2.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 14,
-                'total_frames': 14,
-                'fps': 30  # 20에서 30으로 증가 (1.5배 빠르게)
-            }
-            print(f"  - player_hurt_2 로드 완료")
-            
-            # 플레이어 패링 ABC 애니메이션 (메인 패링 모션)
-            self.sprite_sheets['player_parry'] = {
-                'image': load_image('sprite_sheets/player_parry_abc.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 15,
-                'total_frames': 15,
-                'fps': 24
-            }
-            print(f"  - player_parry (ABC) 로드 완료")
-            
-            # 플레이어 공중 패링 애니메이션 (새로운!)
-            self.sprite_sheets['player_parry_sky'] = {
-                'image': load_image('sprite_sheets/player_parry_sky.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 8,
-                'total_frames': 8,
-                'fps': 24
-            }
-            print(f"  - player_parry_sky (공중 패링) 로드 완료")
+        """
+        Nine Sols 패링 스프라이트 시트 등록 (이미지는 처음 그릴 때 로드)
 
-            
-            # 플레이어 공중 패링 애니메이션
-            self.sprite_sheets['player_sky'] = {
-                'image': load_image('sprite_sheets/player_parry_sky.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 14,
-                'total_frames': 14,
-                'fps': 24
-            }
-            
-            # 플레이어 패링 카운터 애니메이션
-            self.sprite_sheets['player_counter'] = {
-                'image': load_image('sprite_sheets/player_parry_counter.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 14,
-                'total_frames': 14,
-                'fps': 24
-            }
-            
-            # 패링 준비 이펙트
-            self.sprite_sheets['prepare'] = {
-                'image': load_image('sprite_sheets/ParryCounterPrepare_sheet.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 8,
-                'total_frames': 16,
-                'fps': 30
-            }
-            
-            # 패링 성공 이펙트 (정확한 타이밍)
-            self.sprite_sheets['accurate'] = {
-                'image': load_image('sprite_sheets/ParrySparkAccurate_sheet.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 8,
-                'total_frames': 7,
-                'fps': 30
-            }
-            
-            # 공중 패링 이펙트 (새로운!)
-            self.sprite_sheets['parry_sky_effect'] = {
-                'image': load_image('sprite_sheets/effect_parry_sky.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 6,
-                'total_frames': 6,
-                'fps': 30
-            }
-            print(f"  - parry_sky_effect (공중 패링 이펙트) 로드 완료")
-            
-            # 반격 이펙트
-            self.sprite_sheets['counter_effect'] = {
-                'image': load_image('sprite_sheets/ParryCounterAttack_sheet.png'),
-                'sprite_width': 512,
-                'sprite_height': 512,
-                'sprites_per_row': 8,
-                'total_frames': 9,
-                'fps': 30
+        축소 캐시가 있으면 그리는 크기에 맞는 시트를 쓴다.
+        열/줄/프레임 수는 시트 매니페스트(PNG 헤더 기준, 캐시됨)에서 가져온다.
+        곧 쓸 시트는 prefetch()로 미리 백그라운드 디코드를 시작할 수 있다.
+        """
+        manifest = get_manifest()
+        for name, (path, fps, draw_scale) in SPRITE_SHEETS.items():
+            try:
+                layout = manifest.layout(path, SPRITE_SIZE, SPRITE_SIZE, FRAME_COUNTS.get(name), name)
+            except (OSError, ValueError) as e:
+                print(f"스프라이트 시트 정보 읽기 실패: {path} ({e})")
+                continue
+            image_path, divisor = self.sheet_variant(path, draw_scale)
+            self.sprite_sheets[name] = {
+                'image': None,  # sheet_image()에서 로드
+                'failed': False,  # 로드에 실패했으면 다시 시도하지 않음 (매 프레임 블로킹 디코드 방지)
+                'path': image_path,
+                'sprite_width': SPRITE_SIZE,  # 원본 기준 크기 (그리는 크기 계산용)
+                'sprite_height': SPRITE_SIZE,
+                'frame_width': SPRITE_SIZE // divisor,  # 텍스처 안의 실제 프레임 크기
+                'frame_height': SPRITE_SIZE // divisor,
+                'sprites_per_row': layout['columns'],
+                'rows': layout['rows'],
+                'total_frames': layout['frames'],
+                'fps': fps
             }
-            
-            print("Nine Sols 패링 스프라이트 로드 완료")
-            print(f"  총 {len(self.sprite_sheets)}개 스프라이트 시트 로드됨")
-        except Exception as e:
-            print(f"스프라이트 로드 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            self.sprite_sheets = {}
+        manifest.save()
+        print(f"Nine Sols 패링 스프라이트 시트 {len(self.sprite_sheets)}개 등록 (처음 쓸 때 로드)")
+    
+    def prefetch(self, names):
+        """곧 쓸 애니메이션 시트(아틀라스가 있으면 아틀라스)를 백그라운드에서 미리 디코드 (힌트)"""
+        if self.headless:
+            return
+        if self.atlas is not None:
+            SPRITES.prefetch(self.atlas.atlas_paths(names))
+            names = [name for name in names if not self.atlas.has(name)]
+        SPRITES.prefetch([self.sprite_sheets[name]['path'] for name in names
+                          if name in self.sprite_sheets and self.sprite_sheets[name]['image'] is None
+                          and not self.sprite_sheets[name]['failed']])
+    
+    def sheet_image(self, anim_data):
+        """
+        시트 이미지 반환 (처음 쓸 때 로드, headless면 None)
+
+        prefetch로 디코드가 끝났으면 업로드만 하고, 디코드 중이면 끝날 때까지 기다린다.
+        로드에 실패한 시트는 기록해 두고 이후에는 None을 반환한다 (그리지 않음).
+        """
+        if anim_data['image'] is None and not anim_data['failed'] and not self.headless:
+            path = anim_data['path']
+            try:
+                SPRITES.load(path)
+                anim_data['image'] = ASSETS.acquire(path)
+                self.asset_paths.append(path)
+            except Exception as e:
+                anim_data['failed'] = True
+                print(f"스프라이트 로드 실패: {path} ({e})")
+        return anim_data['image']
+    
+    def release(self):
+        """공유 텍스처 반납 (캐시에는 남아 재시작 시 다시 로드하지 않음)"""
+        for path in self.asset_paths:
+            ASSETS.release(path)
+        self.asset_paths = []
+        for anim_data in self.sprite_sheets.values():
+            anim_data['image'] = None
     
     def update(self, dt):
         # HP가 0 이하면 Die 상태로 전환
@@ -374,66 +359,49 @@ class Player:
         # 이펙트는 항상 그리기
         self.draw_effect()
     
-    def draw_animation(self):
-        """현재 애니메이션 그리기 (상태별로 호출됨)"""
-        # 스프라이트 시트가 로드되었는지 확인
-        if not self.sprite_sheets or self.current_anim not in self.sprite_sheets:
+    def draw_frame(self, name, frame, draw_scale):
+        """
+        애니메이션 프레임 하나를 플레이어 위치에 그림 (중앙 정렬, 원본 프레임 크기 x draw_scale)
+
+        아틀라스가 있으면 (애니메이션, 번호)로 찾아 그리고, 없으면 시트에서 잘라 그린다.
+        여러 줄 시트는 위 줄부터 sprites_per_row개씩 읽는다 (pico2d는 아래쪽이 y=0).
+        """
+        anim_data = self.sprite_sheets.get(name)
+        if not anim_data:
             return
         
-        # Nine Sols 애니메이션 그리기
-        anim_data = self.sprite_sheets[self.current_anim]
-        sprite_sheet = anim_data['image']
-        sprite_width = anim_data['sprite_width']
-        sprite_height = anim_data['sprite_height']
-        total_frames = anim_data['total_frames']
-        
         # 프레임 범위 체크
-        current_frame = min(self.anim_frame, total_frames - 1)
+        current_frame = min(frame, anim_data['total_frames'] - 1)
+        draw_width = int(anim_data['sprite_width'] * draw_scale)
+        draw_height = int(anim_data['sprite_height'] * draw_scale)
         
-        # 현재 프레임의 위치 계산 (한 행에 모든 프레임이 있음)
-        frame_x = current_frame * sprite_width
+        if self.atlas is not None and self.atlas.has(name):
+            self.atlas.draw(name, current_frame, self.x, self.y, draw_width, draw_height)
+            return
         
-        # 스프라이트 그리기 (중앙 정렬, 크기 조절)
-        draw_scale = 0.25  
-        draw_width = int(sprite_width * draw_scale)
-        draw_height = int(sprite_height * draw_scale)
+        sprite_sheet = self.sheet_image(anim_data)
+        if sprite_sheet is None:
+            return
+        frame_width = anim_data['frame_width']
+        frame_height = anim_data['frame_height']
+        per_row = anim_data['sprites_per_row']
+        frame_x = (current_frame % per_row) * frame_width
+        frame_y = (anim_data['rows'] - 1 - current_frame // per_row) * frame_height
         
         sprite_sheet.clip_draw(
-            int(frame_x), 0, int(sprite_width), int(sprite_height),
+            int(frame_x), int(frame_y), int(frame_width), int(frame_height),
             int(self.x), int(self.y), int(draw_width), int(draw_height)
         )
     
+    def draw_animation(self):
+        """현재 애니메이션 그리기 (상태별로 호출됨)"""
+        self.draw_frame(self.current_anim, self.anim_frame, BODY_SCALE)
+    
     def draw_effect(self):
         """이펙트 그리기 (플레이어 위에 오버레이)"""
         if not self.is_effect_playing or not self.effect_anim:
             return
-            
-        if self.effect_anim not in self.sprite_sheets:
-            return
-            
-        effect_data = self.sprite_sheets[self.effect_anim]
-        effect_sheet = effect_data['image']
-        effect_width = effect_data['sprite_width']
-        effect_height = effect_data['sprite_height']
-        total_frames = effect_data['total_frames']
-        
-        # 프레임 범위 체크
-        current_frame = min(self.effect_frame, total_frames - 1)
-        
-        # 현재 프레임의 위치 계산
-        frame_x = current_frame * effect_width
-        
-        # 이펙트 그리기
-        draw_scale = 0.5 
-        draw_width = int(effect_width * draw_scale)
-        draw_height = int(effect_height * draw_scale)
-        
-        effect_sheet.clip_draw(
-            int(frame_x), 0, int(effect_width), int(effect_height),
-            int(self.x), int(self.y), int(draw_width), int(draw_height)
-        )
-        
-
+        self.draw_frame(self.effect_anim, self.effect_frame, EFFECT_SCALE)
     
     def draw_hp_bar(self):
         pass
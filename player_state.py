@@ -1,5 +1,4 @@
 from pico2d import *
-import time
 
 # 상태 정의
 class FightIdleState:
@@ -8,7 +7,7 @@ class FightIdleState:
         player.current_anim = 'player_fighting_idle'
         player.anim_frame = 0
         player.max_anim_frames = 0
-        player.fight_idle_time = time.time()
+        player.fight_idle_time = player.clock()
         print("FightIdleState 진입")
     
       
@@ -18,30 +17,13 @@ class FightIdleState:
       
     def do(player):
         # 0.3초 후
-        if time.time() - player.fight_idle_time > 0.3:
+        if player.clock() - player.fight_idle_time > 0.3:
             player.state_machine.add_event(('TIME_OUT', 0))
     
       
     def draw(player):
         # Fighting Idle 애니메이션 그리기
-        if 'player_fighting_idle' in player.sprite_sheets:
-            anim_data = player.sprite_sheets['player_fighting_idle']
-            sprite_sheet = anim_data['image']
-            sprite_width = anim_data['sprite_width']
-            sprite_height = anim_data['sprite_height']
-            total_frames = anim_data['total_frames']
-            
-            current_frame = min(player.anim_frame, total_frames - 1)
-            frame_x = current_frame * sprite_width
-            
-            draw_scale = 0.25
-            draw_width = int(sprite_width * draw_scale)
-            draw_height = int(sprite_height * draw_scale)
-            
-            sprite_sheet.clip_draw(
-                int(frame_x), 0, int(sprite_width), int(sprite_height),
-                int(player.x), int(player.y), int(draw_width), int(draw_height)
-            )
+        player.draw_frame('player_fighting_idle', player.anim_frame, draw_scale=0.25)
 
 class RunState:
       
@@ -50,7 +32,7 @@ class RunState:
         player.anim_frame = 0
         player.max_anim_frames = 0
 
-        player.run_time = time.time()
+        player.run_time = player.clock()
         print("RunState 진입")
     
       
@@ -65,24 +47,7 @@ class RunState:
       
     def draw(player):
         # Run 애니메이션 그리기
-        if 'player_run' in player.sprite_sheets:
-            anim_data = player.sprite_sheets['player_run']
-            sprite_sheet = anim_data['image']
-            sprite_width = anim_data['sprite_width']
-            sprite_height = anim_data['sprite_height']
-            total_frames = anim_data['total_frames']
-            
-            current_frame = min(player.anim_frame, total_frames - 1)
-            frame_x = current_frame * sprite_width
-            
-            draw_scale = 0.25
-            draw_width = int(sprite_width * draw_scale)
-            draw_height = int(sprite_height * draw_scale)
-            
-            sprite_sheet.clip_draw(
-                int(frame_x), 0, int(sprite_width), int(sprite_height),
-                int(player.x), int(player.y), int(draw_width), int(draw_height)
-            )
+        player.draw_frame('player_run', player.anim_frame, draw_scale=0.25)
 
 class DieState:
       
@@ -105,31 +70,13 @@ class DieState:
       
     def draw(player):
         # Die 애니메이션 그리기
-        if 'player_die' in player.sprite_sheets:
-            anim_data = player.sprite_sheets['player_die']
-            sprite_sheet = anim_data['image']
-            sprite_width = anim_data['sprite_width']
-            sprite_height = anim_data['sprite_height']
-            total_frames = anim_data['total_frames']
-            
-            current_frame = min(player.anim_frame, total_frames - 1)
-            frame_x = current_frame * sprite_width
-            
-            draw_scale = 0.25
-            draw_width = int(sprite_width * draw_scale)
-            draw_height = int(sprite_height * draw_scale)
-            
-            sprite_sheet.clip_draw(
-                int(frame_x), 0, int(sprite_width), int(sprite_height),
-                int(player.x), int(player.y), int(draw_width), int(draw_height)
-            )
+        player.draw_frame('player_die', player.anim_frame, draw_scale=0.25)
 
 class ParryState:
 
     def enter(player, e):
         player.is_parrying = True
-        import time
-        player.parry_input_time = time.time()  # 마지막 입력 시간 기록 또는 갱신
+        player.parry_input_time = player.clock()  # 마지막 입력 시간 기록 또는 갱신
         
         # 공중 패링 애니메이션 사용 (전체 재생)
         player.current_anim = 'player_parry_sky'
@@ -158,24 +105,7 @@ class ParryState:
       
     def draw(player):
         # 공중 Parry 애니메이션 그리기
-        if 'player_parry_sky' in player.sprite_sheets:
-            anim_data = player.sprite_sheets['player_parry_sky']
-            sprite_sheet = anim_data['image']
-            sprite_width = anim_data['sprite_width']
-            sprite_height = anim_data['sprite_height']
-            total_frames = anim_data['total_frames']
-            
-            current_frame = min(player.anim_frame, total_frames - 1)
-            frame_x = current_frame * sprite_width
-            
-            draw_scale = 0.25
-            draw_width = int(sprite_width * draw_scale)
-            draw_height = int(sprite_height * draw_scale)
-            
-            sprite_sheet.clip_draw(
-                int(frame_x), 0, int(sprite_width), int(sprite_height),
-                int(player.x), int(player.y), int(draw_width), int(draw_height)
-            )
+        player.draw_frame('player_parry_sky', player.anim_frame, draw_scale=0.25)
 
 class HoldState:
     """롱 노트 홀딩 상태"""
@@ -183,8 +113,8 @@ class HoldState:
     def enter(player, e):
         player.current_anim = 'player_parry'  # ABC 패리 모션 사용
         player.anim_frame = 0
-        player.hold_start_time = time.time()
-        player.last_effect_time = time.time()  # 마지막 이펙트 재생 시간
+        player.hold_start_time = player.clock()
+        player.last_effect_time = player.clock()  # 마지막 이펙트 재생 시간
         # 패링 성공 이펙트 시작 (accurate)
         player.start_effect('accurate')
         print("HoldState 진입 - 롱 노트 홀딩")
@@ -194,7 +124,7 @@ class HoldState:
     
     def do(player):
         # 이펙트를 0.15초마다 반복 (더 빠른 반복)
-        current_time = time.time()
+        current_time = player.clock()
         if current_time - player.last_effect_time >= 0.15:
             player.start_effect('accurate')
             player.last_effect_time = current_time
@@ -209,24 +139,7 @@ class HoldState:
     
     def draw(player):
         # ABC Parry 애니메이션 그리기
-        if 'player_parry' in player.sprite_sheets:
-            anim_data = player.sprite_sheets['player_parry']
-            sprite_sheet = anim_data['image']
-            sprite_width = anim_data['sprite_width']
-            sprite_height = anim_data['sprite_height']
-            total_frames = anim_data['total_frames']
-            
-            current_frame = min(player.anim_frame, total_frames - 1)
-            frame_x = current_frame * sprite_width
-            
-            draw_scale = 0.25
-            draw_width = int(sprite_width * draw_scale)
-            draw_height = int(sprite_height * draw_scale)
-            
-            sprite_sheet.clip_draw(
-                int(frame_x), 0, int(sprite_width), int(sprite_height),
-                int(player.x), int(player.y), int(draw_width), int(draw_height)
-            )
+        player.draw_frame('player_parry', player.anim_frame, draw_scale=0.25)
 
 class HitState:
       
@@ -237,7 +150,7 @@ class HitState:
             print(f"피격당함! 남은 HP: {player.hp}/{player.max_hp}")
         
         player.is_hit = True
-        player.hit_time = time.time()
+        player.hit_time = player.clock()
         
         # 피격 애니메이션 설정 (처음부터 재생)
         player.current_anim = 'player_hurt_2'
@@ -258,24 +171,7 @@ class HitState:
       
     def draw(player):
         # Hurt 애니메이션 그리기
-        if 'player_hurt_2' in player.sprite_sheets:
-            anim_data = player.sprite_sheets['player_hurt_2']
-            sprite_sheet = anim_data['image']
-            sprite_width = anim_data['sprite_width']
-            sprite_height = anim_data['sprite_height']
-            total_frames = anim_data['total_frames']
-            
-            current_frame = min(player.anim_frame, total_frames - 1)
-            frame_x = current_frame * sprite_width
-            
-            draw_scale = 0.25
-            draw_width = int(sprite_width * draw_scale)
-            draw_height = int(sprite_height * draw_scale)
-            
-            sprite_sheet.clip_draw(
-                int(frame_x), 0, int(sprite_width), int(sprite_height),
-                int(player.x), int(player.y), int(draw_width), int(draw_height)
-            )
+        player.draw_frame('player_hurt_2', player.anim_frame, draw_scale=0.25)
 
 # 이벤트 정의
 SPACE_DOWN = 0
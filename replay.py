@@ -0,0 +1,348 @@
+"""
+리플레이 - 플레이 기록 저장과 최대 속도 재생
+
+PlayMode가 프레임마다 (곡 시간, dt)를, 스페이스 입력마다 (프레임, 누름/뗌, 판정 곡 시간)을 기록한다.
+재생은 창/이미지/음악 없이 같은 채보로 PlayMode를 돌리면서 기록된 시간과 입력을 그대로 넣으므로
+try_hit / release_hold / Miss 판정과 플레이어 상태 머신이 기록 당시와 똑같이 진행되어 점수가 일치한다.
+
+파일 레이아웃 (리틀 엔디언):
+    헤더 64바이트
+        magic        4s   b'RGRP'
+        version      H    REPLAY_FORMAT_VERSION
+        path_len     H    음악 파일 경로 길이 (UTF-8 바이트)
+        diff_len     H    난이도 문자열 길이
+        (패딩)       H
+        n_frames     I    기록된 프레임 수
+        n_events     I    기록된 입력 수
+        start_delay  d    채보 시작 지연 (초)
+        chart_hash   16s  채보 내용 MD5 (노트 시간/종류/길이)
+        score        I    기록 당시 최종 점수
+        max_combo    I
+        hp           i
+        (나머지 0 패딩)
+    음악 파일 경로, 난이도 (UTF-8)
+    zlib 압축 본문
+        frame_times  float64 * n_frames  (프레임별 곡 시간)
+        frame_dts    float64 * n_frames  (프레임별 dt)
+        event_frames uint32  * n_events  (입력이 처리된 프레임 번호 - 그 프레임 update 전에 처리)
+        event_times  float64 * n_events  (판정에 쓴 곡 시간)
+        event_kinds  uint8   * n_events  (0: 누름, 1: 뗌)
+
+사용법: python replay.py 리플레이파일... [--repeat N]
+"""
+import io
+import os
+import sys
+import time
+import zlib
+import struct
+import hashlib
+import argparse
+import contextlib
+import numpy as np
+
+REPLAY_MAGIC = b'RGRP'
+REPLAY_FORMAT_VERSION = 1
+REPLAY_EXT = '.rpl'
+REPLAY_DIR = 'replays'
+REPLAY_HEADER_FORMAT = '<4sHHHHIId16sIIi'
+REPLAY_HEADER_SIZE = 64
+
+KEY_DOWN = 0
+KEY_UP = 1
+
+
+def chart_hash(chart):
+    """채보 내용 해시 (NoteStore로 정규화한 시간/종류/길이 기준, 16바이트)"""
+    from note_store import NoteStore
+    store = NoteStore(chart)
+    md5 = hashlib.md5()
+    md5.update(np.ascontiguousarray(store.beat_time, dtype='<f8').tobytes())
+    md5.update(np.ascontiguousarray(store.note_type, dtype=np.int8).tobytes())
+    md5.update(np.ascontiguousarray(store.duration, dtype='<f8').tobytes())
+    return md5.digest()
+
+
+class Replay:
+    """리플레이 데이터 (배열은 numpy)"""
+
+    def __init__(self, music_path, difficulty, start_delay, chart_digest,
+                 frame_times, frame_dts, event_frames, event_times, event_kinds,
+                 score=0, max_combo=0, hp=0):
+        self.music_path = music_path
+        self.difficulty = difficulty
+        self.start_delay = start_delay
+        self.chart_digest = chart_digest
+        self.frame_times = frame_times
+        self.frame_dts = frame_dts
+        self.event_frames = event_frames
+        self.event_times = event_times
+        self.event_kinds = event_kinds
+        self.score = score
+        self.max_combo = max_combo
+        self.hp = hp
+
+
+class ReplayRecorder:
+    """PlayMode에서 한 판을 기록"""
+
+    def __init__(self, music_path, difficulty, start_delay):
+        self.music_path = music_path
+        self.difficulty = difficulty
+        self.start_delay = start_delay
+        self.frame_times = []
+        self.frame_dts = []
+        self.events = []  # (프레임, 종류, 곡 시간)
+
+    def add_event(self, kind, song_time):
+        """다음 update 전에 처리된 입력 기록"""
+        self.events.append((len(self.frame_times), kind, song_time))
+
+    def add_frame(self, song_time, dt):
+        self.frame_times.append(song_time)
+        self.frame_dts.append(dt)
+
+    def to_replay(self, chart, score, max_combo, hp):
+        events = self.events
+        return Replay(
+            self.music_path, self.difficulty, self.start_delay, chart_hash(chart),
+            np.array(self.frame_times, dtype='<f8'), np.array(self.frame_dts, dtype='<f8'),
+            np.array([e[0] for e in events], dtype='<u4'),
+            np.array([e[2] for e in events], dtype='<f8'),
+            np.array([e[1] for e in events], dtype=np.uint8),
+            score, max_combo, hp
+        )
+
+
+def write_replay(path, replay):
+    """리플레이 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+    path_bytes = replay.music_path.encode('utf-8')
+    diff_bytes = replay.difficulty.encode('utf-8')
+    header = struct.pack(
+        REPLAY_HEADER_FORMAT, REPLAY_MAGIC, REPLAY_FORMAT_VERSION, len(path_bytes), len(diff_bytes), 0,
+        len(replay.frame_times), len(replay.event_frames), float(replay.start_delay),
+        replay.chart_digest, int(replay.score), int(replay.max_combo), int(replay.hp)
+    )
+    body = b''.join((
+        np.ascontiguousarray(replay.frame_times, dtype='<f8').tobytes(),
+        np.ascontiguousarray(replay.frame_dts, dtype='<f8').tobytes(),
+        np.ascontiguousarray(replay.event_frames, dtype='<u4').tobytes(),
+        np.ascontiguousarray(replay.event_times, dtype='<f8').tobytes(),
+        np.ascontiguousarray(replay.event_kinds, dtype=np.uint8).tobytes(),
+    ))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(REPLAY_HEADER_SIZE, b'\0'))
+        f.write(path_bytes)
+        f.write(diff_bytes)
+        f.write(zlib.compress(body, 9))
+    os.replace(tmp_path, path)
+
+
+def read_replay(path):
+    """
+    리플레이 파일 읽기
+
+    Raises:
+        ValueError: 매직 넘버나 버전이 맞지 않거나 본문이 손상된 경우
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if len(raw) < REPLAY_HEADER_SIZE:
+        raise ValueError("리플레이 헤더가 손상됨")
+    (magic, version, path_len, diff_len, _, n_frames, n_events, start_delay,
+     digest, score, max_combo, hp) = struct.unpack_from(REPLAY_HEADER_FORMAT, raw)
+    if magic != REPLAY_MAGIC:
+        raise ValueError("리플레이 파일 형식이 아님")
+    if version != REPLAY_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 리플레이 버전: {version}")
+
+    offset = REPLAY_HEADER_SIZE
+    music_path = raw[offset:offset + path_len].decode('utf-8')
+    offset += path_len
+    difficulty = raw[offset:offset + diff_len].decode('utf-8')
+    offset += diff_len
+    try:
+        body = zlib.decompress(raw[offset:])
+    except zlib.error as e:
+        raise ValueError(f"리플레이 본문이 손상됨: {e}")
+    if len(body) != n_frames * 16 + n_events * 13:
+        raise ValueError("리플레이 본문 크기가 맞지 않음")
+
+    offset = 0
+
+    def take(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    frame_times = take('<f8', n_frames)
+    frame_dts = take('<f8', n_frames)
+    event_frames = take('<u4', n_events)
+    event_times = take('<f8', n_events)
+    event_kinds = take(np.uint8, n_events)
+    return Replay(music_path, difficulty, start_delay, digest, frame_times, frame_dts,
+                  event_frames, event_times, event_kinds, score, max_combo, hp)
+
+
+def replay_filename(music_path, difficulty):
+    """리플레이 저장 경로 (곡 이름_난이도_시각.rpl)"""
+    name = os.path.splitext(os.path.basename(music_path))[0] or 'chart'
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(REPLAY_DIR, f"{name}_{difficulty}_{stamp}{REPLAY_EXT}")
+    count = 1
+    while os.path.exists(path):
+        # 같은 초에 끝난 플레이가 있으면 번호를 붙임
+        path = os.path.join(REPLAY_DIR, f"{name}_{difficulty}_{stamp}_{count}{REPLAY_EXT}")
+        count += 1
+    return path
+
+
+class ReplayClock:
+    """
+    기록된 프레임 시간을 그대로 돌려주는 곡 시계 (SongClock 대신 RhythmManager에 넣음)
+
+    입력 timestamp는 이미 곡 시간이므로 time_at은 그대로 반환한다.
+    """
+
+    def __init__(self, frame_times, start_delay):
+        self.frame_times = frame_times
+        self.start_delay = start_delay
+        self.frame = 0
+        self.start_wall = None
+        self.offset = 0.0
+        self.samples = 0
+
+    @property
+    def started(self):
+        return self.start_wall is not None
+
+    def now(self):
+        return float(self.frame_times[self.frame]) if len(self.frame_times) else 0.0
+
+    def start(self):
+        self.start_wall = 0.0
+
+    def elapsed(self):
+        return self.now() + self.start_delay
+
+    def time_at(self, song_time):
+        return song_time
+
+    def update(self, audio_pos_ms=None):
+        return float(self.frame_times[self.frame])
+
+
+def run_replay(replay, chart, quiet=True):
+    """
+    리플레이를 렌더링 없이 최대 속도로 재생
+
+    Args:
+        replay: Replay
+        chart: 기록 당시와 같은 채보 (chart_hash가 일치해야 함)
+
+    Returns:
+        dict: 재생 결과 점수/콤보/HP와 소요 시간, 기록과 일치 여부
+
+    Raises:
+        ValueError: 채보가 기록 당시와 다른 경우
+    """
+    from pico2d import SDL_KEYDOWN, SDL_KEYUP, SDLK_SPACE
+    import game_framework
+    from play_mode import PlayMode
+    from headless_sim import SimEvent
+
+    if chart_hash(chart) != replay.chart_digest:
+        raise ValueError("채보가 리플레이 기록과 다름")
+
+    clock = ReplayClock(replay.frame_times, replay.start_delay)
+    prepared_chart = {'chart': chart, 'bpm': 120, 'duration': 0}
+    mode = PlayMode(music_path=replay.music_path, difficulty=replay.difficulty,
+                    prepared_chart=prepared_chart, now=clock.now, headless=True, record=False)
+    event_frames = replay.event_frames.tolist()
+    event_times = replay.event_times.tolist()
+    event_kinds = replay.event_kinds.tolist()
+    frame_dts = replay.frame_dts.tolist()
+    next_event = 0
+
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    start = time.perf_counter()
+    with output:
+        mode.enter()
+        rhythm = mode.rhythm_manager
+        rhythm.clock = clock
+        for frame, dt in enumerate(frame_dts):
+            clock.frame = frame
+            while next_event < len(event_frames) and event_frames[next_event] == frame:
+                event_type = SDL_KEYDOWN if event_kinds[next_event] == KEY_DOWN else SDL_KEYUP
+                mode.handle_event(SimEvent(event_type, SDLK_SPACE, event_times[next_event]))
+                next_event += 1
+            game_framework.game_state.dt = dt
+            mode.update()
+        wall = time.perf_counter() - start
+
+        result = {
+            'score': rhythm.score,
+            'max_combo': rhythm.max_combo,
+            'hp': mode.player.hp,
+            'frames': len(frame_dts),
+            'events': len(event_frames),
+            'wall_time': wall,
+            'matches': (rhythm.score, rhythm.max_combo, mode.player.hp) ==
+                       (replay.score, replay.max_combo, replay.hp),
+        }
+        mode.exit()
+    return result
+
+
+def load_replay_chart(replay):
+    """리플레이의 음악/난이도로 채보 가져오기 (채보 캐시 우선)"""
+    from music_analyzer import MusicAnalyzer
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = MusicAnalyzer(replay.music_path)
+        return analyzer.get_chart(difficulty=replay.difficulty, start_delay=replay.start_delay)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리플레이 검증 재생')
+    parser.add_argument('replays', nargs='+', help='리플레이 파일')
+    parser.add_argument('--repeat', type=int, default=1, help='파일마다 반복 재생 횟수 (처리량 측정)')
+    args = parser.parse_args(argv)
+
+    charts = {}
+    failed = 0
+    total_runs = 0
+    total_wall = 0.0
+    for path in args.replays:
+        replay = read_replay(path)
+        key = (replay.music_path, replay.difficulty, replay.start_delay)
+        if key not in charts:
+            charts[key] = load_replay_chart(replay)
+        chart = charts[key]
+        if chart is None:
+            print(f"{path}: 채보를 가져올 수 없음")
+            failed += 1
+            continue
+
+        for _ in range(args.repeat):
+            result = run_replay(replay, chart)
+            total_runs += 1
+            total_wall += result['wall_time']
+        status = 'OK' if result['matches'] else 'MISMATCH'
+        print(f"{path}: 점수 {result['score']} (기록 {replay.score}), 최대 콤보 {result['max_combo']}, "
+              f"HP {result['hp']} | {result['frames']}프레임 {result['wall_time'] * 1000:.1f}ms | {status}")
+        if not result['matches']:
+            failed += 1
+
+    if total_runs:
+        print(f"\n{total_runs}회 재생, 평균 {total_wall / total_runs * 1000:.1f}ms/회")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
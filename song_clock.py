@@ -0,0 +1,100 @@
+"""
+곡 시간 시계 - 오디오 재생 위치(pygame.mixer.music.get_pos)를 따라가는 판정용 시간
+
+time.time() 기준 경과 시간은 mixer가 실제로 소리를 내기 시작한 시점과 무관하므로
+믹서 시작 지연/버퍼 크기만큼 판정이 음악과 어긋난다.
+SongClock은 시작 전 대기(pre-roll) 동안은 단조 시계로 흐르고, 재생이 시작되면
+오디오 위치로 "곡 시간 0초의 단조 시계 시각"(anchor)을 추정해 조금씩 보정한다.
+
+get_pos()는 믹서 버퍼 단위로 띄엄띄엄 증가하므로 값이 바뀐 프레임의 표본만 사용한다.
+값은 이전 프레임과 이번 프레임 사이 어딘가에서 바뀌었으므로 그 중간 시각을 기준으로 삼고,
+표본 오차는 지수 평활로 반영한다. 반환 시간은 역행하지 않는다.
+"""
+import time
+
+DRIFT_GAIN = 0.1  # 표본 하나당 오차 반영 비율
+SNAP_THRESHOLD = 0.25  # 오차가 이보다 크면 (끊김, 재생 재시작 등) 바로 맞춤 (초)
+
+
+class SongClock:
+    """
+    Args:
+        start_delay: 음악 시작 전 대기 시간 (초) - 이 동안 곡 시간은 음수
+        now: 단조 시계 함수 (초) - 테스트/시뮬레이션에서 주입
+    """
+
+    def __init__(self, start_delay, now=time.perf_counter):
+        self.start_delay = start_delay
+        self.now = now
+        self.start_wall = None  # start() 시각
+        self.anchor = None  # 곡 시간 0초에 해당하는 단조 시계 시각
+        self.last_time = None  # 마지막으로 반환한 곡 시간
+        self.last_pos = None  # 마지막으로 사용한 오디오 위치 (ms)
+        self.last_wall = None  # 이전 update() 시각
+
+        # 검증용 통계
+        self.samples = 0  # 보정에 쓴 오디오 위치 표본 수
+        self.snaps = 0  # 바로 맞춘 횟수
+        self.last_error = 0.0  # 마지막 표본의 오차 (초, 양수면 오디오가 늦음)
+
+    @property
+    def started(self):
+        return self.start_wall is not None
+
+    @property
+    def offset(self):
+        """오디오가 단조 시계 일정보다 늦게 나오는 정도 (초) - 믹서 시작 지연 추정치"""
+        if self.anchor is None:
+            return 0.0
+        return self.anchor - (self.start_wall + self.start_delay)
+
+    def start(self):
+        self.start_wall = self.now()
+        self.anchor = self.start_wall + self.start_delay
+        self.last_time = None
+        self.last_pos = None
+        self.last_wall = self.start_wall
+
+    def elapsed(self):
+        """start() 이후 단조 시계 경과 시간 (초)"""
+        return self.now() - self.start_wall
+
+    def time_at(self, wall):
+        """단조 시계 시각 wall에 해당하는 곡 시간 (입력 이벤트 시각 변환용)"""
+        return wall - self.anchor
+
+    def update(self, audio_pos_ms=None):
+        """
+        현재 곡 시간 계산
+
+        Args:
+            audio_pos_ms: 재생 중이면 get_pos() 값 (ms), 재생 전/후면 None 또는 음수
+
+        Returns:
+            float: 곡 시간 (초, 음악 시작 전이면 음수)
+        """
+        wall = self.now()
+        if audio_pos_ms is not None and audio_pos_ms >= 0 and audio_pos_ms != self.last_pos:
+            self.last_pos = audio_pos_ms
+            self.correct((self.last_wall + wall) / 2, audio_pos_ms / 1000.0)
+        self.last_wall = wall
+
+        song_time = wall - self.anchor
+        if self.last_time is not None and song_time < self.last_time:
+            # 보정으로 인해 시간이 되돌아가지 않도록 유지 (다음 프레임부터 천천히 맞춰짐)
+            song_time = self.last_time
+        self.last_time = song_time
+        return song_time
+
+    def correct(self, wall, audio_time):
+        """오디오 위치 표본 하나로 anchor 보정 (wall: 위치가 audio_time이 된 추정 시각)"""
+        error = (wall - audio_time) - self.anchor
+        self.samples += 1
+        self.last_error = error
+        if abs(error) > SNAP_THRESHOLD or self.samples == 1:
+            # 첫 표본은 믹서 시작 지연 자체이므로 바로 반영
+            # (오디오가 늦으면 그만큼 곡 시간이 잠시 멈춰 있다가 이어짐)
+            self.anchor += error
+            self.snaps += 1
+        else:
+            self.anchor += error * DRIFT_GAIN
@@ -3,6 +3,7 @@
 """
 from pico2d import *
 import game_framework
+from asset_manager import ASSETS
 import difficulty_select_mode
 
 class SongSelectMode:
@@ -23,11 +24,13 @@ class SongSelectMode:
         self.title_font = None
         # 배경 이미지 로드
         if self.background is None:
-            self.background = load_image('background.png')
+            self.background = ASSETS.acquire('background.png')
         
     def exit(self):
-        """곡 선택 모드 종료"""
-        pass
+        """곡 선택 모드 종료 - 공유 텍스처 반납"""
+        if self.background:
+            ASSETS.release('background.png')
+            self.background = None
         
     def handle_event(self, event):
         """이벤트 처리"""
@@ -0,0 +1,348 @@
+"""
+텍스처 아틀라스 - 플레이어/이펙트/하트 프레임을 몇 장의 정사각형 텍스처로 다시 묶음
+
+player_die.png처럼 512px 프레임 24개가 한 줄로 된 시트는 폭이 12288px로 흔한 최대 텍스처 크기를
+넘고, 상태마다 다른 텍스처를 바인딩한다. 빌드 단계에서 프레임을 잘라 다시 묶는다.
+
+    - 프레임은 그리는 크기에 맞게 축소 (sprite_cache.pick_divisor, 몸통 1/4, 이펙트 1/2)
+    - 투명한 테두리를 잘라냄 (알파 기준) - 빈 프레임은 크기 0
+    - 높이순 선반(shelf) 배치로 정사각형에 채움 (프레임 사이 ATLAS_PADDING px)
+      한 변은 MAX_ATLAS_SIZE 이하의 2의 거듭제곱 중 MAX_ATLASES장 안에 들어가면서
+      전체 텍스처 크기가 가장 작은 것 (장 수가 적을수록 바인딩 전환이 적음)
+    - 한 시트를 여러 애니메이션이 쓰면 (player_parry_sky / player_sky) 프레임은 한 번만 넣음
+    - 여러 줄 시트는 위 줄부터 한 줄씩 읽음 (열/줄/프레임 수는 sprite_manifest)
+
+매니페스트 (ATLAS_DIR/atlas.json):
+    atlases     아틀라스 PNG 파일 이름 목록
+    sources     원본 시트 경로 -> 내용 해시 (바뀌면 아틀라스를 쓰지 않음)
+    animations  이름 -> {'frame_size': [w, h], 'frames': [[아틀라스, left, bottom, w, h, ox, oy] 또는 null]}
+                좌표는 pico2d 기준 (왼쪽 아래 원점), ox/oy는 원래 프레임 안에서 잘라낸 영역의 위치
+
+실행 중에는 atlas.frame(애니메이션, 번호)로 프레임을 찾아 그린다.
+빌드에는 Pillow가 필요하다. 사용법: python sprite_atlas.py [--max-size 2048]
+"""
+import os
+import sys
+import json
+import argparse
+import analysis_cache
+import sprite_cache
+
+ATLAS_DIR = 'sprite_atlas'
+MANIFEST_FILE = 'atlas.json'
+MANIFEST_VERSION = 1
+MAX_ATLAS_SIZE = 2048  # 아틀라스 한 변 최대 (px) - 대부분의 GPU가 지원하는 크기
+MIN_ATLAS_SIZE = 256
+MAX_ATLASES = 4
+ATLAS_PADDING = 2  # 프레임 사이 여백 (선형 필터링 시 옆 프레임이 번지지 않도록)
+
+
+class AtlasFrame:
+    """아틀라스 안의 프레임 하나"""
+    __slots__ = ('atlas', 'left', 'bottom', 'width', 'height', 'offset_x', 'offset_y', 'frame_width', 'frame_height')
+
+    def __init__(self, atlas, left, bottom, width, height, offset_x, offset_y, frame_width, frame_height):
+        self.atlas = atlas
+        self.left = left
+        self.bottom = bottom
+        self.width = width
+        self.height = height
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+
+    def draw(self, image, x, y, draw_width, draw_height):
+        """원래 프레임을 (x, y) 중심에 draw_width x draw_height로 그린 것과 같게 그림"""
+        sx = draw_width / self.frame_width
+        sy = draw_height / self.frame_height
+        cx = x - draw_width / 2 + (self.offset_x + self.width / 2) * sx
+        cy = y - draw_height / 2 + (self.offset_y + self.height / 2) * sy
+        image.clip_draw(self.left, self.bottom, self.width, self.height,
+                        int(cx), int(cy), int(self.width * sx), int(self.height * sy))
+
+
+class SpriteAtlas:
+    """
+    매니페스트로 만든 (애니메이션, 번호) -> 프레임 조회
+
+    아틀라스 이미지는 처음 그릴 때 SPRITES/ASSETS로 로드하고 프로세스가 끝날 때까지 유지한다.
+    """
+
+    def __init__(self, manifest, atlas_dir=ATLAS_DIR):
+        self.atlas_dir = atlas_dir
+        self.paths = [os.path.join(atlas_dir, name) for name in manifest['atlases']]
+        self.images = [None] * len(self.paths)
+        self.animations = {}
+        for name, anim in manifest['animations'].items():
+            frame_width, frame_height = anim['frame_size']
+            self.animations[name] = [
+                AtlasFrame(*rect, frame_width, frame_height) if rect else None
+                for rect in anim['frames']
+            ]
+
+    @classmethod
+    def load(cls, atlas_dir=ATLAS_DIR):
+        """
+        매니페스트가 있고 원본 시트가 바뀌지 않았으면 SpriteAtlas, 아니면 None
+        """
+        try:
+            with open(os.path.join(atlas_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != MANIFEST_VERSION:
+            return None
+        try:
+            index = analysis_cache.FileHashIndex.for_dir(atlas_dir)
+            for path, source_hash in manifest['sources'].items():
+                if index.get_hash(path) != source_hash:
+                    print(f"아틀라스가 오래됨 ({path} 변경) - 시트를 그대로 사용")
+                    return None
+        except OSError:
+            return None
+        return cls(manifest, atlas_dir)
+
+    def has(self, animation):
+        return animation in self.animations
+
+    def frame(self, animation, index):
+        """프레임 조회 (없거나 빈 프레임이면 None)"""
+        frames = self.animations.get(animation)
+        if frames is None or not 0 <= index < len(frames):
+            return None
+        return frames[index]
+
+    def atlas_paths(self, animations):
+        """애니메이션들이 쓰는 아틀라스 파일 (prefetch 힌트용)"""
+        used = {frame.atlas for name in animations for frame in self.animations.get(name, ()) if frame}
+        return [self.paths[i] for i in sorted(used)]
+
+    def image(self, atlas):
+        if self.images[atlas] is None:
+            from asset_manager import ASSETS
+            from sprite_loader import SPRITES
+            path = self.paths[atlas]
+            SPRITES.load(path)
+            self.images[atlas] = ASSETS.acquire(path)
+        return self.images[atlas]
+
+    def draw(self, animation, index, x, y, draw_width, draw_height):
+        """프레임 그리기 (빈 프레임이면 아무것도 그리지 않음)"""
+        frame = self.frame(animation, index)
+        if frame is not None:
+            frame.draw(self.image(frame.atlas), x, y, draw_width, draw_height)
+
+
+_atlas = None
+_atlas_loaded = False
+
+
+def get_atlas():
+    """프로세스에서 함께 쓰는 아틀라스 (빌드하지 않았으면 None)"""
+    global _atlas, _atlas_loaded
+    if not _atlas_loaded:
+        _atlas = SpriteAtlas.load()
+        _atlas_loaded = True
+    return _atlas
+
+
+# ---------------------------------------------------------------- 빌드
+
+
+def atlas_sources():
+    """
+    아틀라스에 넣을 애니메이션
+
+    Returns:
+        dict: 이름 -> (원본 경로, 프레임 크기, 한 줄 프레임 수, 총 프레임 수, 그리기 배율)
+    """
+    from player import SPRITE_SHEETS
+    from ui import HEART_SCALE
+    from sprite_manifest import get_manifest, game_animations
+    manifest = get_manifest()
+    sources = {}
+    for name, (path, frame_size, declared) in game_animations().items():
+        layout = manifest.layout(path, frame_size, frame_size, declared, name)
+        draw_scale = SPRITE_SHEETS[name][2] if name in SPRITE_SHEETS else HEART_SCALE
+        sources[name] = (path, frame_size, layout['columns'], layout['frames'], draw_scale)
+    manifest.save()
+    return sources
+
+
+def slice_frames(path, frame_size, per_row, total, draw_scale):
+    """
+    시트를 그리는 크기에 맞게 축소한 뒤 프레임별로 잘라 투명 테두리 제거
+
+    Returns:
+        (프레임 크기, [(이미지 또는 None, ox, oy)]) - ox/oy는 pico2d 기준 (왼쪽 아래)
+    """
+    from PIL import Image
+    divisor = sprite_cache.pick_divisor(frame_size, frame_size, draw_scale)
+    with Image.open(path) as source:
+        sheet = source.convert('RGBA')
+    if divisor > 1:
+        sheet = sprite_cache.downscale(sheet, divisor)
+    size = frame_size // divisor
+    frames = []
+    for index in range(total):
+        left, top = (index % per_row) * size, (index // per_row) * size
+        if left + size > sheet.width or top + size > sheet.height:
+            frames.append((None, 0, 0))  # 시트 밖
+            continue
+        cell = sheet.crop((left, top, left + size, top + size))
+        bbox = cell.getchannel('A').getbbox()
+        if bbox is None:
+            frames.append((None, 0, 0))
+            continue
+        x0, y0, x1, y1 = bbox
+        frames.append((cell.crop(bbox), x0, size - y1))
+    return size, frames
+
+
+def pack_shelves(sizes, atlas_size, padding):
+    """
+    높이순 선반 배치 (그룹 순서대로 - 같이 그리는 프레임이 같은 아틀라스에 모이도록)
+
+    Args:
+        sizes: [(키, w, h, 그룹)]
+
+    Returns:
+        dict: 키 -> (아틀라스 번호, x, y) - y는 위쪽 원점
+    """
+    placements = {}
+    atlas, x, y, shelf_height = 0, 0, 0, 0
+    for key, w, h, _ in sorted(sizes, key=lambda item: (item[3], -item[2], -item[1])):
+        if w + padding > atlas_size or h + padding > atlas_size:
+            raise ValueError(f"프레임이 아틀라스보다 큼: {key} ({w}x{h})")
+        if x + w + padding > atlas_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + h + padding > atlas_size:
+            atlas, x, y, shelf_height = atlas + 1, 0, 0, 0
+        placements[key] = (atlas, x + padding // 2, y + padding // 2)
+        x += w + padding
+        shelf_height = max(shelf_height, h + padding)
+    return placements
+
+
+def choose_layout(sizes, max_size=MAX_ATLAS_SIZE, padding=ATLAS_PADDING):
+    """
+    MAX_ATLASES장 안에 들어가는 배치 중 전체 텍스처 크기(장 수 x 한 변^2)가 가장 작은 것
+    (같으면 장 수가 적은 쪽, 어느 크기도 MAX_ATLASES장을 넘으면 가장 큰 크기)
+
+    Returns:
+        (한 변, 장 수, 배치)
+    """
+    layouts = []
+    size = MIN_ATLAS_SIZE
+    while size <= max_size:
+        try:
+            placements = pack_shelves(sizes, size, padding)
+        except ValueError:
+            size *= 2
+            continue
+        count = max((atlas for atlas, _, _ in placements.values()), default=-1) + 1
+        over = count > MAX_ATLASES
+        rank = (over, -size if over else count * size * size, count)
+        layouts.append((rank, size, count, placements))
+        size *= 2
+    if not layouts:
+        raise ValueError(f"프레임이 최대 아틀라스 크기({max_size})보다 큼")
+    _, size, count, placements = min(layouts, key=lambda layout: layout[0])
+    return size, count, placements
+
+
+def build_atlas(atlas_dir=ATLAS_DIR, max_size=MAX_ATLAS_SIZE, padding=ATLAS_PADDING):
+    """
+    아틀라스 PNG와 매니페스트 생성
+
+    Returns:
+        dict: 매니페스트
+    """
+    from PIL import Image
+
+    sources = atlas_sources()
+    os.makedirs(atlas_dir, exist_ok=True)
+    index = analysis_cache.FileHashIndex.for_dir(atlas_dir)
+
+    # 같은 원본 + 같은 축소는 한 번만 자름 (프레임 수가 가장 많은 선언 기준)
+    sliced = {}
+    for path, frame_size, per_row, total, draw_scale in sources.values():
+        key = (path, frame_size, draw_scale)
+        if key not in sliced or len(sliced[key][1]) < total:
+            sliced[key] = slice_frames(path, frame_size, per_row, total, draw_scale)
+
+    # 몸통/하트(작은 프레임)를 먼저, 이펙트를 나중에 배치
+    sizes = [((key, i), image.width, image.height, size)
+             for key, (size, frames) in sliced.items()
+             for i, (image, _, _) in enumerate(frames) if image is not None]
+    atlas_size, n_atlases, placements = choose_layout(sizes, max_size, padding)
+
+    atlases = [Image.new('RGBA', (atlas_size, atlas_size), (0, 0, 0, 0)) for _ in range(n_atlases)]
+    for (key, i), (atlas, x, y) in placements.items():
+        atlases[atlas].paste(sliced[key][1][i][0], (x, y))
+
+    names = []
+    for atlas, image in enumerate(atlases):
+        name = f"atlas_{atlas}.png"
+        tmp_path = os.path.join(atlas_dir, name + '.tmp')
+        image.save(tmp_path, format='PNG', optimize=True)
+        os.replace(tmp_path, os.path.join(atlas_dir, name))
+        names.append(name)
+    for filename in os.listdir(atlas_dir):
+        if filename.startswith('atlas_') and filename.endswith('.png') and filename not in names:
+            os.remove(os.path.join(atlas_dir, filename))  # 이전 빌드에서 남은 아틀라스
+
+    animations = {}
+    for name, (path, frame_size, per_row, total, draw_scale) in sources.items():
+        key = (path, frame_size, draw_scale)
+        size, frames = sliced[key]
+        rects = []
+        for i in range(total):
+            image, ox, oy = frames[i]
+            if image is None:
+                rects.append(None)
+                continue
+            atlas, x, y = placements[(key, i)]
+            # 위쪽 원점 -> pico2d 왼쪽 아래 원점
+            rects.append([atlas, x, atlas_size - (y + image.height), image.width, image.height, ox, oy])
+        animations[name] = {'frame_size': [size, size], 'frames': rects}
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'atlas_size': atlas_size,
+        'atlases': names,
+        'sources': {path: index.get_hash(path) for path in sorted({s[0] for s in sources.values()})},
+        'animations': animations,
+    }
+    manifest_path = os.path.join(atlas_dir, MANIFEST_FILE)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='플레이어/이펙트/하트 텍스처 아틀라스 생성')
+    parser.add_argument('--atlas-dir', default=ATLAS_DIR)
+    parser.add_argument('--max-size', type=int, default=MAX_ATLAS_SIZE, help='아틀라스 한 변 최대 (px)')
+    parser.add_argument('--padding', type=int, default=ATLAS_PADDING)
+    args = parser.parse_args(argv)
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("Pillow가 필요함: pip install pillow")
+        return 1
+
+    manifest = build_atlas(args.atlas_dir, args.max_size, args.padding)
+    frames = sum(1 for anim in manifest['animations'].values() for rect in anim['frames'] if rect)
+    size = manifest['atlas_size']
+    print(f"아틀라스 {len(manifest['atlases'])}장 ({size}x{size}), "
+          f"애니메이션 {len(manifest['animations'])}개, 프레임 {frames}개 -> {args.atlas_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
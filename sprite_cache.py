@@ -0,0 +1,162 @@
+"""
+축소 스프라이트 시트 캐시 - 그리는 크기에 맞춘 시트를 미리 만들어 두고 로드 시 선택
+
+플레이어 시트는 프레임이 512px인데 0.25배(128px)로, 이펙트는 0.5배(256px)로 그려진다.
+원본을 그대로 올리면 화면에 보이는 것보다 4~16배 많은 텍셀을 업로드/샘플링하므로
+빌드 단계에서 1/2, 1/4 크기 시트를 만들어 SPRITE_CACHE_DIR에 저장한다.
+
+    - 파일 이름: <원본 이름>.<원본 내용 해시 앞 16자>.<축소 배수>x.png
+      (원본이 바뀌면 해시가 바뀌므로 예전 캐시는 자동으로 쓰이지 않음)
+    - 해시는 analysis_cache.FileHashIndex로 구해서 실행 중에는 stat만 확인
+    - 축소는 프리멀티플라이드 알파에서 박스 필터 (투명 경계가 어두워지지 않음)
+      프레임 크기가 배수로 나누어떨어지므로 프레임끼리 섞이지 않는다.
+
+실행 중에는 select_variant()가 그리는 크기 이상인 가장 작은 캐시를 고르고,
+캐시가 없으면 원본을 쓴다 (빌드하지 않아도 게임은 그대로 동작).
+
+빌드에는 Pillow가 필요하다 (게임 실행에는 필요 없음).
+사용법: python sprite_cache.py [시트 파일들...] [--clean]
+"""
+import os
+import sys
+import argparse
+import analysis_cache
+
+SPRITE_CACHE_DIR = 'sprite_cache'
+SCALE_DIVISORS = (2, 4)  # 만들어 둘 축소 배수 (1/2, 1/4)
+
+
+def variant_path(source_path, source_hash, divisor, cache_dir=SPRITE_CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir, f"{stem}.{source_hash[:16]}.{divisor}x.png")
+
+
+def pick_divisor(frame_width, frame_height, draw_scale, divisors=SCALE_DIVISORS):
+    """
+    그리는 크기보다 작아지지 않는 가장 큰 축소 배수 (확대해서 그리는 일이 없도록)
+
+    Returns:
+        int: 축소 배수 (1이면 원본)
+    """
+    best = 1
+    for divisor in divisors:
+        if frame_width % divisor or frame_height % divisor:
+            continue
+        if (frame_width // divisor >= frame_width * draw_scale and
+                frame_height // divisor >= frame_height * draw_scale):
+            best = max(best, divisor)
+    return best
+
+
+def select_variant(source_path, frame_width, frame_height, draw_scale, cache_dir=SPRITE_CACHE_DIR):
+    """
+    그리는 배율에 맞는 시트 파일 선택
+
+    Args:
+        source_path: 원본 시트 경로
+        frame_width, frame_height: 원본 프레임 크기 (px)
+        draw_scale: 원본 프레임 대비 화면에 그리는 배율
+
+    Returns:
+        (경로, 축소 배수): 캐시가 없으면 (source_path, 1)
+    """
+    divisor = pick_divisor(frame_width, frame_height, draw_scale)
+    if divisor == 1 or not os.path.isdir(cache_dir):
+        return source_path, 1
+    try:
+        source_hash = analysis_cache.FileHashIndex.for_dir(cache_dir).get_hash(source_path)
+    except OSError:
+        return source_path, 1
+
+    # 원하는 배수가 없으면 더 작은 배수(더 큰 시트) 중 있는 것을 사용
+    for candidate in sorted((d for d in SCALE_DIVISORS if d <= divisor), reverse=True):
+        path = variant_path(source_path, source_hash, candidate, cache_dir)
+        if os.path.exists(path):
+            return path, candidate
+    return source_path, 1
+
+
+def downscale(image, divisor):
+    """RGBA 이미지를 1/divisor로 축소 (프리멀티플라이드 알파 박스 필터)"""
+    return image.convert('RGBa').reduce(divisor).convert('RGBA')
+
+
+def build_variants(source_path, cache_dir=SPRITE_CACHE_DIR, divisors=SCALE_DIVISORS):
+    """
+    원본 시트 하나의 축소 캐시 생성 (이미 있으면 건너뜀)
+
+    Returns:
+        list: (축소 배수, 경로, 새로 만들었는지)
+    """
+    from PIL import Image
+
+    os.makedirs(cache_dir, exist_ok=True)
+    source_hash = analysis_cache.FileHashIndex.for_dir(cache_dir).get_hash(source_path)
+    results = []
+    image = None
+    for divisor in divisors:
+        path = variant_path(source_path, source_hash, divisor, cache_dir)
+        if os.path.exists(path):
+            results.append((divisor, path, False))
+            continue
+        if image is None:
+            image = Image.open(source_path)
+            image.load()
+        if image.width % divisor or image.height % divisor:
+            continue
+        tmp_path = path + '.tmp'
+        downscale(image, divisor).save(tmp_path, format='PNG', optimize=True)
+        os.replace(tmp_path, path)
+        results.append((divisor, path, True))
+    return results
+
+
+def clean_stale(cache_dir=SPRITE_CACHE_DIR, keep=()):
+    """keep에 없는 캐시 PNG 삭제 (원본이 바뀌어 쓰이지 않는 예전 캐시)"""
+    keep = {os.path.normcase(os.path.abspath(path)) for path in keep}
+    removed = 0
+    for filename in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, filename)
+        if filename.endswith('.png') and os.path.normcase(os.path.abspath(path)) not in keep:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def game_sheets():
+    """게임에서 쓰는 시트 경로 (플레이어/이펙트 + 하트)"""
+    from player import SPRITE_SHEETS
+    from ui import HEART_SHEET
+    paths = [spec[0] for spec in SPRITE_SHEETS.values()] + [HEART_SHEET]
+    return list(dict.fromkeys(paths))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='축소 스프라이트 시트 캐시 생성')
+    parser.add_argument('sheets', nargs='*', help='원본 시트 (생략하면 게임에서 쓰는 시트 전체)')
+    parser.add_argument('--cache-dir', default=SPRITE_CACHE_DIR)
+    parser.add_argument('--clean', action='store_true', help='쓰이지 않는 예전 캐시 삭제')
+    args = parser.parse_args(argv)
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("Pillow가 필요함: pip install pillow")
+        return 1
+
+    sheets = args.sheets or game_sheets()
+    built = []
+    for source_path in sheets:
+        for divisor, path, created in build_variants(source_path, args.cache_dir):
+            built.append(path)
+            status = '생성' if created else '있음'
+            print(f"  [{status}] {os.path.basename(source_path)} 1/{divisor} -> "
+                  f"{os.path.basename(path)} ({os.path.getsize(path) / 1024:.0f}KB)")
+    if args.clean:
+        print(f"예전 캐시 {clean_stale(args.cache_dir, built)}개 삭제")
+    print(f"축소 시트 {len(built)}개 ({len(sheets)}개 원본)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+스프라이트 지연 로드 / 백그라운드 디코드
+
+load_image는 파일 읽기, PNG 디코드, 텍스처 업로드를 한 번에 메인 스레드에서 한다.
+여기서는 이를 둘로 나눈다.
+
+    - 백그라운드 스레드: 파일 읽기 + 디코드 (IMG_Load -> SDL_Surface)
+      ctypes 호출 중에는 GIL이 풀리므로 메인 루프와 실제로 병렬로 돈다.
+      컴파일된 텍스처(texture_cache, .tex)가 있으면 디코드 없이 파일을 매핑해서 서피스로 감싼다.
+    - 메인 스레드: 텍스처 업로드 (SDL_CreateTextureFromSurface) - 렌더러는 메인 스레드 전용
+
+    prefetch(paths)  곧 쓸 것 같은 시트를 백그라운드 디코드 대기열에 넣음 (힌트, 바로 반환)
+    pump()           매 프레임 디코드가 끝난 시트를 몇 개씩 업로드하여 ASSETS에 등록
+    load(path)       지금 당장 필요할 때 - 디코드 중이면 기다리고, 대기열에 없으면 직접 디코드
+
+업로드된 텍스처는 ASSETS에 참조 없이 등록되므로 쓰는 쪽은 ASSETS.acquire로 가져간다.
+"""
+import time
+import queue
+import threading
+import pico2d.pico2d as canvas  # renderer는 open_canvas()가 이 모듈 전역에 만듦
+from pico2d import Image
+from sdl2 import (SDL_CreateTextureFromSurface, SDL_CreateRGBSurfaceWithFormatFrom, SDL_FreeSurface,
+                  SDL_PIXELFORMAT_RGBA32)
+from sdl2.sdlimage import IMG_Load
+import texture_cache
+from asset_manager import ASSETS
+
+UPLOADS_PER_FRAME = 2  # pump() 한 번에 업로드할 최대 시트 수 (프레임 끊김 방지)
+
+
+class MappedSurface:
+    """컴파일된 텍스처 매핑을 픽셀 복사 없이 감싼 서피스 (서피스를 먼저 해제하고 매핑을 닫음)"""
+
+    __slots__ = ('surface', 'mapped')
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+        self.surface = SDL_CreateRGBSurfaceWithFormatFrom(
+            mapped.address, mapped.width, mapped.height, 32, mapped.pitch, SDL_PIXELFORMAT_RGBA32)
+        if not self.surface:
+            mapped.close()
+            raise IOError(f"cannot wrap {mapped.path}")
+
+    def free(self):
+        SDL_FreeSurface(self.surface)
+        self.mapped.close()
+
+
+def decode_surface(path):
+    """파일 읽기 + 디코드 (백그라운드 스레드에서 호출, .tex가 있으면 매핑만)"""
+    mapped = texture_cache.map_texture(path)
+    if mapped is not None:
+        return MappedSurface(mapped)
+    surface = IMG_Load(path.encode('UTF-8'))
+    if not surface:
+        raise IOError(f"cannot load {path}")
+    return surface
+
+
+def upload_surface(surface):
+    """디코드된 서피스를 텍스처로 업로드 (메인 스레드 전용)"""
+    if isinstance(surface, MappedSurface):
+        texture = SDL_CreateTextureFromSurface(canvas.renderer, surface.surface)
+    else:
+        texture = SDL_CreateTextureFromSurface(canvas.renderer, surface)
+    free_surface(surface)
+    if not texture:
+        raise IOError("cannot create texture")
+    return Image(texture)
+
+
+def free_surface(surface):
+    if isinstance(surface, MappedSurface):
+        surface.free()
+    else:
+        SDL_FreeSurface(surface)
+
+
+class SpriteLoader:
+    """
+    Args:
+        assets: 업로드한 텍스처를 등록할 AssetManager
+        decode: 경로 -> 디코드 결과 (백그라운드 스레드)
+        upload: 디코드 결과 -> 이미지 (메인 스레드)
+        discard: 업로드하지 않고 버리는 디코드 결과 정리
+    """
+
+    def __init__(self, assets=ASSETS, decode=decode_surface, upload=upload_surface, discard=free_surface):
+        self.assets = assets
+        self.decode = decode
+        self.upload = upload
+        self.discard = discard
+        self.requests = queue.Queue()
+        self.thread = None
+        self.cond = threading.Condition()
+        self.pending = set()  # 대기열에 있거나 디코드 중인 경로 (정규화 키)
+        self.decoded = {}  # 키 -> (경로, 디코드 결과, 예외)
+        # 통계
+        self.background_decodes = 0  # 백그라운드 스레드에서 디코드한 시트 수
+        self.inline_decodes = 0  # 힌트 없이 메인 스레드에서 직접 디코드한 수
+        self.waits = 0  # 백그라운드 디코드가 끝나기를 기다린 횟수
+        self.wait_time = 0.0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._worker, name='sprite-loader', daemon=True)
+            self.thread.start()
+
+    def _worker(self):
+        while True:
+            key, path = self.requests.get()
+            surface, error = None, None
+            try:
+                surface = self.decode(path)
+            except Exception as e:
+                error = e
+            with self.cond:
+                self.pending.discard(key)
+                self.decoded[key] = (path, surface, error)
+                self.background_decodes += 1
+                self.cond.notify_all()
+
+    def prefetch(self, paths):
+        """곧 쓸 시트를 백그라운드에서 디코드 (이미 로드/요청된 것은 무시)"""
+        with self.cond:
+            for path in paths:
+                key = self.assets.key(path)
+                if key in self.pending or key in self.decoded or self.assets.is_loaded(path):
+                    continue
+                self.pending.add(key)
+                self.requests.put((key, path))
+        self.start()
+
+    def pump(self, max_uploads=UPLOADS_PER_FRAME):
+        """디코드가 끝난 시트 업로드 (메인 스레드, 매 프레임)"""
+        uploaded = 0
+        while uploaded < max_uploads:
+            with self.cond:
+                if not self.decoded:
+                    break
+                key = next(iter(self.decoded))
+                path, surface, error = self.decoded.pop(key)
+            if error is not None:
+                print(f"스프라이트 디코드 실패: {path} ({error})")
+                continue
+            if self.assets.is_loaded(path):
+                self.discard(surface)
+                continue
+            self.assets.add(path, self.upload(surface))
+            uploaded += 1
+        return uploaded
+
+    def load(self, path):
+        """
+        지금 필요한 시트를 ASSETS에 올림 (메인 스레드, 끝날 때까지 블록)
+
+        Raises:
+            디코드/업로드 실패 예외
+        """
+        if self.assets.is_loaded(path):
+            return
+        key = self.assets.key(path)
+        with self.cond:
+            if key in self.pending:
+                self.waits += 1
+                start = time.perf_counter()
+                while key in self.pending:
+                    self.cond.wait()
+                self.wait_time += time.perf_counter() - start
+            result = self.decoded.pop(key, None)
+        if result is not None:
+            _, surface, error = result
+            if error is not None:
+                raise error
+        else:
+            self.inline_decodes += 1
+            surface = self.decode(path)
+        self.assets.add(path, self.upload(surface))
+
+    def clear(self):
+        """업로드하지 않은 디코드 결과 버림 (대기열은 그대로)"""
+        with self.cond:
+            decoded, self.decoded = self.decoded, {}
+        for _, surface, error in decoded.values():
+            if error is None:
+                self.discard(surface)
+
+
+# 플레이어 시트 등 지연 로드에 함께 쓰는 로더
+SPRITES = SpriteLoader()
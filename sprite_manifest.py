@@ -0,0 +1,195 @@
+"""
+스프라이트 시트 매니페스트 - PNG 헤더(IHDR)만 읽어 프레임 격자를 구하고 캐시
+
+시트 정보(한 줄 프레임 수, 줄 수, 총 프레임 수)를 코드에 직접 적으면 파일과 어긋나기 쉽다
+(예전 표에는 같은 player_parry_sky.png가 8프레임과 14프레임으로 두 번 적혀 있었음).
+여기서는 파일에서 직접 구한다.
+
+    - PNG 시그니처 바로 뒤의 IHDR 청크에서 폭/높이만 읽음 (33바이트, 픽셀은 디코드하지 않음)
+    - 프레임 크기(플레이어/이펙트 512px, 하트 256px 정사각형)로 나누어 열/줄 수를 구함
+      나누어떨어지지 않으면 ValueError
+    - 총 프레임 수는 열 x 줄. 마지막 줄이 다 차지 않은 시트만 실제 프레임 수를 따로 적는다
+      (헤더만으로는 빈 칸을 알 수 없음 - player.FRAME_COUNTS). 격자와 맞지 않으면 경고 후 격자에 맞춤
+
+결과는 MANIFEST_PATH에 시트 경로 -> {stat, 폭/높이, 프레임 크기, 열/줄}로 저장한다.
+실행 중에는 stat(파일을 열지 않음)이 같으면 저장된 값을 쓰고, 바뀐 시트만 헤더를 다시 읽는다.
+매니페스트가 없으면 처음 조회할 때 만들어지므로 미리 만들지 않아도 게임은 동작한다.
+
+사용법: python sprite_manifest.py  (게임에서 쓰는 시트를 모두 기록하고 격자를 출력)
+"""
+import os
+import sys
+import json
+import struct
+
+MANIFEST_PATH = os.path.join('sprite_sheets', 'manifest.json')
+MANIFEST_VERSION = 1
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+IHDR = struct.Struct('>I4sII')  # 청크 길이, 청크 종류, 폭, 높이
+
+
+def read_png_size(path):
+    """
+    PNG 헤더에서 (폭, 높이)만 읽음
+
+    Raises:
+        OSError: 파일을 읽을 수 없음
+        ValueError: PNG가 아님
+    """
+    with open(path, 'rb') as f:
+        data = f.read(len(PNG_SIGNATURE) + IHDR.size)
+    if len(data) < len(PNG_SIGNATURE) + IHDR.size or not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"PNG 파일이 아님: {path}")
+    length, chunk_type, width, height = IHDR.unpack_from(data, len(PNG_SIGNATURE))
+    if chunk_type != b'IHDR' or length != 13:
+        raise ValueError(f"IHDR 청크가 없음: {path}")
+    return width, height
+
+
+def detect_grid(width, height, frame_width, frame_height):
+    """
+    시트 크기와 프레임 크기로 (열 수, 줄 수) 계산
+
+    Raises:
+        ValueError: 시트 크기가 프레임 크기로 나누어떨어지지 않음
+    """
+    if width % frame_width or height % frame_height:
+        raise ValueError(f"시트 {width}x{height}가 프레임 {frame_width}x{frame_height}로 나누어떨어지지 않음")
+    return width // frame_width, height // frame_height
+
+
+def frame_count(grid, declared=None, name=''):
+    """
+    애니메이션 프레임 수 (declared가 없으면 격자 전체)
+
+    declared는 마지막 줄 안에 있어야 한다 (앞 줄까지 다 차 있고 격자를 넘지 않음).
+    """
+    columns, rows = grid['columns'], grid['rows']
+    capacity = columns * rows
+    if declared is None:
+        return capacity
+    if not capacity - columns < declared <= capacity:
+        fixed = min(declared, capacity)
+        print(f"시트 프레임 수가 격자와 맞지 않음: {name} {declared}프레임, 격자 {columns}x{rows} -> {fixed}프레임")
+        return fixed
+    return declared
+
+
+class SpriteManifest:
+    """시트 경로 -> 프레임 격자 (PNG 헤더 기준, stat이 같으면 파일을 열지 않음)"""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.sheets = None  # 처음 사용할 때 로드
+        self.dirty = False
+        self.hits = 0
+        self.header_reads = 0
+
+    def load(self):
+        self.sheets = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.sheets = data.get('sheets', {})
+
+    def save(self):
+        """바뀐 내용이 있으면 저장 (실패해도 게임은 계속)"""
+        if not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'sheets': self.sheets}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"스프라이트 매니페스트 저장 실패: {e}")
+
+    def grid(self, path, frame_width, frame_height):
+        """
+        시트의 프레임 격자
+
+        Returns:
+            dict: width, height, frame_width, frame_height, columns, rows
+
+        Raises:
+            OSError, ValueError: 시트를 읽을 수 없거나 격자가 맞지 않음
+        """
+        if self.sheets is None:
+            self.load()
+        st = os.stat(path)
+        stat_info = [st.st_size, st.st_mtime_ns]
+        entry = self.sheets.get(path)
+        if (entry and entry['stat'] == stat_info and
+                (entry['frame_width'], entry['frame_height']) == (frame_width, frame_height)):
+            self.hits += 1
+            return entry
+
+        self.header_reads += 1
+        width, height = read_png_size(path)
+        columns, rows = detect_grid(width, height, frame_width, frame_height)
+        entry = {
+            'stat': stat_info,
+            'width': width,
+            'height': height,
+            'frame_width': frame_width,
+            'frame_height': frame_height,
+            'columns': columns,
+            'rows': rows,
+        }
+        self.sheets[path] = entry
+        self.dirty = True
+        return entry
+
+    def layout(self, path, frame_width, frame_height, declared=None, name=''):
+        """격자 + 애니메이션 프레임 수 (frames 키 추가)"""
+        grid = self.grid(path, frame_width, frame_height)
+        return dict(grid, frames=frame_count(grid, declared, name or path))
+
+
+_manifest = None
+
+
+def get_manifest():
+    """프로세스에서 함께 쓰는 매니페스트"""
+    global _manifest
+    if _manifest is None:
+        _manifest = SpriteManifest()
+    return _manifest
+
+
+def game_animations():
+    """
+    게임에서 쓰는 애니메이션
+
+    Returns:
+        dict: 이름 -> (시트 경로, 프레임 크기, 따로 적은 프레임 수 또는 None)
+    """
+    from player import SPRITE_SHEETS, SPRITE_SIZE, FRAME_COUNTS
+    from ui import HEART_SHEET, HEART_FRAME_SIZE
+    animations = {name: (path, SPRITE_SIZE, FRAME_COUNTS.get(name))
+                  for name, (path, _, _) in SPRITE_SHEETS.items()}
+    animations['heart'] = (HEART_SHEET, HEART_FRAME_SIZE, None)
+    return animations
+
+
+def main():
+    manifest = get_manifest()
+    print(f"{'애니메이션':22} | {'시트':40} | {'크기':>11} | {'격자':>5} | 프레임")
+    print("-" * 96)
+    for name, (path, frame_size, declared) in game_animations().items():
+        layout = manifest.layout(path, frame_size, frame_size, declared, name)
+        size = f"{layout['width']}x{layout['height']}"
+        grid = f"{layout['columns']}x{layout['rows']}"
+        print(f"{name:22} | {os.path.basename(path):40} | {size:>11} | {grid:>5} | {layout['frames']}")
+    manifest.save()
+    print(f"-> {manifest.path} (헤더 읽음 {manifest.header_reads}개, 캐시 {manifest.hits}개)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,30 @@
+from music_analyzer import MusicAnalyzer, HOP_LENGTH, ANALYSIS_SR
+import numpy as np
+
+songs = ['Lady Ethereal.mp3', 'M2U.mp3', 'Shaolin Warrior.mp3']
+
+# 허용 오차: 1 프레임
+tolerance = HOP_LENGTH / ANALYSIS_SR
+
+print("\n=== 스트리밍 분석 비교 테스트 ===\n")
+
+for song in songs:
+    full = MusicAnalyzer(f'music/{song}')
+    full.save_to_cache = lambda: False  # 캐시를 거치지 않고 직접 분석
+    full.load_from_cache = lambda: False
+    full.load_and_analyze()
+
+    stream = MusicAnalyzer(f'music/{song}', streaming=True)
+    stream.save_to_cache = lambda: False
+    stream.load_from_cache = lambda: False
+    stream.load_and_analyze()
+
+    for name in ['beat_times', 'onset_times']:
+        a = getattr(full, name)
+        b = getattr(stream, name)
+        if len(a) == len(b):
+            max_diff = np.abs(a - b).max() if len(a) else 0.0
+            result = 'OK' if max_diff <= tolerance else 'FAIL'
+            print(f"{song:25} | {name:12} | {len(a):5}개 | 최대 오차: {max_diff * 1000:.1f}ms | {result}")
+        else:
+            print(f"{song:25} | {name:12} | 개수 불일치: {len(a)} vs {len(b)} | FAIL")
@@ -0,0 +1,210 @@
+"""
+컴파일된 텍스처 (.tex) - PNG 대신 디코드 없이 바로 업로드하는 RGBA 픽셀 파일
+
+PNG는 로드할 때마다 zlib 압축 해제 + 행 필터 복원을 거치고, 이것이 시트 로드 시간의 대부분이다.
+빌드 단계에서 픽셀을 풀어 원본 옆에 저장해 두고, 실행 중에는 파일을 메모리 매핑하여
+그 버퍼를 그대로 서피스로 감싸 업로드한다 (sprite_loader.decode_surface).
+
+    - 파일 이름: <원본 이름>.<원본 내용 해시 앞 16자>.tex (원본과 같은 폴더)
+    - 헤더 HEADER_SIZE 바이트: 매직, 버전, 폭, 높이, 원본 크기 / 수정 시각, 원본 MD5
+      원본 stat이 헤더와 같으면 해싱 없이 사용하고, 다르면 원본을 해싱해서 확인
+      (git checkout 등으로 수정 시각만 바뀐 경우 헤더의 stat을 갱신)
+    - 픽셀: RGBA8 (SDL_PIXELFORMAT_RGBA32), 맨 위 행부터, 알파 프리멀티플라이 안 함
+    - 압축하지 않음: 압축 해제도 없어 가장 빠르지만 디스크는 폭 x 높이 x 4바이트
+      (축소 캐시 + 아틀라스 기준 수십 MB, 원본 시트를 그대로 쓰면 약 150MB)
+
+.tex가 없거나 원본과 맞지 않으면 map_texture()가 None을 돌려주고 로더는 PNG를 그대로 쓴다
+(빌드하지 않아도 게임은 그대로 동작).
+
+빌드에는 Pillow가 필요하다 (게임 실행에는 필요 없음).
+sprite_cache.py, sprite_atlas.py를 먼저 실행해야 그 결과물도 컴파일된다.
+사용법: python texture_cache.py [PNG 파일들...]
+"""
+import os
+import re
+import sys
+import mmap
+import ctypes
+import struct
+import argparse
+import analysis_cache
+
+TEXTURE_EXT = '.tex'
+TEXTURE_MAGIC = b'RTEX'
+TEXTURE_VERSION = 1
+HEADER = struct.Struct('<4sHHIIQQ16s')  # 매직, 버전, 예약, 폭, 높이, 원본 크기, 원본 수정 시각, 원본 MD5
+HEADER_SIZE = 64  # 픽셀 시작 위치 (정렬을 위해 헤더 뒤를 0으로 채움)
+STAT_OFFSET = 16  # 헤더 안에서 원본 크기 / 수정 시각 위치
+STAT = struct.Struct('<QQ')
+
+
+def texture_path(source_path, source_hash):
+    stem = os.path.splitext(source_path)[0]
+    return f"{stem}.{source_hash[:16]}{TEXTURE_EXT}"
+
+
+def _texture_pattern(source_path):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return re.compile(re.escape(stem) + r'\.[0-9a-f]{16}' + re.escape(TEXTURE_EXT) + '$')
+
+
+def find_textures(source_path):
+    """원본 옆에 있는 .tex 파일 (해시와 관계없이 이름이 맞는 것 전부)"""
+    directory = os.path.dirname(source_path) or '.'
+    pattern = _texture_pattern(source_path)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names if pattern.match(name)]
+
+
+class MappedTexture:
+    """메모리 매핑한 .tex 파일 - address는 매핑 안의 RGBA 픽셀 주소 (close() 전까지 유효)"""
+
+    __slots__ = ('path', 'width', 'height', 'buffer', 'pixels')
+
+    def __init__(self, path, width, height, buffer):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.buffer = buffer
+        self.pixels = (ctypes.c_char * (width * height * 4)).from_buffer(buffer, HEADER_SIZE)
+
+    @property
+    def address(self):
+        return ctypes.addressof(self.pixels)
+
+    @property
+    def pitch(self):
+        return self.width * 4
+
+    def close(self):
+        self.pixels = None  # 버퍼 참조를 먼저 놓아야 매핑을 닫을 수 있음
+        self.buffer.close()
+
+
+def _source_matches(f, header, source_path):
+    """헤더에 적힌 원본이 지금 원본과 같은지 (stat이 다르면 해싱, 같으면 헤더의 stat 갱신)"""
+    st = os.stat(source_path)
+    if (header[5], header[6]) == (st.st_size, st.st_mtime_ns):
+        return True
+    if header[5] != st.st_size or bytes.fromhex(analysis_cache.hash_file(source_path)) != header[7]:
+        return False
+    try:
+        with open(f.name, 'r+b') as out:
+            out.seek(STAT_OFFSET)
+            out.write(STAT.pack(st.st_size, st.st_mtime_ns))
+    except OSError:
+        pass
+    return True
+
+
+def map_texture(source_path):
+    """
+    원본 PNG에 맞는 .tex를 메모리 매핑 (백그라운드 스레드에서 호출해도 됨)
+
+    Returns:
+        MappedTexture 또는 None (없거나, 깨졌거나, 원본이 바뀐 경우)
+    """
+    for path in find_textures(source_path):
+        try:
+            with open(path, 'rb') as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+                magic, version, _, width, height = header[:5]
+                if magic != TEXTURE_MAGIC or version != TEXTURE_VERSION:
+                    continue
+                if os.fstat(f.fileno()).st_size != HEADER_SIZE + width * height * 4:
+                    continue
+                if not _source_matches(f, header, source_path):
+                    continue
+                # ACCESS_COPY: 쓰기 가능한 버퍼여야 ctypes로 주소를 얻을 수 있음 (실제로 쓰지는 않음)
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, struct.error, ValueError):
+            continue
+        if hasattr(buffer, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+            # 업로드(메인 스레드) 전에 미리 읽어 두도록 요청
+            buffer.madvise(mmap.MADV_WILLNEED)
+        return MappedTexture(path, width, height, buffer)
+    return None
+
+
+# ---------------------------------------------------------------- 빌드
+
+
+def compile_texture(source_path):
+    """
+    PNG 하나를 .tex로 컴파일 (이미 있으면 건너뜀, 같은 원본의 예전 .tex는 삭제)
+
+    Returns:
+        (경로, 새로 만들었는지)
+    """
+    from PIL import Image
+
+    source_hash = analysis_cache.hash_file(source_path)
+    path = texture_path(source_path, source_hash)
+    for old_path in find_textures(source_path):
+        if os.path.normcase(old_path) != os.path.normcase(path):
+            os.remove(old_path)
+    if os.path.exists(path):
+        return path, False
+
+    with Image.open(source_path) as image:
+        image = image.convert('RGBA')
+        pixels = image.tobytes()
+        width, height = image.size
+    st = os.stat(source_path)
+    header = HEADER.pack(TEXTURE_MAGIC, TEXTURE_VERSION, 0, width, height,
+                         st.st_size, st.st_mtime_ns, bytes.fromhex(source_hash))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(pixels)
+    os.replace(tmp_path, path)
+    return path, True
+
+
+def game_textures():
+    """
+    게임이 SPRITES로 로드하는 PNG (지금 빌드된 축소 캐시 / 아틀라스 기준)
+    """
+    import sprite_cache
+    from player import SPRITE_SHEETS, SPRITE_SIZE
+    from ui import HEART_SHEET, HEART_FRAME_SIZE, HEART_SCALE
+    from sprite_atlas import get_atlas
+
+    paths = [sprite_cache.select_variant(path, SPRITE_SIZE, SPRITE_SIZE, draw_scale)[0]
+             for path, _, draw_scale in SPRITE_SHEETS.values()]
+    paths.append(sprite_cache.select_variant(HEART_SHEET, HEART_FRAME_SIZE, HEART_FRAME_SIZE, HEART_SCALE)[0])
+    atlas = get_atlas()
+    if atlas is not None:
+        paths += atlas.paths
+    return list(dict.fromkeys(paths))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PNG를 디코드 없이 업로드하는 .tex로 컴파일')
+    parser.add_argument('sources', nargs='*', help='PNG 파일 (생략하면 게임이 로드하는 시트 / 아틀라스 전체)')
+    args = parser.parse_args(argv)
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("Pillow가 필요함: pip install pillow")
+        return 1
+
+    sources = args.sources or game_textures()
+    total = 0
+    for source_path in sources:
+        path, created = compile_texture(source_path)
+        size = os.path.getsize(path)
+        total += size
+        status = '생성' if created else '있음'
+        print(f"  [{status}] {source_path} -> {os.path.basename(path)} "
+              f"({os.path.getsize(source_path) / 1024:.0f}KB -> {size / 1024:.0f}KB)")
+    print(f"텍스처 {len(sources)}개, {total / 2 ** 20:.1f}MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,7 @@
 from pico2d import *
 import game_framework
 import song_select_mode
+from asset_manager import ASSETS
 
 class TitleMode:
     def __init__(self):
@@ -21,18 +22,23 @@ class TitleMode:
         self.font = None
         # 배경 이미지 로드
         if self.background is None:
-            self.background = load_image('background.png')
+            self.background = ASSETS.acquire('background.png')
         # 타이틀 로고 로드
         if self.title_logo is None:
             try:
-                self.title_logo = load_image('title_logo.png')
+                self.title_logo = ASSETS.acquire('title_logo.png')
             except:
                 print("title_logo.png 파일이 없습니다. 텍스트로 대체합니다.")
                 self.title_logo = None
         
     def exit(self):
-        """타이틀 모드 종료"""
-        pass
+        """타이틀 모드 종료 - 공유 텍스처 반납"""
+        if self.background:
+            ASSETS.release('background.png')
+            self.background = None
+        if self.title_logo:
+            ASSETS.release('title_logo.png')
+            self.title_logo = None
         
     def handle_event(self, event):
         """이벤트 처리"""
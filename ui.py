@@ -1,4 +1,13 @@
 from pico2d import *
+import sprite_cache
+from sprite_manifest import get_manifest
+from asset_manager import ASSETS
+from sprite_loader import SPRITES
+from sprite_atlas import get_atlas
+
+HEART_SHEET = 'sprite_sheets/heart_animation.png'
+HEART_FRAME_SIZE = 256  # 프레임 수는 sprite_manifest가 시트 헤더에서 구함
+HEART_SCALE = 0.15  # 하트 크기 조절
 
 class HPBar:
     """체력 바 UI"""
@@ -11,30 +20,57 @@ class HPBar:
         
         # 1x1 픽셀 이미지 로드
         try:
-            self.white_img = load_image('white.png')
+            self.white_img = ASSETS.acquire('white.png')
             print("✓ HP 바 이미지 로드 완료")
         except:
             print("! HP 바 이미지 로드 실패")
             self.white_img = None
         
-        # 하트 애니메이션 로드
+        # 하트 애니메이션 로드 (아틀라스를 빌드해 두었으면 아틀라스에서 그림)
+        self.heart_path = None
+        self.heart_sheet = None
+        atlas = get_atlas()
+        self.heart_atlas = atlas if atlas is not None and atlas.has('heart') else None
         try:
-            self.heart_sheet = load_image('sprite_sheets/heart_animation.png')
             self.heart_frame = 0
             self.heart_frame_time = 0
-            self.heart_sprite_width = 256
-            self.heart_sprite_height = 256
-            self.heart_total_frames = 7
+            self.heart_sprite_width = HEART_FRAME_SIZE
+            self.heart_sprite_height = HEART_FRAME_SIZE
+            manifest = get_manifest()
+            self.heart_total_frames = manifest.layout(HEART_SHEET, HEART_FRAME_SIZE, HEART_FRAME_SIZE)['frames']
+            manifest.save()
             self.heart_fps = 10
-            self.heart_scale = 0.15  # 하트 크기 조절
+            self.heart_scale = HEART_SCALE
+            if self.heart_atlas is None:
+                self.load_heart_sheet()
             print("✓ 하트 애니메이션 로드 완료")
         except:
             print("! 하트 애니메이션 로드 실패")
             self.heart_sheet = None
+            self.heart_atlas = None
+    
+    def load_heart_sheet(self):
+        """하트 시트 로드 (그리는 크기에 맞는 축소 캐시가 있으면 사용, 텍스처 안의 프레임 크기는 원본/배수)"""
+        heart_path, divisor = sprite_cache.select_variant(
+            HEART_SHEET, self.heart_sprite_width, self.heart_sprite_height, self.heart_scale)
+        SPRITES.load(heart_path)  # 컴파일된 텍스처(.tex)가 있으면 디코드 없이 올림
+        self.heart_sheet = ASSETS.acquire(heart_path)
+        self.heart_path = heart_path
+        self.heart_frame_width = self.heart_sprite_width // divisor
+        self.heart_frame_height = self.heart_sprite_height // divisor
+    
+    def release(self):
+        """공유 텍스처 반납"""
+        if self.white_img:
+            ASSETS.release('white.png')
+            self.white_img = None
+        if self.heart_sheet:
+            ASSETS.release(self.heart_path)
+            self.heart_sheet = None
     
     def update(self, dt):
         """하트 애니메이션 업데이트"""
-        if not self.heart_sheet:
+        if not self.heart_sheet and not self.heart_atlas:
             return
         
         self.heart_frame_time += dt
@@ -47,17 +83,22 @@ class HPBar:
     
     def draw(self, current_hp, max_hp):
         """체력 바 그리기"""
-        if self.heart_sheet:
+        if self.heart_atlas:
+            draw_width = int(self.heart_sprite_width * self.heart_scale)
+            draw_height = int(self.heart_sprite_height * self.heart_scale)
+            self.heart_atlas.draw('heart', self.heart_frame, self.x - 20, self.y - self.height / 2,
+                                  draw_width, draw_height)
+        elif self.heart_sheet:
             heart_x = self.x - 20  
             heart_y = self.y - self.height / 2
             
-            frame_x = self.heart_frame * self.heart_sprite_width
+            frame_x = self.heart_frame * self.heart_frame_width
             draw_width = int(self.heart_sprite_width * self.heart_scale)
             draw_height = int(self.heart_sprite_height * self.heart_scale)
             
             self.heart_sheet.clip_draw(
                 frame_x, 0, 
-                self.heart_sprite_width, self.heart_sprite_height,
+                self.heart_frame_width, self.heart_frame_height,
                 heart_x, heart_y, 
                 draw_width, draw_height
             )